@@ -1,6 +1,12 @@
 from .py3 import (
     new_translation_manager,
     TranslationManager,
+    VersionTranslator,
+    TranslationManagerSnapshot,
+    BatchTranslator,
+    BatchJob,
+    BatchResult,
+    BlockPool,
     Version,
     BlockTranslator,
     EntityTranslator,
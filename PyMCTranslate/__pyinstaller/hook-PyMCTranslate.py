@@ -2,5 +2,11 @@ from PyInstaller.utils.hooks import collect_submodules, collect_data_files
 
 hiddenimports = collect_submodules("PyMCTranslate")
 datas = collect_data_files(
-    "PyMCTranslate", includes=["build_number.json", "min_json/**/*.json.gz"]
+    "PyMCTranslate",
+    includes=[
+        "build_number.json",
+        "block_shapes.json",
+        "version_manifest.json",
+        "min_json/database.bin",
+    ],
 )
@@ -1,25 +1,41 @@
 import logging
 from PyMCTranslate.py3.api import (
     TranslationManager,
+    VersionTranslator,
+    TranslationManagerSnapshot,
+    BatchTranslator,
+    BatchJob,
+    BatchResult,
+    BlockPool,
     Version,
     BlockTranslator,
     EntityTranslator,
     ItemTranslator,
 )
+from PyMCTranslate.py3.util.cache import CacheFactory
 from PyMCTranslate.py3.meta import (
     pymct_dir,
     json_dir,
-    json_atlas,
+    mapped_database,
     minified,
     build_number,
 )
 
 
-def new_translation_manager() -> TranslationManager:
+def new_translation_manager(
+    cache_factory: CacheFactory = None,
+    cache_path: str = None,
+    intern_blocks: bool = False,
+) -> TranslationManager:
     """Returns a new TranslationManager with the default files.
     Each unique world should have a new TranslationManager because there is the
-    functionality to register custom (mod) blocks making each handler unique."""
-    return TranslationManager(json_dir)
+    functionality to register custom (mod) blocks making each handler unique.
+
+    :param cache_factory: Optional callable that returns a new cache. Use this to bound the translation caches. eg. functools.partial(LRUCache, 10_000)
+    :param cache_path: Optional path to a file to store the block translation cache in between processes.
+    :param intern_blocks: If True equal translated blocks are returned as the same instance. See TranslationManager.block_pool
+    """
+    return TranslationManager(json_dir, cache_factory, cache_path, intern_blocks)
 
 
 # init a default logger
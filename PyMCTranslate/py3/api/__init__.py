@@ -18,7 +18,15 @@ except ModuleNotFoundError:
         ChunkLoadError,
     )
 
-from .translation_manager import TranslationManager
+from .translation_manager import (
+    TranslationManager,
+    VersionTranslator,
+    TranslationManagerSnapshot,
+    BatchTranslator,
+    BatchJob,
+    BatchResult,
+    BlockPool,
+)
 from .version import (
     Version,
     BlockTranslator,
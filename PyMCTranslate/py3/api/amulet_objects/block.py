@@ -2,11 +2,14 @@ from __future__ import annotations
 
 from sys import getsizeof
 import re
-from typing import Dict, Iterable, Tuple, Union
+from typing import Dict, Iterable, Tuple, Union, TYPE_CHECKING
 from amulet_nbt import ByteTag, ShortTag, IntTag, LongTag, StringTag, from_snbt
 
 from .errors import BlockException
 
+if TYPE_CHECKING:
+    from PyMCTranslate.py3.api.translation_manager.block_pool import BlockPool
+
 PropertyValueType = Union[
     ByteTag,
     ShortTag,
@@ -78,6 +81,7 @@ class Block:
         "_blockstate",
         "_snbt_blockstate",
         "_full_blockstate",
+        "_hash",
     )  # Reduces memory footprint
 
     snbt_blockstate_regex = re.compile(
@@ -131,6 +135,7 @@ class Block:
         self._blockstate = None
         self._snbt_blockstate = None
         self._full_blockstate = None
+        self._hash = None
 
         if properties is None:
             properties = {}
@@ -153,6 +158,17 @@ class Block:
             unpack_block(extra_blocks)
             self._extra_blocks = tuple(eb)
 
+    def __getstate__(self):
+        # The hash depends on the string hash seed of the process so it is not pickled
+        return None, {
+            slot: getattr(self, slot) for slot in self.__slots__ if slot != "_hash"
+        }
+
+    def __setstate__(self, state):
+        for slot, value in state[1].items():
+            setattr(self, slot, value)
+        self._hash = None
+
     @classmethod
     def from_string_blockstate(cls, blockstate: str):
         """
@@ -474,6 +490,9 @@ class Block:
         :param other: The Block object to check against
         :return: True if the Blocks objects are equal, False otherwise
         """
+        if self is other:
+            # interned blocks are compared by identity
+            return True
         if not isinstance(other, Block):
             return NotImplemented
 
@@ -495,9 +514,38 @@ class Block:
         """
         Hashes the Block object
 
+        The hash is computed from the name, the property tags and the extra blocks.
+        This is much faster than building the blockstate string.
+        It is computed once and stored.
+
         :return: A hash of the Block object
         """
-        return hash(self.full_blockstate)
+        block_hash = self._hash
+        if block_hash is None:
+            block_hash = self._hash = hash(
+                (
+                    self._namespaced_name,
+                    tuple(sorted(self._properties.items())),
+                    self._extra_blocks,
+                )
+            )
+        return block_hash
+
+    def intern(self, pool: BlockPool) -> Block:
+        """
+        Get the canonical instance of this block.
+
+        Equal blocks that are interned in the same pool are the same instance so they share memory and compare by identity.
+        Interned blocks are kept until the owner of the pool clears it or drops it.
+
+        >>> pool = BlockPool()
+        >>> Block("minecraft", "stone").intern(pool) is Block("minecraft", "stone").intern(pool)
+        True
+
+        :param pool: The pool to intern the block in. eg TranslationManager.block_pool
+        :return: The first instance equal to this block that was interned in the pool.
+        """
+        return pool.intern(self)
 
     def __add__(self, other: Block) -> Block:
         """
@@ -10,10 +10,22 @@ from PyMCTranslate.py3.api import Block, PropertyValueType
 # This is the dictionary stored under the properties key in the specification files
 from PyMCTranslate.py3.api.version.translators.block import BlockSpecification
 
-from .rotate import BlockShapes, BaseBlockShape, RotateMode
+from .rotate import (
+    BlockShapes,
+    BaseBlockShape,
+    RotateMode,
+    AxisAlignedKey,
+    axis_aligned_key,
+    axis_aligned_matrix,
+)
 
 
 class BaseAxisStateShape(BaseBlockShape):
+    def __init__(self):
+        # The new face for each of the old faces. None if there is no face in that direction.
+        # The key is the transform key.
+        self._face_tables: Dict[AxisAlignedKey, Dict[str, Optional[str]]] = {}
+
     @property
     @classmethod
     @abstractmethod
@@ -54,6 +66,9 @@ class BaseAxisStateShape(BaseBlockShape):
     ):
         if not mode:
             return block
+        transform_key = axis_aligned_key(transform)
+        if transform_key is not None:
+            return self.transform_axis_aligned(block, transform, transform_key, mode)
         old_properties = block.properties
         properties = block.properties
         properties.update(dict.fromkeys(self.Vectors.keys(), self.Values[0]))
@@ -66,6 +81,38 @@ class BaseAxisStateShape(BaseBlockShape):
 
         return Block(block.namespace, block.base_name, properties)
 
+    def transform_axis_aligned(
+        self,
+        block: Block,
+        transform: numpy.ndarray,
+        transform_key: AxisAlignedKey,
+        mode: RotateMode = RotateMode.Nearest,
+    ):
+        if not mode:
+            return block
+        face_table = self._face_tables.get(transform_key)
+        if face_table is None:
+            matrix = axis_aligned_matrix(transform_key)
+            face_table = self._face_tables.setdefault(
+                transform_key,
+                {
+                    old_face: self._vector_to_face(
+                        tuple(numpy.matmul(matrix, (*vector, 0)).tolist())[:-1],
+                        RotateMode.Exact,
+                    )
+                    for old_face, vector in self.Vectors.items()
+                },
+            )
+        old_properties = block.properties
+        properties = block.properties
+        properties.update(dict.fromkeys(self.Vectors.keys(), self.Values[0]))
+
+        for old_face, new_face in face_table.items():
+            if new_face is not None:
+                properties[new_face] = old_properties[old_face]
+
+        return Block(block.namespace, block.base_name, properties)
+
     def _block_to_vector(self, block: Block) -> Optional[Tuple[float, float, float]]:
         """Convert the block state to a vector representing the rotation"""
         vector = self.Vectors.get(
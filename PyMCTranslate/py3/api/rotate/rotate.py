@@ -1,14 +1,40 @@
-from typing import Dict, Tuple, Type, Set, Optional, List, Union
+from typing import Dict, Tuple, Type, Set, Optional, List, Union, Sequence
 from abc import ABC, abstractmethod
 from enum import IntEnum
+import os
+import logging
 
 import numpy
 
+from PyMCTranslate.py3.meta import pymct_dir
 from PyMCTranslate.py3.api.version import Version
 from PyMCTranslate.py3.api import Block, PropertyValueType
 
 # This is the dictionary stored under the properties key in the specification files
 from PyMCTranslate.py3.api.version.translators.block import BlockSpecification
+from PyMCTranslate.py3.util.cache import LRUCache
+from PyMCTranslate.py3.util.build_data import (
+    load_build_data,
+    save_build_data,
+    get_build_data,
+)
+
+log = logging.getLogger(__name__)
+
+"""
+The block shape of each universal block is precomputed and shipped in block_shapes.json.
+See PyMCTranslate/py3/util/build_data.py for the file format.
+
+data stored under "block_shapes"
+{
+    "<namespace>:<base_name>": "<block shape class name>",
+    ...
+}
+"""
+
+BlockShapesPath = os.path.join(pymct_dir, "block_shapes.json")
+# The number of transformed blocks stored for each transform and mode by RotationManager.transform_palette
+PaletteCacheSize = 10_000
 
 
 class RotateMode(IntEnum):
@@ -17,6 +43,42 @@ class RotateMode(IntEnum):
     Nearest = 2  # Choose the closest valid state
 
 
+# The rotation part of a transform that only swaps and flips axes. The 3x3 matrix flattened in row order.
+AxisAlignedKey = Tuple[int, ...]
+
+
+def axis_aligned_key(transform: numpy.ndarray) -> Optional[AxisAlignedKey]:
+    """
+    Check if the rotation part of a transformation matrix only swaps and flips axes.
+    There are 48 of these and the result of rotating a block by one of them can be stored.
+
+    :param transform: The transformation matrix.
+    :return: The rotation part as a tuple of nine ints if it only swaps and flips axes. None otherwise.
+    """
+    # This is called for every block so it is done in python because the numpy overhead is larger than the work
+    key = []
+    for row in numpy.asarray(transform)[:3, :3].tolist():
+        for value in row:
+            int_value = round(value)
+            if abs(value - int_value) > 1e-6 or int_value not in (-1, 0, 1):
+                return None
+            key.append(int_value)
+    for index in range(3):
+        if (
+            sum(map(abs, key[index * 3 : index * 3 + 3])) != 1
+            or sum(map(abs, key[index::3])) != 1
+        ):
+            return None
+    return tuple(key)
+
+
+def axis_aligned_matrix(transform_key: AxisAlignedKey) -> numpy.ndarray:
+    """Convert the output of axis_aligned_key back to a transformation matrix without translation."""
+    transform = numpy.eye(4)
+    transform[:3, :3] = numpy.array(transform_key).reshape(3, 3)
+    return transform
+
+
 class BaseBlockShape(ABC):
     @abstractmethod
     def is_valid(
@@ -49,12 +111,32 @@ class BaseBlockShape(ABC):
         """
         raise NotImplementedError
 
+    def transform_axis_aligned(
+        self,
+        block: Block,
+        transform: numpy.ndarray,
+        transform_key: AxisAlignedKey,
+        mode: RotateMode = RotateMode.Nearest,
+    ):
+        """
+        Rotate the given block by a transform that only swaps and flips axes.
+        Subclasses can override this to look up the result in a table instead of computing it.
+
+        :param block: The block to rotate
+        :param transform: The transformation matrix to transform the block with
+        :param transform_key: The rotation part of the transform as returned by axis_aligned_key
+        :param mode: The rotation mode (This should only be Exact or Nearest because Null was handled before calling)
+        :return: The rotated block
+        """
+        return self.transform(block, transform, mode)
+
 
 class BlockShapeManager:
     """A container to store and find block shapes."""
 
     def __init__(self):
         self._block_shapes: List[BaseBlockShape] = []
+        self._block_shapes_by_name: Dict[str, BaseBlockShape] = {}
 
     def register(self, block_shape: Type[BaseBlockShape]) -> Type[BaseBlockShape]:
         """
@@ -63,9 +145,20 @@ class BlockShapeManager:
         :param block_shape: A subclass of BaseBlockShape
         :return: The same class that was given so that this method can be used as a decorator
         """
-        self._block_shapes.append(block_shape())
+        instance = block_shape()
+        self._block_shapes.append(instance)
+        self._block_shapes_by_name[block_shape.__name__] = instance
         return block_shape
 
+    def get_block_shape(self, name: str) -> Optional[BaseBlockShape]:
+        """
+        Get a registered block shape from its class name.
+
+        :param name: The name of the block shape class.
+        :return: The block shape. None if no class with that name is registered.
+        """
+        return self._block_shapes_by_name.get(name)
+
     def find_block_shape(
         self, namespace: str, base_name: str, specification: BlockSpecification
     ) -> Optional[BaseBlockShape]:
@@ -90,7 +183,81 @@ class BlockShapeManager:
 BlockShapes = BlockShapeManager()
 
 
+def find_block_shapes(universal_version: Version) -> Dict[str, BaseBlockShape]:
+    """
+    Find the block shape for each block in the universal format by testing every specification.
+
+    :param universal_version: The universal format Version.
+    :return: A dictionary mapping the namespaced name to the block shape. Blocks without a shape are not included.
+    """
+    block_shapes: Dict[str, BaseBlockShape] = {}
+    for namespace in universal_version.block.namespaces():
+        for base_name in universal_version.block.base_names(namespace):
+            block_shape = BlockShapes.find_block_shape(
+                namespace,
+                base_name,
+                universal_version.block.get_specification(namespace, base_name),
+            )
+            if block_shape is not None:
+                block_shapes[f"{namespace}:{base_name}"] = block_shape
+    return block_shapes
+
+
+def _encode_block_shapes(block_shapes: Dict[str, BaseBlockShape]) -> Dict[str, str]:
+    return {
+        block_name: type(block_shape).__name__
+        for block_name, block_shape in sorted(block_shapes.items())
+    }
+
+
+def _block_shapes_valid(data: Dict[str, str]) -> bool:
+    # The table is not valid if a block shape has been removed or renamed
+    return all(
+        BlockShapes.get_block_shape(shape_name) is not None
+        for shape_name in data.values()
+    )
+
+
+def _decode_block_shapes(data: Dict[str, str]) -> Dict[str, BaseBlockShape]:
+    return {
+        block_name: BlockShapes.get_block_shape(shape_name)
+        for block_name, shape_name in data.items()
+    }
+
+
+def load_block_shapes(
+    path: str = BlockShapesPath,
+) -> Optional[Dict[str, BaseBlockShape]]:
+    """
+    Load the precomputed block shape for each block in the universal format.
+
+    :param path: The path to the block shape table.
+    :return: A dictionary mapping the namespaced name to the block shape. None if the table does not exist, was built for a different build or names a block shape that is not registered.
+    """
+    data = load_build_data(path, "block_shapes")
+    if data is None or not _block_shapes_valid(data):
+        return None
+    return _decode_block_shapes(data)
+
+
+def save_block_shapes(
+    block_shapes: Dict[str, BaseBlockShape], path: str = BlockShapesPath
+):
+    """Write the block shape table for the current build."""
+    save_build_data(path, "block_shapes", _encode_block_shapes(block_shapes))
+
+
 class BaseVectorBlockShape(BaseBlockShape):
+    def __init__(self):
+        # The new property values for each of the old property values. None if the block does not change.
+        # The key is (transform key, mode).
+        self._transform_tables: Dict[
+            Tuple[AxisAlignedKey, RotateMode],
+            Dict[
+                Tuple[PropertyValueType, ...], Optional[Tuple[PropertyValueType, ...]]
+            ],
+        ] = {}
+
     @property
     @classmethod
     @abstractmethod
@@ -128,22 +295,36 @@ class BaseVectorBlockShape(BaseBlockShape):
     ) -> Optional[Tuple[PropertyValueType, ...]]:
         """Convert a rotation vector back into properties"""
 
-        def dist(vec: Tuple[float, float, float]) -> float:
+        def dist(
+            vec: Union[Tuple[float, float, float], List[Tuple[float, float, float]]],
+        ) -> float:
+            if isinstance(vec, list):
+                return min([dist(v) for v in vec])
             return sum((a - b) ** 2 for a, b in zip(vector, vec))
 
-        sorted_vectors: List[
-            Tuple[Tuple[PropertyValueType, ...], Tuple[float, float, float]]
-        ] = sorted(
-            self.Vectors.items(),
-            key=lambda a: (
-                min([dist(v) for v in a[1]]) if isinstance(a[1], list) else dist(a[1])
-            ),
-        )
-        properties, closest_vector = sorted_vectors[0]
+        properties, closest_vector = min(self.Vectors.items(), key=lambda a: dist(a[1]))
         if mode is RotateMode.Exact and dist(closest_vector) > 0.01:
             return None
         return properties
 
+    def _get_transform_table(
+        self, transform_key: AxisAlignedKey, mode: RotateMode
+    ) -> Dict[Tuple[PropertyValueType, ...], Optional[Tuple[PropertyValueType, ...]]]:
+        """Get the new property values for each of the old property values for a transform that only swaps and flips axes."""
+        table = self._transform_tables.get((transform_key, mode))
+        if table is None:
+            transform = axis_aligned_matrix(transform_key)
+            table = {}
+            for properties, vector in self.Vectors.items():
+                if isinstance(vector, list):
+                    vector = vector[0]
+                table[properties] = self._vector_to_properties(
+                    self._transform_vector(vector, transform), mode
+                )
+            # the tables are the same in every thread so it does not matter which is stored
+            table = self._transform_tables.setdefault((transform_key, mode), table)
+        return table
+
     @staticmethod
     def _transform_vector(vector, transform):
         return tuple(numpy.matmul(transform, (*vector, 0)).tolist())[:-1]
@@ -156,6 +337,9 @@ class BaseVectorBlockShape(BaseBlockShape):
     ):
         if not mode:
             return block
+        transform_key = axis_aligned_key(transform)
+        if transform_key is not None:
+            return self.transform_axis_aligned(block, transform, transform_key, mode)
         vector = self._block_to_vector(block)
         if vector is None:
             return block
@@ -168,19 +352,39 @@ class BaseVectorBlockShape(BaseBlockShape):
 
         return Block(block.namespace, block.base_name, properties)
 
+    def transform_axis_aligned(
+        self,
+        block: Block,
+        transform: numpy.ndarray,
+        transform_key: AxisAlignedKey,
+        mode: RotateMode = RotateMode.Nearest,
+    ):
+        if not mode:
+            return block
+        properties = block.properties
+        new_properties = self._get_transform_table(transform_key, mode).get(
+            tuple(properties.get(prop, None) for prop in self.Properties), None
+        )
+        if new_properties is None:
+            return block
+        properties.update(zip(self.Properties, new_properties))
+
+        return Block(block.namespace, block.base_name, properties)
+
 
 class RotationManager:
     def __init__(self, universal_version: Version):
-        self._block_shapes: Dict[str, BaseBlockShape] = {}
-        for namespace in universal_version.block.namespaces():
-            for base_name in universal_version.block.base_names(namespace):
-                block_shape = BlockShapes.find_block_shape(
-                    namespace,
-                    base_name,
-                    universal_version.block.get_specification(namespace, base_name),
-                )
-                if block_shape is not None:
-                    self._block_shapes[f"{namespace}:{base_name}"] = block_shape
+        # The shipped table is used if it is valid for this build because finding the shapes requires every universal specification
+        self._block_shapes: Dict[str, BaseBlockShape] = get_build_data(
+            BlockShapesPath,
+            "block_shapes",
+            lambda: _encode_block_shapes(find_block_shapes(universal_version)),
+            _decode_block_shapes,
+            _block_shapes_valid,
+        )
+        # The transformed block for the most recently transformed blocks in transform_palette.
+        # Only transforms that swap and flip axes are stored. The key is (transform key, mode).
+        self._palette_caches: Dict[Tuple[AxisAlignedKey, RotateMode], LRUCache] = {}
 
     def transform(
         self,
@@ -190,16 +394,81 @@ class RotationManager:
     ):
         if mode == RotateMode.Null:
             return block
+        # Transforms that only swap and flip axes are looked up in tables stored in the block shapes
+        return self._transform(block, transform, axis_aligned_key(transform), mode)
+
+    def transform_palette(
+        self,
+        palette: Union[Sequence[Block], numpy.ndarray],
+        transform: numpy.ndarray,
+        mode: RotateMode = RotateMode.Nearest,
+    ) -> Tuple[numpy.ndarray, Dict[Block, Block]]:
+        """
+        Transform every block in a palette.
+
+        Each unique block is only transformed once.
+        If the transform only swaps and flips axes the results are stored and reused by later calls with the same transform.
+
+        :param palette: A sequence or numpy object array of universal blocks.
+        :param transform: The transformation matrix to transform the blocks with
+        :param mode: The rotation mode.
+        :return: A numpy object array with the same shape as the palette containing the transformed blocks and a dictionary mapping each unique input block to its transformed block.
+        """
+        if isinstance(palette, numpy.ndarray):
+            shape = palette.shape
+            palette = palette.ravel()
+        else:
+            shape = (len(palette),)
+        transformed = numpy.empty(len(palette), dtype=object)
+        mapping: Dict[Block, Block] = {}
+        if mode == RotateMode.Null:
+            for index, block in enumerate(palette):
+                transformed[index] = mapping[block] = block
+            return transformed.reshape(shape), mapping
+
+        transform_key = axis_aligned_key(transform)
+        if transform_key is None:
+            cache = {}
+        else:
+            cache = self._palette_caches.get((transform_key, mode))
+            if cache is None:
+                cache = self._palette_caches.setdefault(
+                    (transform_key, mode), LRUCache(PaletteCacheSize)
+                )
 
+        for index, block in enumerate(palette):
+            new_block = mapping.get(block)
+            if new_block is None:
+                new_block = cache.get(block)
+                if new_block is None:
+                    new_block = self._transform(block, transform, transform_key, mode)
+                    cache[block] = new_block
+                mapping[block] = new_block
+            transformed[index] = new_block
+        return transformed.reshape(shape), mapping
+
+    def _transform(
+        self,
+        block: Block,
+        transform: numpy.ndarray,
+        transform_key: Optional[AxisAlignedKey],
+        mode: RotateMode,
+    ) -> Block:
         blocks = []
         for sub_block in block:
-            blocks.append(
-                self._block_shapes[sub_block.namespaced_name].transform(
-                    sub_block.base_block, transform, mode
+            block_shape = self._block_shapes.get(sub_block.namespaced_name)
+            if block_shape is None:
+                blocks.append(sub_block)
+            elif transform_key is None:
+                blocks.append(
+                    block_shape.transform(sub_block.base_block, transform, mode)
+                )
+            else:
+                blocks.append(
+                    block_shape.transform_axis_aligned(
+                        sub_block.base_block, transform, transform_key, mode
+                    )
                 )
-                if sub_block.namespaced_name in self._block_shapes
-                else sub_block
-            )
 
         # TODO: replace this with Block.join(blocks)
         return Block(
@@ -1 +1,5 @@
 from .translation_manager import TranslationManager
+from .version_translator import VersionTranslator
+from .snapshot import TranslationManagerSnapshot
+from .batch_translator import BatchTranslator, BatchJob, BatchResult
+from .block_pool import BlockPool
@@ -0,0 +1,328 @@
+from typing import (
+    Tuple,
+    Union,
+    Optional,
+    Dict,
+    List,
+    Sequence,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Deque,
+    TYPE_CHECKING,
+)
+from collections import deque
+import os
+import multiprocessing
+from multiprocessing.pool import AsyncResult
+
+from PyMCTranslate.py3.api import Block, BlockEntity, Entity
+from PyMCTranslate.py3.api.version.translators.base import copy_object
+from PyMCTranslate.py3.util.cache import BaseCache, CacheInfo, EmptyCacheInfo
+from .snapshot import TranslationManagerSnapshot
+
+if TYPE_CHECKING:
+    from PyMCTranslate.py3.api.version import Version
+    from .translation_manager import TranslationManager
+
+"""
+Translate palettes in a pool of worker processes.
+
+    with BatchTranslator(translation_manager) as batch_translator:
+        for result in batch_translator.translate(jobs):
+            ...
+
+The parent process stores the cacheable translations so each unique block is only sent to a worker once.
+The workers load the TranslationManager from a snapshot so the data loaded in the parent is not loaded again.
+"""
+
+# (platform, version number)
+VersionIdentifier = Tuple[str, Tuple[int, int, int]]
+# (output, extra output, extra needed)
+TranslationOutput = Union[
+    Tuple[Block, Optional[BlockEntity], bool],
+    Tuple[Entity, None, bool],
+]
+# (source, destination, source force_blockstate, destination force_blockstate)
+_CacheKey = Tuple[VersionIdentifier, VersionIdentifier, bool, bool]
+# The blocks being translated by the workers. The value is the job that sent the block and the index of the request in that job.
+_InFlight = Dict[Tuple[_CacheKey, Block], Tuple["_PendingJob", int]]
+
+
+class BatchJob(NamedTuple):
+    """A palette to translate from one Version to another."""
+
+    #: The blocks to translate.
+    palette: Sequence[Block]
+    #: An optional block entity for each block in the palette. None if no block has a block entity.
+    block_entities: Optional[Sequence[Optional[BlockEntity]]]
+    #: The Version to translate from or a (platform, version number) tuple.
+    source: Union["Version", VersionIdentifier]
+    #: The Version to translate to or a (platform, version number) tuple.
+    destination: Union["Version", VersionIdentifier]
+    #: True if the input is in the blockstate format. False if it is in the native format
+    source_force_blockstate: bool = False
+    #: True to get the blockstate format. False to get the native format
+    destination_force_blockstate: bool = False
+
+
+class BatchResult(NamedTuple):
+    """The translated palette. Each list has one entry for each block in the palette."""
+
+    #: The translated blocks. A block may be translated to an Entity.
+    blocks: List[Union[Block, Entity]]
+    #: The translated block entities.
+    block_entities: List[Optional[BlockEntity]]
+    #: True if the block location and neighbouring blocks are required to fully define the output.
+    #: These were translated without a location so they should be translated again with VersionTranslator.translate_block.
+    extra_needed: List[bool]
+
+
+# The TranslationManager in the worker process
+_translation_manager: Optional["TranslationManager"] = None
+
+
+def _init_worker(snapshot: TranslationManagerSnapshot):
+    global _translation_manager
+    _translation_manager = snapshot.load()
+
+
+def _translate(
+    key: _CacheKey, requests: List[Tuple[Block, Optional[BlockEntity]]]
+) -> List[Tuple[Union[Block, Entity], Optional[BlockEntity], bool, bool]]:
+    """Translate the requests in a worker process."""
+    (src_platform, src_version), (dst_platform, dst_version), src_fb, dst_fb = key
+    translator = _translation_manager.get_translator(
+        _translation_manager.get_version(src_platform, src_version),
+        _translation_manager.get_version(dst_platform, dst_version),
+    )
+    return [
+        translator._translate_block(
+            block, block_entity, src_fb, dst_fb, (0, 0, 0), None
+        )
+        for block, block_entity in requests
+    ]
+
+
+def _version_identifier(
+    version: Union["Version", VersionIdentifier],
+) -> VersionIdentifier:
+    if isinstance(version, tuple):
+        platform, version_number = version
+        return platform, tuple(version_number)
+    return version.platform, version.version_number
+
+
+class _PendingJob:
+    """A job that has been sent to the workers but whose result has not been returned."""
+
+    __slots__ = (
+        "key",
+        "outputs",
+        "requests",
+        "indexes",
+        "dependencies",
+        "result",
+        "translated",
+    )
+
+    def __init__(self, key: _CacheKey, palette_size: int):
+        self.key = key
+        # The output for each block in the palette. None if it is being translated by a worker.
+        self.outputs: List[Optional[TranslationOutput]] = [None] * palette_size
+        # The unique requests sent to the worker
+        self.requests: List[Tuple[Block, Optional[BlockEntity]]] = []
+        # The palette indexes that each request is for
+        self.indexes: List[List[int]] = []
+        # The blocks that an earlier job is already translating.
+        # (the earlier job, the index of the request in the earlier job, the palette indexes in this job)
+        self.dependencies: List[Tuple[_PendingJob, int, List[int]]] = []
+        self.result: Optional[AsyncResult] = None
+        # The output for each request. Set when the result is collected so that later jobs can use it.
+        self.translated: Optional[List[TranslationOutput]] = None
+
+
+class BatchTranslator:
+    """
+    Translate palettes from one Version to another using every core.
+
+    Jobs are sent to a pool of worker processes and the results are returned in the same order as the jobs.
+    Each worker has its own TranslationManager loaded from a snapshot of the one given here.
+    The cacheable translations are stored in the parent process and shared between all jobs so repeated blocks are only translated once.
+
+    The palettes are translated without a block location or neighbouring blocks.
+    Outputs that need them are marked in BatchResult.extra_needed.
+    """
+
+    def __init__(
+        self,
+        translation_manager: "TranslationManager",
+        processes: Optional[int] = None,
+        max_pending: Optional[int] = None,
+    ):
+        """
+        Start the worker processes.
+
+        :param translation_manager: The TranslationManager to translate with. Everything loaded before this is called is shared with the workers.
+        :param processes: The number of worker processes. Defaults to the number of CPUs.
+        :param max_pending: The maximum number of jobs that can be sent to the workers before the earliest result is returned. Defaults to twice the number of processes.
+        """
+        processes = processes or os.cpu_count() or 1
+        self._cache_factory = translation_manager.cache_factory
+        self._block_pool = translation_manager.block_pool
+        # The cacheable translations. These are shared between all jobs.
+        self._cache: Dict[_CacheKey, BaseCache] = {}
+        self._snapshot = translation_manager.snapshot()
+        try:
+            self._pool = multiprocessing.Pool(
+                processes, initializer=_init_worker, initargs=(self._snapshot,)
+            )
+        except BaseException:
+            self._snapshot.close()
+            raise
+        self._max_pending = max_pending or 2 * processes
+
+    def __enter__(self) -> "BatchTranslator":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
+
+    def cache_info(self) -> CacheInfo:
+        """Get the combined statistics for the translation caches in the parent process."""
+        return sum((cache.info() for cache in self._cache.values()), EmptyCacheInfo)
+
+    def translate(self, jobs: Iterable[BatchJob]) -> Iterator[BatchResult]:
+        """
+        Translate each of the jobs.
+
+        :param jobs: The jobs to translate. This is consumed lazily so it can be a generator.
+        :return: A generator of the results in the same order as the jobs.
+        """
+        pending: Deque[_PendingJob] = deque()
+        in_flight: _InFlight = {}
+        for job in jobs:
+            pending.append(self._submit(job, in_flight))
+            while pending and (
+                len(pending) >= self._max_pending or pending[0].result is None
+            ):
+                yield self._collect(pending.popleft(), in_flight)
+        while pending:
+            yield self._collect(pending.popleft(), in_flight)
+
+    def _submit(self, job: BatchJob, in_flight: _InFlight) -> _PendingJob:
+        """
+        Resolve what is cached and send the rest of the job to the workers.
+
+        Blocks that an earlier pending job is already translating are not sent again.
+        They are resolved from the result of that job because the jobs are collected in order.
+        """
+        key = (
+            _version_identifier(job.source),
+            _version_identifier(job.destination),
+            job.source_force_blockstate,
+            job.destination_force_blockstate,
+        )
+        cache = self._cache.get(key)
+        if cache is None:
+            cache = self._cache[key] = self._cache_factory()
+        block_entities = job.block_entities
+        pending = _PendingJob(key, len(job.palette))
+        outputs = pending.outputs
+        requests = pending.requests
+        # The indexes of the blocks without a block entity that are being translated
+        unique: Dict[Block, List[int]] = {}
+
+        for index, block in enumerate(job.palette):
+            block_entity = None if block_entities is None else block_entities[index]
+            if block_entity is None:
+                block_indexes = unique.get(block)
+                if block_indexes is not None:
+                    block_indexes.append(index)
+                    continue
+                cached = cache.get(block)
+                if cached is not None:
+                    output, extra_output, extra_needed = cached
+                    outputs[index] = (
+                        copy_object(output),
+                        copy_object(extra_output),
+                        extra_needed,
+                    )
+                    continue
+                block_indexes = unique[block] = [index]
+                translating = in_flight.get((key, block))
+                if translating is not None:
+                    translating_job, request_index = translating
+                    pending.dependencies.append(
+                        (translating_job, request_index, block_indexes)
+                    )
+                    continue
+                in_flight[(key, block)] = (pending, len(requests))
+            else:
+                block_indexes = [index]
+            requests.append((block, block_entity))
+            pending.indexes.append(block_indexes)
+
+        if requests:
+            pending.result = self._pool.apply_async(_translate, (key, requests))
+        return pending
+
+    def _collect(self, job: _PendingJob, in_flight: _InFlight) -> BatchResult:
+        """Wait for the worker result and merge it into the job outputs."""
+        outputs = job.outputs
+        if job.result is not None:
+            cache = self._cache[job.key]
+            job.translated = translated = []
+            for (
+                (block, block_entity),
+                block_indexes,
+                (
+                    output,
+                    extra_output,
+                    extra_needed,
+                    cacheable,
+                ),
+            ) in zip(job.requests, job.indexes, job.result.get()):
+                if self._block_pool is not None and isinstance(output, Block):
+                    output = self._block_pool.intern(output)
+                if cacheable:
+                    cache[block] = output, extra_output, extra_needed
+                translated.append((output, extra_output, extra_needed))
+                if block_entity is None:
+                    in_flight.pop((job.key, block), None)
+                for index in block_indexes:
+                    outputs[index] = (
+                        copy_object(output),
+                        copy_object(extra_output),
+                        extra_needed,
+                    )
+        # the earlier jobs have already been collected
+        for translating_job, request_index, block_indexes in job.dependencies:
+            output, extra_output, extra_needed = translating_job.translated[
+                request_index
+            ]
+            for index in block_indexes:
+                outputs[index] = (
+                    copy_object(output),
+                    copy_object(extra_output),
+                    extra_needed,
+                )
+        blocks, block_entities, extra_needed = (
+            zip(*outputs) if outputs else ((), (), ())
+        )
+        return BatchResult(list(blocks), list(block_entities), list(extra_needed))
+
+    def close(self):
+        """Wait for the workers to finish and free the shared data."""
+        self._pool.close()
+        self._pool.join()
+        self._snapshot.close()
+
+    def terminate(self):
+        """Stop the workers immediately and free the shared data."""
+        self._pool.terminate()
+        self._pool.join()
+        self._snapshot.close()
@@ -0,0 +1,57 @@
+from typing import Dict, Sequence, Union
+
+import numpy
+
+from PyMCTranslate.py3.api import Block
+
+
+class BlockPool:
+    """
+    An intern table for Block objects.
+
+    Equal blocks are replaced with one canonical instance so repeated blocks share memory and compare by identity.
+    Blocks are never removed from the pool so it should only be used for a bounded set of block states.
+    """
+
+    def __init__(self):
+        self._blocks: Dict[Block, Block] = {}
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def __contains__(self, block: Block) -> bool:
+        return block in self._blocks
+
+    def intern(self, block: Block) -> Block:
+        """
+        Get the canonical instance of a block.
+
+        :param block: The block to look up.
+        :return: The first instance equal to block that was given to the pool.
+        """
+        # setdefault is atomic so concurrent callers get the same instance
+        return self._blocks.setdefault(block, block)
+
+    def intern_many(
+        self, blocks: Union[Sequence[Block], numpy.ndarray]
+    ) -> numpy.ndarray:
+        """
+        Get the canonical instance of each block in a palette.
+
+        :param blocks: A sequence or numpy object array of blocks.
+        :return: A numpy object array with the same shape as the input containing the canonical instances.
+        """
+        if isinstance(blocks, numpy.ndarray):
+            shape = blocks.shape
+            blocks = blocks.ravel()
+        else:
+            shape = (len(blocks),)
+        setdefault = self._blocks.setdefault
+        interned = numpy.empty(len(blocks), dtype=object)
+        for index, block in enumerate(blocks):
+            interned[index] = setdefault(block, block)
+        return interned.reshape(shape)
+
+    def clear(self):
+        """Remove all blocks from the pool."""
+        self._blocks.clear()
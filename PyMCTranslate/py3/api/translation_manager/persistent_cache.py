@@ -0,0 +1,230 @@
+from typing import Dict, Optional, Tuple, Union, Iterable, TYPE_CHECKING
+import os
+import json
+import gzip
+import logging
+
+import amulet_nbt
+
+from PyMCTranslate.py3.meta import build_number
+from PyMCTranslate.py3.api import Block, BlockEntity, Entity
+from PyMCTranslate.py3.util.cache import BaseCache
+
+if TYPE_CHECKING:
+    from PyMCTranslate.py3.api.version import Version
+    from .block_pool import BlockPool
+
+log = logging.getLogger(__name__)
+
+"""
+The persistent cache stores the cacheable block translations between processes.
+
+file format (gzipped json)
+{
+    "build_number": <int>,
+    "versions": {
+        "<platform>_<version number>": {
+            "<direction>/<force_blockstate 0 or 1>": [
+                [<input block>, <output block or entity>, <block entity or null>, <extra_needed>],
+                ...
+            ]
+        }
+    }
+}
+blocks are stored as a list of [namespace, base_name, {property: snbt}] (the base block followed by the extra blocks)
+block entities are stored as [namespace, base_name, x, y, z, name, snbt]
+entities are stored as ["entity", namespace, base_name, x, y, z, name, snbt]
+"""
+
+BlockCacheValue = Tuple[Union[Block, Entity], Optional[BlockEntity], bool]
+
+
+def _version_key(version: "Version") -> str:
+    return f"{version.platform}_{'_'.join(map(str, version.version_number))}"
+
+
+def _cache_key_str(cache_key: Tuple[str, bool]) -> str:
+    direction, force_blockstate = cache_key
+    return f"{direction}/{int(force_blockstate)}"
+
+
+def _cache_key_tuple(cache_key: str) -> Tuple[str, bool]:
+    direction, force_blockstate = cache_key.split("/")
+    return direction, bool(int(force_blockstate))
+
+
+def _pack_block(block: Block) -> list:
+    return [
+        [
+            b.namespace,
+            b.base_name,
+            {key: value.to_snbt() for key, value in b.properties.items()},
+        ]
+        for b in block.block_tuple
+    ]
+
+
+def _unpack_block(block: list) -> Block:
+    (namespace, base_name, properties), *extra_blocks = block
+    return Block(
+        namespace,
+        base_name,
+        {key: amulet_nbt.from_snbt(value) for key, value in properties.items()},
+        [
+            Block(
+                namespace_,
+                base_name_,
+                {
+                    key: amulet_nbt.from_snbt(value)
+                    for key, value in properties_.items()
+                },
+            )
+            for namespace_, base_name_, properties_ in extra_blocks
+        ],
+    )
+
+
+def _pack_value(value: BlockCacheValue) -> list:
+    output, block_entity, extra_needed = value
+    if isinstance(output, Entity):
+        output = [
+            "entity",
+            output.namespace,
+            output.base_name,
+            output.x,
+            output.y,
+            output.z,
+            output.nbt.name,
+            output.nbt.compound.to_snbt(),
+        ]
+    else:
+        output = _pack_block(output)
+    if block_entity is not None:
+        block_entity = [
+            block_entity.namespace,
+            block_entity.base_name,
+            block_entity.x,
+            block_entity.y,
+            block_entity.z,
+            block_entity.nbt.name,
+            block_entity.nbt.compound.to_snbt(),
+        ]
+    return [output, block_entity, extra_needed]
+
+
+def _unpack_value(value: list) -> BlockCacheValue:
+    output, block_entity, extra_needed = value
+    if output[0] == "entity":
+        namespace, base_name, x, y, z, name, snbt = output[1:]
+        output = Entity(
+            namespace,
+            base_name,
+            x,
+            y,
+            z,
+            amulet_nbt.NamedTag(amulet_nbt.from_snbt(snbt), name),
+        )
+    else:
+        output = _unpack_block(output)
+    if block_entity is not None:
+        namespace, base_name, x, y, z, name, snbt = block_entity
+        block_entity = BlockEntity(
+            namespace,
+            base_name,
+            x,
+            y,
+            z,
+            amulet_nbt.NamedTag(amulet_nbt.from_snbt(snbt), name),
+        )
+    return output, block_entity, bool(extra_needed)
+
+
+class PersistentCache:
+    """
+    A file that stores the cacheable block translations so that they do not need recomputing in the next process.
+
+    The file is only valid for the build number that wrote it.
+    Data for a version is only decoded when the BlockTranslator for that version is created.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        # The raw data for each version. The key is the version key.
+        self._data: Dict[str, Dict[str, list]] = {}
+        self.load()
+
+    @property
+    def path(self) -> str:
+        """The path to the cache file."""
+        return self._path
+
+    def load(self):
+        """Read the cache file. Nothing is loaded if it does not exist or was written by a different build."""
+        self._data = {}
+        if not os.path.isfile(self._path):
+            return
+        try:
+            with gzip.open(self._path, "rb") as f:
+                data = json.loads(f.read().decode("utf-8"))
+        except Exception:
+            log.warning(f"Could not read translation cache {self._path}", exc_info=True)
+            return
+        if data.get("build_number") == build_number:
+            self._data = data["versions"]
+
+    def warm(
+        self,
+        version: "Version",
+        caches: Dict[Tuple[str, bool], BaseCache],
+        block_pool: Optional["BlockPool"] = None,
+    ):
+        """
+        Populate the translation caches of a BlockTranslator with the stored data for its version.
+
+        :param version: The version the caches belong to.
+        :param caches: The translation caches of the BlockTranslator.
+        :param block_pool: If given the output blocks are interned in it like newly translated blocks are.
+        """
+        for cache_key, entries in self._data.get(_version_key(version), {}).items():
+            cache = caches.get(_cache_key_tuple(cache_key))
+            if cache is None:
+                continue
+            for block, *value in entries:
+                try:
+                    output, block_entity, extra_needed = _unpack_value(value)
+                    if block_pool is not None and isinstance(output, Block):
+                        output = block_pool.intern(output)
+                    cache[_unpack_block(block)] = output, block_entity, extra_needed
+                except Exception:
+                    log.debug(f"Could not load cached translation for {block}")
+
+    def save(
+        self,
+        translators: Iterable[Tuple["Version", Dict[Tuple[str, bool], BaseCache]]] = (),
+    ):
+        """
+        Write the cache file.
+
+        :param translators: The version and translation caches for each BlockTranslator that has been loaded. Versions that have not been loaded keep the data that was read.
+        """
+        for version, caches in translators:
+            self._data[_version_key(version)] = {
+                _cache_key_str(cache_key): [
+                    [_pack_block(block), *_pack_value(value)]
+                    for block, value in cache.items()
+                ]
+                for cache_key, cache in caches.items()
+            }
+        os.makedirs(os.path.dirname(os.path.abspath(self._path)), exist_ok=True)
+        temp_path = f"{self._path}.tmp"
+        with gzip.open(temp_path, "wb") as f:
+            f.write(
+                json.dumps(
+                    {
+                        "build_number": build_number,
+                        "versions": self._data,
+                    },
+                    separators=(",", ":"),
+                ).encode("utf-8")
+            )
+        os.replace(temp_path, self._path)
@@ -0,0 +1,113 @@
+from typing import Dict, Optional, TYPE_CHECKING
+import sys
+import pickle
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+
+if TYPE_CHECKING:
+    from .translation_manager import TranslationManager
+
+"""
+Share a loaded TranslationManager with worker processes.
+
+Forked workers already share the memory of a TranslationManager created before the fork.
+A snapshot is needed when the workers are spawned or when the TranslationManager is created after the pool.
+
+    with translation_manager.snapshot() as snapshot:
+        with multiprocessing.Pool(initializer=init_worker, initargs=(snapshot,)) as pool:
+            ...
+
+    def init_worker(snapshot):
+        global translation_manager
+        translation_manager = snapshot.load()
+
+Each worker unpickles its own private copy of the TranslationManager. The shared memory only stores the pickled data once.
+The mapped database is not part of the pickled data. Each process maps database.bin again so the operating system shares those pages.
+"""
+
+# The TranslationManagers loaded from snapshots in this process. The key is the shared memory name.
+_loaded: Dict[str, "TranslationManager"] = {}
+
+
+def _attach(name: str) -> SharedMemory:
+    """Attach to an existing shared memory block without taking ownership of it."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, track=False)
+    shared_memory = SharedMemory(name)
+    # Before 3.13 every block that is opened is registered with the resource tracker which unlinks it when the process exits.
+    resource_tracker.unregister(shared_memory._name, "shared_memory")
+    return shared_memory
+
+
+class TranslationManagerSnapshot:
+    """
+    A read only copy of a TranslationManager stored in shared memory.
+
+    The snapshot contains the version data, the loaded translators, the compiled mappings and the warmed translation caches.
+    The numerical registries and the error caches are not included. Each process that loads the snapshot gets its own.
+    Everything else is also a private copy in each process so changes made in one process are not seen by the others.
+
+    Pickling the snapshot only stores the name of the shared memory block so it is cheap to send to a worker.
+    The process that created the snapshot owns the shared memory and must close it when the workers are done.
+    """
+
+    def __init__(self, translation_manager: "TranslationManager"):
+        data = pickle.dumps(translation_manager, pickle.HIGHEST_PROTOCOL)
+        self._shared_memory: Optional[SharedMemory] = SharedMemory(
+            create=True, size=len(data)
+        )
+        self._shared_memory.buf[: len(data)] = data
+        self._name = self._shared_memory.name
+        self._size = len(data)
+
+    def __getstate__(self):
+        return self._name, self._size
+
+    def __setstate__(self, state):
+        self._name, self._size = state
+        self._shared_memory = None
+
+    def __enter__(self) -> "TranslationManagerSnapshot":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def name(self) -> str:
+        """The name of the shared memory block."""
+        return self._name
+
+    @property
+    def size(self) -> int:
+        """The size of the snapshot in bytes."""
+        return self._size
+
+    def load(self) -> "TranslationManager":
+        """
+        Get the TranslationManager stored in this snapshot.
+
+        It is only unpickled the first time this is called in each process.
+        Later calls in the same process return the same instance.
+        """
+        translation_manager = _loaded.get(self._name)
+        if translation_manager is None:
+            shared_memory = _attach(self._name)
+            data = shared_memory.buf[: self._size]
+            try:
+                translation_manager = _loaded[self._name] = pickle.loads(data)
+            finally:
+                data.release()
+                shared_memory.close()
+        return translation_manager
+
+    def close(self):
+        """Free the shared memory. This does nothing if this process did not create the snapshot."""
+        if self._shared_memory is not None:
+            if sys.version_info < (3, 13):
+                # A worker sharing the resource tracker of this process removes the registration when it attaches.
+                # Register it again so that unlink does not try to remove a name that the tracker does not have.
+                resource_tracker.register(self._shared_memory._name, "shared_memory")
+            self._shared_memory.close()
+            self._shared_memory.unlink()
+            self._shared_memory = None
@@ -1,11 +1,30 @@
 import os
-from typing import Union, Tuple, List, Dict
+import atexit
+import bisect
+import weakref
+import threading
+from typing import Union, Tuple, List, Dict, Optional, Sequence
 import logging
 
 import numpy
 
 from .registry import NumericalRegistry
-from PyMCTranslate.py3.meta import minified
+from .version_translator import VersionTranslator
+from .persistent_cache import PersistentCache
+from .snapshot import TranslationManagerSnapshot
+from .block_pool import BlockPool
+from .version_manifest import (
+    VersionInfo,
+    find_version_names,
+    find_version_fingerprints,
+    get_version_manifest,
+)
+from PyMCTranslate.py3.util.cache import (
+    CacheFactory,
+    CacheInfo,
+    EmptyCacheInfo,
+    UnboundedCache,
+)
 from PyMCTranslate.py3.api import Block
 from PyMCTranslate.py3.api.rotate import RotateMode, RotationManager
 from PyMCTranslate.py3.api.version import Version
@@ -38,37 +57,68 @@ class TranslationManager:
        If you are using this library with Amulet an instance of this class will already exist in ``World.translation_manager``.
 
        If you are for some reason directly interacting with the amulet_core's ``WorldFormatWrapper`` class it too has a ``translation_manager`` attribute.
+
+    .. note::
+       The TranslationManager, the Version classes and the translators can be used from multiple threads.
+       The lazily loaded data is loaded once under a lock and the translation caches are locked.
+       Registering values in the numerical registries while other threads are translating is not supported.
     """
 
-    def __init__(self, json_path: str):
+    def __init__(
+        self,
+        json_path: str,
+        cache_factory: CacheFactory = None,
+        cache_path: str = None,
+        intern_blocks: bool = False,
+    ):
         """
         Call this class with the path to the mapping json files.
         .. important::
            This class should not be directly initiated. You should instead use ``PyMCTranslate.new_translation_manager()`` to request that a new translation manager be created.
 
         :param json_path: The path to the json directory
+        :param cache_factory: A callable that returns a new cache. This is called for each translation cache. Defaults to UnboundedCache. See PyMCTranslate.py3.util.cache
+        :param cache_path: Optional path to a file to store the block translation cache in between processes. See load_cache
+        :param intern_blocks: If True the translated blocks are interned in block_pool so equal blocks are the same instance.
         """
-        # Storage for each of the Version classes
+        self._cache_factory: CacheFactory = cache_factory or UnboundedCache
+        # Locks the lazily populated state
+        self._lock = threading.RLock()
+        self._persistent_cache: Optional[PersistentCache] = None
+        self._block_pool: Optional[BlockPool] = BlockPool() if intern_blocks else None
+        # The information about each version. This is enough to find a version without loading it.
+        self._version_infos: Dict[str, Dict[Tuple[int, int, int], VersionInfo]] = {}
+        # Storage for each of the Version classes. These are created when they are first requested.
         self._versions: Dict[str, Dict[Tuple[int, int, int], "Version"]] = {}
         # if a Version class for a specific version number does not exist the neareast will be found and stored here
         self._version_remap: Dict[
             Tuple[str, Union[Tuple[int, ...], int]], Tuple[int, int, int]
         ] = {}
 
+        # The VersionTranslator for each (source, destination) pair that has been requested
+        self._version_translators: Dict[
+            Tuple["Version", "Version"], VersionTranslator
+        ] = {}
+
+        # The sorted version numbers for each platform
+        self._version_numbers: Dict[str, List[Tuple[int, int, int]]] = {}
+        # The DataVersion and version number of each version for each platform sorted by (DataVersion, version number)
+        self._data_versions: Dict[str, Tuple[List[int], List[Tuple[int, int, int]]]] = (
+            {}
+        )
+
         self._biome_registry = NumericalRegistry()
         self._block_registry = NumericalRegistry()
         self._universal_format = None
 
-        # Create a class for each of the versions and store them
-        if minified:
-            init_file = "meta.json.gz"
-        else:
-            init_file = "__init__.json"
+        # Find the information for each version
+        self._versions_path = versions_path = os.path.join(json_path, "versions")
+        version_names = find_version_names(versions_path)
 
-        versions_path = os.path.join(json_path, "versions")
-
-        for version_name in os.listdir(versions_path):
-            if os.path.isfile(os.path.join(versions_path, version_name, init_file)):
+        def load_versions() -> List[VersionInfo]:
+            # The manifest does not exist or is out of date so every version must be loaded to find the information.
+            version_infos_ = []
+            for version_name in version_names:
                 try:
                     version = Version(os.path.join(versions_path, version_name), self)
                 except:
@@ -77,32 +127,91 @@ class TranslationManager:
                         exc_info=True,
                     )
                 else:
+                    version_infos_.append(VersionInfo.from_version(version))
                     self._versions.setdefault(version.platform, {}).setdefault(
                         version.version_number, version
                     )
+            return version_infos_
+
+        for version_info in get_version_manifest(
+            find_version_fingerprints(versions_path, version_names), load_versions
+        ):
+            self._version_infos.setdefault(version_info.platform, {}).setdefault(
+                version_info.version_number, version_info
+            )
 
-        for platform, versions in self._versions.items():
+        for platform, platform_infos in self._version_infos.items():
             # sort the dictionaries by version number
-            versions = self._versions[platform] = dict(
-                sorted(versions.items(), key=lambda v: v[0])
+            platform_infos = self._version_infos[platform] = dict(
+                sorted(platform_infos.items(), key=lambda v: v[0])
             )
 
-            for version in versions.values():
-                self._version_remap[(version.platform, version.data_version)] = (
-                    version.version_number
+            for version_info in platform_infos.values():
+                self._version_remap[(platform, version_info.data_version)] = (
+                    version_info.version_number
                 )
-                if version.platform == "universal":
-                    self._universal_format = version
+
+            # These are searched with bisect to find the nearest version
+            self._version_numbers[platform] = list(platform_infos)
+            data_versions = sorted(
+                (version_info.data_version, version_info.version_number)
+                for version_info in platform_infos.values()
+            )
+            self._data_versions[platform] = (
+                [data_version for data_version, _ in data_versions],
+                [version_number for _, version_number in data_versions],
+            )
 
         if len(self._version_remap) < 28:
             raise Exception(
                 "Failed to load the translators. Something has probably not been set up correctly."
             )
-        if self._universal_format is None:
+        if "universal" not in self._version_infos:
             raise Exception(
                 "Universal format was not found. Something has probably not been set up correctly."
             )
-        self._rotation_manger = RotationManager(self.universal_format)
+        self._universal_format = self._get_version(
+            "universal", self._version_numbers["universal"][-1]
+        )
+        # This is created when it is first used because translation does not need it
+        self._rotation_manger: Optional[RotationManager] = None
+
+        if cache_path is not None:
+            self.load_cache(cache_path)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        # The registries are mutable state that belongs to the world being loaded in each process.
+        state["_biome_registry"] = NumericalRegistry()
+        state["_block_registry"] = NumericalRegistry()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def snapshot(self) -> TranslationManagerSnapshot:
+        """
+        Create a read only copy of this TranslationManager in shared memory to send to worker processes.
+
+        Everything that has been loaded up to this point is included so worker processes do not need to load or warm anything again.
+        The cache factory must be picklable (eg a class or functools.partial) for this to work.
+        The numerical registries and error caches are not shared. Each worker starts with empty ones.
+        The persistent cache is not saved automatically by the workers.
+
+        :return: The snapshot. Pass this to the workers and call load in each of them. Call close in this process when the workers are done.
+        """
+        return TranslationManagerSnapshot(self)
+
+    @property
+    def rotation_manager(self) -> RotationManager:
+        """The class used to transform universal blocks. This is created when it is first used."""
+        if self._rotation_manger is None:
+            with self._lock:
+                if self._rotation_manger is None:
+                    self._rotation_manger = RotationManager(self.universal_format)
+        return self._rotation_manger
 
     @property
     def universal_format(self) -> Version:
@@ -127,7 +236,96 @@ class TranslationManager:
         :param mode: The rotation mode. See :class:`RotateMode` for more information
         :return: The transformed block state
         """
-        return self._rotation_manger.transform(block, transform, mode)
+        return self.rotation_manager.transform(block, transform, mode)
+
+    def transform_universal_palette(
+        self,
+        palette: Union[Sequence[Block], numpy.ndarray],
+        transform: numpy.ndarray,
+        mode: RotateMode = RotateMode.Nearest,
+    ) -> Tuple[numpy.ndarray, Dict[Block, Block]]:
+        """
+        Transform every block in a palette of universal blocks.
+
+        This is much faster than calling transform_universal_block for each block in a large selection.
+        Each unique block is only transformed once and the results for transforms that only swap and flip axes are reused between calls.
+
+        :param palette: A sequence or numpy object array of universal blocks.
+        :param transform: The transformation matrix to transform the blocks with
+        :param mode: The rotation mode. See :class:`RotateMode` for more information
+        :return: A numpy object array with the same shape as the palette containing the transformed blocks and a dictionary mapping each unique input block to its transformed block.
+        """
+        return self.rotation_manager.transform_palette(palette, transform, mode)
+
+    @property
+    def cache_factory(self) -> CacheFactory:
+        """The callable used to create each of the translation caches."""
+        return self._cache_factory
+
+    def cache_info(self) -> CacheInfo:
+        """
+        Get the combined statistics for all of the block translation caches that have been created.
+
+        :return: The hits, misses, evictions, number of entries, size and maximum size summed over every cache.
+        """
+        # copy the containers while holding the lock because other threads may add versions and translators
+        with self._lock:
+            versions = [
+                version
+                for versions in list(self._versions.values())
+                for version in list(versions.values())
+            ]
+            translators = list(self._version_translators.values())
+        caches = []
+        for version in versions:
+            if version._block is not None:
+                caches.extend(version._block.cache_info().values())
+        for translator in translators:
+            caches.extend(translator.cache_info().values())
+        return sum(caches, EmptyCacheInfo)
+
+    @property
+    def block_pool(self) -> Optional[BlockPool]:
+        """The intern table for the translated blocks. None if the TranslationManager was created with intern_blocks=False."""
+        return self._block_pool
+
+    @property
+    def persistent_cache(self) -> Optional[PersistentCache]:
+        """The persistent translation cache if one has been loaded."""
+        return self._persistent_cache
+
+    def load_cache(self, path: str):
+        """
+        Use a file to store the cacheable block translations between processes.
+
+        The stored translations for a version are added to the translation cache when it is first used.
+        The file is only valid for the build number that wrote it. Files written by other builds are ignored.
+        The file is written when the process exits or when save_cache is called.
+
+        :param path: The path to the cache file. It will be created if it does not exist.
+        """
+        with self._lock:
+            if self._persistent_cache is None:
+                atexit.register(_save_cache, weakref.ref(self))
+            self._persistent_cache = PersistentCache(path)
+            # versions that are already loaded will not see the new data so warm them now
+            for versions in self._versions.values():
+                for version in versions.values():
+                    if version._block is not None:
+                        self._persistent_cache.warm(
+                            version, version._block._cache, self._block_pool
+                        )
+
+    def save_cache(self):
+        """Write the cacheable block translations to the file given to load_cache."""
+        with self._lock:
+            if self._persistent_cache is not None:
+                self._persistent_cache.save(
+                    (version, version._block._cache)
+                    for versions in self._versions.values()
+                    for version in versions.values()
+                    if version._block is not None
+                )
 
     @property
     def biome_registry(self) -> NumericalRegistry:
@@ -146,7 +344,7 @@ class TranslationManager:
         Get a list of all the platforms there are Version classes for.
         Currently these are 'java', 'bedrock' and 'universal'
         """
-        return list(self._versions.keys())
+        return list(self._version_infos.keys())
 
     def version_numbers(self, platform: str) -> List[Tuple[int, int, int]]:
         """
@@ -156,9 +354,9 @@ class TranslationManager:
         :return: The a list of version numbers (tuples) for a given platform.
         :raise: Raises a KeyError if the platform is not present.
         """
-        if platform not in self._versions:
+        if platform not in self._version_infos:
             raise KeyError(f'The requested platform "{platform}" is not present')
-        return sorted(self._versions[platform].keys())
+        return list(self._version_numbers[platform])
 
     def get_version(
         self, platform: str, version_number: Union[int, Tuple[int, ...], List[int]]
@@ -173,45 +371,85 @@ class TranslationManager:
         """
         if isinstance(version_number, list):
             version_number = tuple(version_number)
-        if platform not in self._versions:
+        if platform not in self._version_infos:
             raise KeyError(f'The requested platform "{platform}" is not present')
         if (
             isinstance(version_number, int)
-            or version_number not in self._versions[platform]
+            or version_number not in self._version_infos[platform]
         ):
             version_number = self._get_version_number(platform, version_number)
-        return self._versions[platform][version_number]
+        return self._get_version(platform, version_number)
+
+    def _get_version(
+        self, platform: str, version_number: Tuple[int, int, int]
+    ) -> "Version":
+        """Get the Version class for an exact version number. The class is created if it does not exist."""
+        version = self._versions.get(platform, {}).get(version_number)
+        if version is None:
+            with self._lock:
+                version = self._versions.get(platform, {}).get(version_number)
+                if version is None:
+                    version = Version(
+                        os.path.join(
+                            self._versions_path,
+                            self._version_infos[platform][version_number].name,
+                        ),
+                        self,
+                    )
+                    self._versions.setdefault(platform, {})[version_number] = version
+        return version
+
+    def get_translator(
+        self, source: "Version", destination: "Version"
+    ) -> VersionTranslator:
+        """
+        Get a VersionTranslator to translate data directly from one Version to another.
+
+        :param source: The Version to translate from. (use ``TranslationManager.get_version`` to get a Version)
+        :param destination: The Version to translate to.
+        :return: The VersionTranslator for the two versions. The same instance is returned for repeated calls.
+        """
+        key = (source, destination)
+        translator = self._version_translators.get(key)
+        if translator is None:
+            with self._lock:
+                translator = self._version_translators.get(key)
+                if translator is None:
+                    translator = self._version_translators[key] = VersionTranslator(
+                        source, destination, self._cache_factory
+                    )
+        return translator
 
     def _get_version_number(
         self, platform: str, version_number: Union[int, Tuple[int, ...]]
+    ) -> Tuple[int, int, int]:
+        version_number_ = self._version_remap.get((platform, version_number))
+        if version_number_ is None:
+            with self._lock:
+                version_number_ = self._find_version_number(platform, version_number)
+        return version_number_
+
+    def _find_version_number(
+        self, platform: str, version_number: Union[int, Tuple[int, ...]]
     ) -> Tuple[int, int, int]:
         if (platform, version_number) not in self._version_remap:
             if isinstance(version_number, int):
-                previous_version = None
-                next_version = None
-                for version_number_, version in self._versions[platform].items():
-                    if version.data_version == version_number:
-                        self._version_remap[(platform, version_number)] = (
-                            version_number_
-                        )
-                        return version_number_
-                    elif version_number < version.data_version:
-                        if (
-                            next_version is None
-                            or version.data_version < next_version[0]
-                        ):
-                            next_version = version.data_version, version_number_
-                    else:
-                        if (
-                            previous_version is None
-                            or version.data_version >= previous_version[0]
-                        ):
-                            previous_version = version.data_version, version_number_
-                if next_version is not None:
-                    self._version_remap[(platform, version_number)] = next_version[1]
-                elif previous_version is not None:
-                    self._version_remap[(platform, version_number)] = previous_version[
-                        1
+                data_versions, version_numbers = self._data_versions[platform]
+                # the first version with a larger DataVersion
+                index = bisect.bisect_right(data_versions, version_number)
+                if index and data_versions[index - 1] == version_number:
+                    self._version_remap[(platform, version_number)] = version_numbers[
+                        index - 1
+                    ]
+                elif index < len(data_versions):
+                    # use the next version if there is one
+                    self._version_remap[(platform, version_number)] = version_numbers[
+                        index
+                    ]
+                elif data_versions:
+                    # otherwise use the previous version
+                    self._version_remap[(platform, version_number)] = version_numbers[
+                        -1
                     ]
                 else:
                     raise KeyError(
@@ -219,8 +457,6 @@ class TranslationManager:
                     )
 
             elif isinstance(version_number, tuple):
-                previous_version = None
-                next_version = None
                 if (
                     len(version_number) >= 2
                     and version_number[0] == 1
@@ -231,24 +467,27 @@ class TranslationManager:
                     version_number = (*version_number[1:], 0)
                 else:
                     src_version = None
-                for version_number_ in self._versions[platform].keys():
-                    if version_number_ < version_number:
-                        if previous_version is None:
-                            previous_version = version_number_
-                        elif version_number_ > previous_version:
-                            previous_version = version_number_
-                    elif version_number_ > version_number:
-                        if next_version is None:
-                            next_version = version_number_
-                        elif version_number_ < next_version:
-                            next_version = version_number_
-                if previous_version is not None:
-                    self._version_remap[(platform, version_number)] = previous_version
+                version_numbers = self._version_numbers[platform]
+                # the first version that is not smaller
+                index = bisect.bisect_left(version_numbers, version_number)
+                if (
+                    index < len(version_numbers)
+                    and version_numbers[index] == version_number
+                ):
+                    # only reachable through the 1.26.x remap
+                    self._version_remap[(platform, version_number)] = version_number
+                elif index:
+                    # use the previous version
+                    self._version_remap[(platform, version_number)] = version_numbers[
+                        index - 1
+                    ]
                 elif version_number[:2] < (
                     1,
                     12,
                 ):  # TODO: this is a temporary workaround until more versions are added
-                    self._version_remap[(platform, version_number)] = next_version
+                    self._version_remap[(platform, version_number)] = version_numbers[
+                        index
+                    ]
                 else:
                     raise KeyError(
                         f"Could not find a version for Version({platform}, {version_number})"
@@ -263,3 +502,12 @@ class TranslationManager:
                     f"version number type {version_number.__class__} is not supported"
                 )
         return self._version_remap[(platform, version_number)]
+
+
+def _save_cache(translation_manager_ref: "weakref.ref[TranslationManager]"):
+    translation_manager = translation_manager_ref()
+    if translation_manager is not None:
+        try:
+            translation_manager.save_cache()
+        except Exception:
+            log.warning("Could not save the translation cache", exc_info=True)
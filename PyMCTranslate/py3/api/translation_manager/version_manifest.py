@@ -0,0 +1,177 @@
+from typing import (
+    Tuple,
+    List,
+    Dict,
+    Optional,
+    Collection,
+    NamedTuple,
+    Callable,
+    TYPE_CHECKING,
+)
+import os
+import json
+import hashlib
+import logging
+
+from PyMCTranslate.py3.meta import pymct_dir, mapped_database
+from PyMCTranslate.py3.util.build_data import (
+    load_build_data,
+    save_build_data,
+    get_build_data,
+)
+
+if TYPE_CHECKING:
+    from PyMCTranslate.py3.api.version import Version
+
+log = logging.getLogger(__name__)
+
+"""
+The version manifest stores the information needed to find a version without loading it.
+This allows the TranslationManager to create each Version class when it is first used.
+It is built by build_tools/build_data.py and shipped in version_manifest.json.
+See PyMCTranslate/py3/util/build_data.py for the file format.
+
+data stored under "versions"
+[
+    [<directory name>, <platform>, [<version number>], <data version>, <block format>, <fingerprint>],
+    ...
+]
+
+The fingerprint is a hash of the contents of the version's __init__.json file.
+The manifest is only used if the fingerprint of every version matches so that a changed version is never used with stale information.
+"""
+
+VersionManifestPath = os.path.join(pymct_dir, "version_manifest.json")
+
+
+class VersionInfo(NamedTuple):
+    """The information about a version that is needed before it is loaded."""
+
+    #: The name of the version directory.
+    name: str
+    platform: str
+    version_number: Tuple[int, int, int]
+    data_version: int
+    block_format: str
+
+    @classmethod
+    def from_version(cls, version: "Version") -> "VersionInfo":
+        return cls(
+            os.path.basename(version._version_path),
+            version.platform,
+            version.version_number,
+            version.data_version,
+            version.block_format,
+        )
+
+
+def find_version_names(versions_path: str) -> List[str]:
+    """
+    Find the names of the versions in the database.
+
+    :param versions_path: The path to the versions directory.
+    :return: The name of each version directory.
+    """
+    if mapped_database is not None:
+        return list(mapped_database.keys())
+    return [
+        version_name
+        for version_name in os.listdir(versions_path)
+        if os.path.isfile(os.path.join(versions_path, version_name, "__init__.json"))
+    ]
+
+
+def find_version_fingerprints(
+    versions_path: str, version_names: Collection[str]
+) -> Dict[str, str]:
+    """
+    Find the fingerprint of each version.
+
+    :param versions_path: The path to the versions directory.
+    :param version_names: The names of the version directories.
+    :return: A dictionary mapping the version name to the fingerprint of its __init__.json file.
+    """
+    fingerprints = {}
+    for version_name in version_names:
+        if mapped_database is not None:
+            init = mapped_database[version_name]["meta"]["__init__"]
+        else:
+            with open(os.path.join(versions_path, version_name, "__init__.json")) as f:
+                init = json.load(f)
+        # The data is serialised in a canonical form so that the fingerprint is the same for the json files and the mapped database.
+        fingerprints[version_name] = hashlib.sha1(
+            json.dumps(init, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        ).hexdigest()
+    return fingerprints
+
+
+def _encode_version_manifest(
+    version_infos: Collection[VersionInfo], fingerprints: Dict[str, str]
+) -> List[list]:
+    return [
+        list(version_info) + [fingerprints[version_info.name]]
+        for version_info in version_infos
+    ]
+
+
+def _decode_version_manifest(data: List[list]) -> List[VersionInfo]:
+    return [
+        VersionInfo(name, platform, tuple(version_number), data_version, block_format)
+        for name, platform, version_number, data_version, block_format, _ in data
+    ]
+
+
+def load_version_manifest(
+    fingerprints: Dict[str, str], path: str = VersionManifestPath
+) -> Optional[List[VersionInfo]]:
+    """
+    Load the version manifest.
+
+    :param fingerprints: The fingerprint of each version that exists. The manifest is only valid if it lists exactly these.
+    :param path: The path to the manifest.
+    :return: The information for each version. None if the manifest does not exist, was built for a different build or lists different versions.
+    """
+    data = load_build_data(path, "versions")
+    if data is None or not _version_manifest_valid(data, fingerprints):
+        return None
+    return _decode_version_manifest(data)
+
+
+def _version_manifest_valid(data: List[list], fingerprints: Dict[str, str]) -> bool:
+    return (
+        all(isinstance(version, list) and len(version) == 6 for version in data)
+        and {version[0]: version[5] for version in data} == fingerprints
+    )
+
+
+def save_version_manifest(
+    version_infos: Collection[VersionInfo],
+    fingerprints: Dict[str, str],
+    path: str = VersionManifestPath,
+):
+    """Write the version manifest for the current build."""
+    save_build_data(
+        path, "versions", _encode_version_manifest(version_infos, fingerprints)
+    )
+
+
+def get_version_manifest(
+    fingerprints: Dict[str, str],
+    build: Callable[[], Collection[VersionInfo]],
+    path: str = VersionManifestPath,
+) -> List[VersionInfo]:
+    """
+    Get the version manifest or build it if it is missing or out of date.
+
+    :param fingerprints: The fingerprint of each version that exists. The manifest is only valid if it lists exactly these.
+    :param build: A function that loads the versions to find the information for each version.
+    :param path: The path to the manifest.
+    :return: The information for each version.
+    """
+    return get_build_data(
+        path,
+        "versions",
+        lambda: _encode_version_manifest(build(), fingerprints),
+        _decode_version_manifest,
+        lambda data: _version_manifest_valid(data, fingerprints),
+    )
@@ -0,0 +1,159 @@
+from typing import Tuple, Union, Callable, Optional, Dict, TYPE_CHECKING
+
+from PyMCTranslate.py3.api import Block, BlockEntity, Entity
+from PyMCTranslate.py3.api.version.translators.base import copy_object
+from PyMCTranslate.py3.util.cache import BaseCache, CacheFactory, CacheInfo
+
+if TYPE_CHECKING:
+    from PyMCTranslate.py3.api.version import Version
+
+BlockCoordinates = Tuple[int, int, int]
+GetBlockCallback = Callable[[Tuple[int, int, int]], Tuple[Block, Optional[BlockEntity]]]
+
+
+class VersionTranslator:
+    """
+    Translate blocks directly from one Version to another.
+
+    This is equivalent to translating to the universal format with the source Version and then from the universal format with the destination Version.
+    Cacheable results are stored against the source block so repeated blocks skip both lookups and the intermediate universal block.
+
+    .. important::
+           This class should not be directly initiated. You should use ``TranslationManager.get_translator`` to get an instance of it.
+    """
+
+    def __init__(
+        self, source: "Version", destination: "Version", cache_factory: CacheFactory
+    ):
+        self._source = source
+        self._destination = destination
+        self._cache_factory = cache_factory
+        # The composed translations.
+        # The key is (source force_blockstate, destination force_blockstate)
+        self._cache: Dict[Tuple[bool, bool], BaseCache] = {}
+
+    def __repr__(self):
+        return f"PyMCTranslate.VersionTranslator({self._source}, {self._destination})"
+
+    @property
+    def source(self) -> "Version":
+        """The Version that blocks are translated from."""
+        return self._source
+
+    @property
+    def destination(self) -> "Version":
+        """The Version that blocks are translated to."""
+        return self._destination
+
+    def cache_info(self) -> Dict[Tuple[bool, bool], CacheInfo]:
+        """
+        Get the statistics for the composed translation caches.
+
+        :return: A dictionary mapping (source force_blockstate, destination force_blockstate) to the statistics for that cache.
+        """
+        return {key: cache.info() for key, cache in self._cache.items()}
+
+    def translate_block(
+        self,
+        block: Block,
+        block_entity: BlockEntity = None,
+        source_force_blockstate: bool = False,
+        destination_force_blockstate: bool = False,
+        block_location: BlockCoordinates = (0, 0, 0),
+        get_block_callback: GetBlockCallback = None,
+    ) -> Union[
+        Tuple[Block, Optional[BlockEntity], bool],
+        Tuple[Entity, None, bool],
+    ]:
+        """
+        Translate the given Block object and optional BlockEntity from the source Version's format to the destination Version's format.
+
+        :param block: The block to translate
+        :param block_entity: An optional block entity related to the block input
+        :param source_force_blockstate: True if the input is in the blockstate format. False if it is in the native format (these are sometimes the same)
+        :param destination_force_blockstate: True to get the blockstate format. False to get the native format (these are sometimes the same)
+        :param block_location: The location of the block in the world
+        :param get_block_callback: A callable with relative coordinates that returns a Block and optional BlockEntity in the source Version's format
+        :return: There are two formats that can be returned. The first is a Block, optional BlockEntity and a bool. The second is an Entity, None and a bool. The bool specifies if block_location and get_block_callback are required to fully define the output data.
+        """
+        return self._translate_block(
+            block,
+            block_entity,
+            source_force_blockstate,
+            destination_force_blockstate,
+            block_location,
+            get_block_callback,
+        )[:3]
+
+    def _translate_block(
+        self,
+        block: Block,
+        block_entity: Optional[BlockEntity],
+        source_force_blockstate: bool,
+        destination_force_blockstate: bool,
+        block_location: BlockCoordinates,
+        get_block_callback: Optional[GetBlockCallback],
+    ) -> Union[
+        Tuple[Block, Optional[BlockEntity], bool, bool],
+        Tuple[Entity, None, bool, bool],
+    ]:
+        """The same as translate_block but the last value in the returned tuple is True if the output can be cached."""
+        cache_key = (source_force_blockstate, destination_force_blockstate)
+        cache = self._cache.get(cache_key)
+        if cache is None:
+            # setdefault is atomic so concurrent callers get the same cache
+            cache = self._cache.setdefault(cache_key, self._cache_factory())
+        if block_entity is None:
+            cached = cache.get(block)
+        else:
+            cached = None
+        if cached is not None:
+            output, extra_output, extra_needed = cached
+            return copy_object(output), copy_object(extra_output), extra_needed, True
+
+        (
+            universal_block,
+            universal_block_entity,
+            extra_needed,
+            cacheable,
+        ) = self._source.block._to_universal(
+            block,
+            block_entity,
+            source_force_blockstate,
+            block_location,
+            get_block_callback,
+        )
+
+        if get_block_callback is None:
+            universal_block_callback = None
+        else:
+
+            def universal_block_callback(
+                location: Tuple[int, int, int],
+            ) -> Tuple[Block, Optional[BlockEntity]]:
+                return self._source.block.to_universal(
+                    *get_block_callback(location),
+                    source_force_blockstate,
+                )[:2]
+
+        (
+            output,
+            extra_output,
+            extra_needed_,
+            cacheable_,
+        ) = self._destination.block._from_universal(
+            universal_block,
+            universal_block_entity,
+            destination_force_blockstate,
+            block_location,
+            universal_block_callback,
+        )
+        extra_needed = extra_needed or extra_needed_
+
+        cacheable = block_entity is None and cacheable and cacheable_
+        if cacheable:
+            cache[block] = output, extra_output, extra_needed
+            output = copy_object(output)
+            extra_output = copy_object(extra_output)
+
+        return output, extra_output, extra_needed, cacheable
@@ -1,30 +1,61 @@
+from typing import Callable, Dict
 import importlib
-import pkgutil
-import PyMCTranslate
-import PyMCTranslate.code_functions
-
-code_functions = {}
-
-
-def _load_function(module_name: str):
-    code_module = importlib.import_module(module_name)
-    assert hasattr(code_module, "main")
-    code_functions[module_name.split(".")[-1]] = code_module.main
-
-
-def _load_functions():
-    package = PyMCTranslate.code_functions
-    package_prefix = package.__name__ + "."
-
-    for _, name, _ in pkgutil.walk_packages(package.__path__, package_prefix):
-        _load_function(name)
+import threading
 
+import PyMCTranslate.code_functions
 
-_load_functions()
+"""
+Code functions are python functions that code mappings call by name.
+Each module in PyMCTranslate.code_functions defines one function called main which is named after the module.
+The modules are only imported when a mapping first runs them.
+"""
+
+# The functions that have been imported or registered.
+code_functions: Dict[str, Callable] = {}
+_lock = threading.Lock()
+
+
+def _load_function(function_name: str) -> Callable:
+    with _lock:
+        function = code_functions.get(function_name)
+        if function is None:
+            module_name = f"{PyMCTranslate.code_functions.__name__}.{function_name}"
+            try:
+                code_module = importlib.import_module(module_name)
+            except ModuleNotFoundError as e:
+                # only a missing function module is a missing function. Errors from its imports are raised as is.
+                if e.name != module_name:
+                    raise
+                raise KeyError(
+                    f"Code function {function_name} could not be found"
+                ) from None
+            function = getattr(code_module, "main", None)
+            if not callable(function):
+                raise TypeError(
+                    f"Code function module {function_name} does not define a main function"
+                )
+            code_functions[function_name] = function
+        return function
+
+
+def register(function_name: str, function: Callable):
+    """
+    Register a code function so that mappings can run it by name.
+    This allows mappings for mods to use functions that are not part of this library.
+    A function registered with the name of an existing function replaces it.
+    Functions are not shared between processes so they must be registered in each process.
+
+    :param function_name: The name the mappings use to run the function.
+    :param function: The function. It is called with the inputs of the mapping as positional arguments.
+    """
+    if not callable(function):
+        raise TypeError(f"Code function {function_name} must be callable")
+    with _lock:
+        code_functions[function_name] = function
 
 
 def run(function_name, inputs):
-    assert (
-        function_name in code_functions
-    ), f"Function {function_name} could not be found"
-    return code_functions[function_name](*inputs)
+    function = code_functions.get(function_name)
+    if function is None:
+        function = _load_function(function_name)
+    return function(*inputs)
@@ -0,0 +1,764 @@
+"""
+A compiler that converts the mapping json into a tree of pre-bound python functions.
+
+The interpreter in translate._translate looks up each function by name and re-walks the nested options every time a mapping is run.
+A CompiledMapping does that work once so that running the mapping only has to call the functions.
+The behaviour must stay identical to translate._translate.
+"""
+
+from typing import Union, Tuple, List, Dict, Callable, Optional, Any
+import logging
+
+import amulet_nbt
+from amulet_nbt import AbstractBaseTag, NamedTag, TAG_Compound
+
+from PyMCTranslate.py3.api import Block, ChunkLoadError
+from PyMCTranslate.py3.api.version import code_functions
+from PyMCTranslate.py3.util.snbt import from_snbt, copy_nbt
+from PyMCTranslate.py3.api.version.translate import (
+    index_nbt,
+    datatype_to_nbt,
+    nbt_to_datatype,
+)
+
+log = logging.getLogger(__name__)
+
+BlockCoordinates = Tuple[int, int, int]
+NBTPath = Tuple[str, str, List[Tuple[Union[str, int], str]]]
+
+# A compiled mapping function.
+# (state, block_input, nbt_input, get_block_callback, absolute_location, relative_location, nbt_path) -> None
+Step = Callable[..., None]
+Steps = Tuple[Step, ...]
+
+_compilers: Dict[str, Callable[[dict], Step]] = {}
+
+NotDefined = object()
+
+
+class _TranslationState:
+    """The mutable state shared by all the functions in one run of a mapping."""
+
+    __slots__ = ("output_name", "output_type", "new_data", "extra_needed", "cacheable")
+
+    def __init__(self):
+        self.output_name: Optional[str] = None
+        self.output_type: Optional[str] = None
+        self.new_data = {"properties": {}, "nbt": []}
+        self.extra_needed = False
+        self.cacheable = True
+
+
+class CompiledMapping:
+    """
+    A mapping that is compiled into python functions the first time it is run.
+
+    This can be given to translate.translate in place of the raw mapping list.
+    """
+
+    __slots__ = ("_mappings", "_steps")
+
+    def __init__(self, mappings: List[dict]):
+        self._mappings = mappings
+        self._steps: Optional[Steps] = None
+
+    def __reduce__(self):
+        # The compiled functions are closures which cannot be pickled. They are compiled again when first run.
+        return CompiledMapping, (self._mappings,)
+
+    @property
+    def mappings(self) -> List[dict]:
+        """The raw mapping this was compiled from."""
+        return self._mappings
+
+    def run(
+        self,
+        block_input: Optional[Block],
+        nbt_input: Optional[NamedTag],
+        get_block_callback: Optional[Callable],
+        absolute_location: BlockCoordinates = (0, 0, 0),
+    ) -> Tuple[Optional[str], Optional[str], dict, bool, bool]:
+        """
+        Run the mapping. This has the same inputs and outputs as translate._translate
+
+        :return: output_name, output_type, new_data, extra_needed, cacheable
+        """
+        steps = self._steps
+        if steps is None:
+            # compiling here means errors in the mapping are raised in the same place as the interpreter.
+            steps = self._steps = _compile_functions(self._mappings)
+        state = _TranslationState()
+        _run(
+            steps,
+            state,
+            block_input,
+            nbt_input,
+            get_block_callback,
+            absolute_location,
+            (0, 0, 0),
+            None,
+        )
+        return (
+            state.output_name,
+            state.output_type,
+            state.new_data,
+            state.extra_needed,
+            state.cacheable,
+        )
+
+
+def compile_mapping(mappings: List[dict]) -> CompiledMapping:
+    """Create a CompiledMapping from the raw mapping list."""
+    return CompiledMapping(mappings)
+
+
+def _run(
+    steps: Steps,
+    state: _TranslationState,
+    block_input,
+    nbt_input,
+    get_block_callback,
+    absolute_location,
+    relative_location,
+    nbt_path,
+):
+    for step in steps:
+        step(
+            state,
+            block_input,
+            nbt_input,
+            get_block_callback,
+            absolute_location,
+            relative_location,
+            nbt_path,
+        )
+
+
+def _compile_functions(mappings: List[dict]) -> Steps:
+    steps = []
+    for translate_function in mappings:
+        compiler = _compilers.get(translate_function["function"])
+        # unknown functions are ignored like they are in the interpreter
+        if compiler is not None:
+            steps.append(compiler(translate_function))
+    return tuple(steps)
+
+
+def _compiler(function_name: str):
+    def register(compiler: Callable[[dict], Step]):
+        _compilers[function_name] = compiler
+        return compiler
+
+    return register
+
+
+def _parse_tag_keys(snbt_keys) -> Dict[AbstractBaseTag, str]:
+    """
+    Parse SNBT keys into a dictionary from the tag to the original SNBT.
+    The keys are only used for look ups so the parsed tags are never modified.
+    The interpreter compares the SNBT of the input tag so keys that are not in canonical form can never match.
+    These are skipped so that comparing tags gives the same result as comparing SNBT.
+    """
+    tags = {}
+    for snbt in snbt_keys:
+        tag = from_snbt(snbt)
+        if tag.to_snbt() == snbt:
+            try:
+                tags[tag] = snbt
+            except TypeError:
+                # mutable tags are not hashable and cannot be keys
+                pass
+    return tags
+
+
+def _lookup(table: dict, tag: AbstractBaseTag, default=None):
+    try:
+        return table.get(tag, default)
+    except TypeError:
+        # mutable tags are not hashable and cannot be keys
+        return default
+
+
+@_compiler("new_block")
+def _compile_new_block(translate_function: dict) -> Step:
+    output_name = translate_function["options"]
+
+    def new_block(state: _TranslationState, *_):
+        state.output_name = output_name
+        state.output_type = "block"
+
+    return new_block
+
+
+@_compiler("new_entity")
+def _compile_new_entity(translate_function: dict) -> Step:
+    output_name = translate_function["options"]
+
+    def new_entity(state: _TranslationState, *_):
+        state.output_name = output_name
+        state.output_type = "entity"
+
+    return new_entity
+
+
+@_compiler("new_properties")
+def _compile_new_properties(translate_function: dict) -> Step:
+    properties = {
+        key: from_snbt(val) for key, val in translate_function["options"].items()
+    }
+
+    def new_properties(state: _TranslationState, *_):
+        state.new_data["properties"].update(properties)
+
+    return new_properties
+
+
+@_compiler("carry_properties")
+def _compile_carry_properties(translate_function: dict) -> Step:
+    options = {
+        key: _parse_tag_keys(values)
+        for key, values in translate_function["options"].items()
+    }
+
+    def carry_properties(state: _TranslationState, block_input, *_):
+        assert isinstance(block_input, Block), "The block input is not a block"
+        properties = block_input.properties
+        new_properties = state.new_data["properties"]
+        for key, values in options.items():
+            if key in properties:
+                val = properties[key]
+                if (
+                    isinstance(val, AbstractBaseTag)
+                    and _lookup(values, val) is not None
+                ):
+                    new_properties[key] = val
+
+    return carry_properties
+
+
+@_compiler("map_properties")
+def _compile_map_properties(translate_function: dict) -> Step:
+    options = {
+        key: {
+            tag: _compile_functions(cases[snbt])
+            for tag, snbt in _parse_tag_keys(cases).items()
+        }
+        for key, cases in translate_function["options"].items()
+    }
+
+    def map_properties(
+        state: _TranslationState,
+        block_input,
+        nbt_input,
+        get_block_callback,
+        absolute_location,
+        relative_location,
+        nbt_path,
+    ):
+        assert isinstance(block_input, Block), "The block input is not a block"
+        properties = block_input.properties
+        for key, cases in options.items():
+            if key in properties:
+                val = properties[key]
+                if isinstance(val, AbstractBaseTag):
+                    steps = _lookup(cases, val)
+                    if steps is not None:
+                        _run(
+                            steps,
+                            state,
+                            block_input,
+                            nbt_input,
+                            get_block_callback,
+                            absolute_location,
+                            relative_location,
+                            nbt_path,
+                        )
+
+    return map_properties
+
+
+@_compiler("multiblock")
+def _compile_multiblock(translate_function: dict) -> Step:
+    multiblocks = translate_function["options"]
+    if isinstance(multiblocks, dict):
+        multiblocks = [multiblocks]
+    multiblocks = tuple(
+        (tuple(multiblock["coords"]), _compile_functions(multiblock["functions"]))
+        for multiblock in multiblocks
+    )
+
+    def multiblock(
+        state: _TranslationState,
+        block_input,
+        nbt_input,
+        get_block_callback,
+        absolute_location,
+        relative_location,
+        nbt_path,
+    ):
+        state.cacheable = False
+        if get_block_callback is None:
+            state.extra_needed = True
+        else:
+            for (dx, dy, dz), steps in multiblocks:
+                new_location = (
+                    relative_location[0] + dx,
+                    relative_location[1] + dy,
+                    relative_location[2] + dz,
+                )
+                new_absolute_location = (
+                    absolute_location[0] + dx,
+                    absolute_location[1] + dy,
+                    absolute_location[2] + dz,
+                )
+                # the interpreter discards changes made by a failed nested call
+                previous_state = (
+                    state.output_name,
+                    state.output_type,
+                    state.extra_needed,
+                    state.cacheable,
+                )
+                try:
+                    block_input_, nbt_input_ = get_block_callback(new_location)
+                    if nbt_input_ is not None:
+                        nbt_input_ = nbt_input_.nbt
+                    _run(
+                        steps,
+                        state,
+                        block_input_,
+                        nbt_input_,
+                        get_block_callback,
+                        new_absolute_location,
+                        new_location,
+                        nbt_path,
+                    )
+                except ChunkLoadError:
+                    (
+                        state.output_name,
+                        state.output_type,
+                        state.extra_needed,
+                        state.cacheable,
+                    ) = previous_state
+
+    return multiblock
+
+
+@_compiler("map_block_name")
+def _compile_map_block_name(translate_function: dict) -> Step:
+    options = {
+        block_name: _compile_functions(functions)
+        for block_name, functions in translate_function["options"].items()
+    }
+
+    def map_block_name(
+        state: _TranslationState,
+        block_input,
+        nbt_input,
+        get_block_callback,
+        absolute_location,
+        relative_location,
+        nbt_path,
+    ):
+        assert isinstance(
+            block_input, Block
+        ), f"The block input {block_input} is not a block"
+        steps = options.get(f"{block_input.namespace}:{block_input.base_name}")
+        if steps is not None:
+            _run(
+                steps,
+                state,
+                block_input,
+                nbt_input,
+                get_block_callback,
+                absolute_location,
+                relative_location,
+                nbt_path,
+            )
+
+    return map_block_name
+
+
+class _WalkNode:
+    """The compiled form of the walk_input_nbt options."""
+
+    __slots__ = (
+        "datatype",
+        "nested_datatype",
+        "nbt_class",
+        "functions",
+        "keys",
+        "index",
+        "nested_default",
+        "nested_default_is_carry",
+        "self_default",
+    )
+
+    def __init__(self, mappings: dict):
+        self.datatype: str = mappings["type"]
+        self.nested_datatype = self.datatype.replace("_array", "")
+        self.nbt_class = datatype_to_nbt(self.datatype)
+        self.functions: Optional[Steps] = (
+            _compile_functions(mappings["functions"])
+            if "functions" in mappings
+            else None
+        )
+        self.keys: Dict[str, _WalkNode] = {
+            key: _WalkNode(nested) for key, nested in mappings.get("keys", {}).items()
+        }
+        self.index: Dict[int, _WalkNode] = {
+            int(index): _WalkNode(nested)
+            for index, nested in mappings.get("index", {}).items()
+            # the interpreter looks up str(index) so only canonical keys can match
+            if str(int(index)) == index
+        }
+        self.nested_default: Optional[Steps] = (
+            _compile_functions(mappings["nested_default"])
+            if "nested_default" in mappings
+            else None
+        )
+        self.nested_default_is_carry = mappings.get("nested_default") == [
+            {"function": "carry_nbt"}
+        ]
+        self.self_default: Optional[Steps] = (
+            _compile_functions(mappings["self_default"])
+            if "self_default" in mappings
+            else None
+        )
+
+
+def _walk_input_nbt(
+    node: _WalkNode,
+    state: _TranslationState,
+    block_input,
+    nbt_input,
+    get_block_callback,
+    absolute_location,
+    relative_location,
+    nbt_path: Optional[NBTPath],
+):
+    """The compiled equivalent of translate._convert_walk_input_nbt"""
+    if nbt_path is None:
+        nbt_path = ("", "compound", [])
+
+    # nbt_path should always exist in nbt_input because the calling code should check that
+    nbt = index_nbt(nbt_input, nbt_path)
+
+    if node.functions is not None:
+        _run(
+            node.functions,
+            state,
+            block_input,
+            nbt_input,
+            get_block_callback,
+            absolute_location,
+            relative_location,
+            nbt_path,
+        )
+
+    if isinstance(nbt, node.nbt_class):
+        datatype = node.datatype
+        if datatype == "compound":
+            nested = ((key, nbt_to_datatype, node.keys) for key in nbt)
+        elif datatype == "list":
+            nested = ((index, nbt_to_datatype, node.index) for index in range(len(nbt)))
+        elif datatype in ("byte_array", "int_array", "long_array"):
+            nested = ((index, None, node.index) for index in range(len(nbt)))
+        else:
+            nested = ()
+
+        for key, get_datatype, nested_nodes in nested:
+            if key in nested_nodes or node.nested_default is not None:
+                nested_path = (
+                    nbt_path[0],
+                    nbt_path[1],
+                    nbt_path[2]
+                    + [
+                        (
+                            key,
+                            (
+                                node.nested_datatype
+                                if get_datatype is None
+                                else get_datatype(nbt[key])
+                            ),
+                        )
+                    ],
+                )
+                if key in nested_nodes:
+                    _walk_input_nbt(
+                        nested_nodes[key],
+                        state,
+                        block_input,
+                        nbt_input,
+                        get_block_callback,
+                        absolute_location,
+                        relative_location,
+                        nested_path,
+                    )
+                else:
+                    if get_datatype is not None and node.nested_default_is_carry:
+                        log.info(f"Unnaccounted data at {nested_path}")
+                    _run(
+                        node.nested_default,
+                        state,
+                        block_input,
+                        nbt_input,
+                        get_block_callback,
+                        absolute_location,
+                        relative_location,
+                        nested_path,
+                    )
+
+    elif node.self_default is not None:
+        # datatypes do not match. Run self_default
+        _run(
+            node.self_default,
+            state,
+            block_input,
+            nbt_input,
+            get_block_callback,
+            absolute_location,
+            relative_location,
+            nbt_path,
+        )
+
+
+@_compiler("walk_input_nbt")
+def _compile_walk_input_nbt(translate_function: dict) -> Step:
+    node = _WalkNode(translate_function["options"])
+    custom_nbt_path = translate_function.get("path", [])
+
+    def walk_input_nbt(
+        state: _TranslationState,
+        block_input,
+        nbt_input,
+        get_block_callback,
+        absolute_location,
+        relative_location,
+        nbt_path,
+    ):
+        state.cacheable = False
+        if nbt_input is None:
+            state.extra_needed = True
+        elif custom_nbt_path:
+            nbt_temp = index_nbt(nbt_input, ("", "compound", custom_nbt_path))
+            if nbt_temp is None:
+                log.error(f"Expected nbt data at {custom_nbt_path}")
+            elif not isinstance(nbt_temp, datatype_to_nbt(custom_nbt_path[-1][-1])):
+                log.error(
+                    f"Expected nbt data at {custom_nbt_path} to be an {custom_nbt_path[-1][-1]} tag but got {nbt_temp.__class__}"
+                )
+            else:
+                _walk_input_nbt(
+                    node,
+                    state,
+                    block_input,
+                    nbt_input,
+                    get_block_callback,
+                    absolute_location,
+                    relative_location,
+                    ("", "compound", custom_nbt_path),
+                )
+        else:
+            _walk_input_nbt(
+                node,
+                state,
+                block_input,
+                nbt_input,
+                get_block_callback,
+                absolute_location,
+                relative_location,
+                nbt_path,
+            )
+
+    return walk_input_nbt
+
+
+@_compiler("new_nbt")
+def _compile_new_nbt(translate_function: dict) -> Step:
+    new_nbts = translate_function["options"]
+    if isinstance(new_nbts, dict):
+        new_nbts = [new_nbts]
+    new_nbts = tuple(
+        (
+            new_nbt.get("outer_name", ""),
+            new_nbt.get("outer_type", "compound"),
+            new_nbt.get("path", NotDefined),
+            new_nbt["key"],
+            from_snbt(new_nbt["value"]),
+        )
+        for new_nbt in new_nbts
+    )
+
+    def new_nbt(
+        state: _TranslationState,
+        block_input,
+        nbt_input,
+        get_block_callback,
+        absolute_location,
+        relative_location,
+        nbt_path,
+    ):
+        nbt_list = state.new_data["nbt"]
+        for outer_name, outer_type, path, key, value in new_nbts:
+            if path is NotDefined:
+                path = [] if nbt_path is None else nbt_path[2]
+            nbt_list.append((outer_name, outer_type, path, key, copy_nbt(value)))
+
+    return new_nbt
+
+
+@_compiler("carry_nbt")
+def _compile_carry_nbt(translate_function: dict) -> Step:
+    options = translate_function.get("options", {})
+    outer_name = options.get("outer_name", "")
+    outer_type = options.get("outer_type", "compound")
+
+    def carry_nbt(
+        state: _TranslationState,
+        block_input,
+        nbt_input,
+        get_block_callback,
+        absolute_location,
+        relative_location,
+        nbt_path,
+    ):
+        state.cacheable = False
+        if nbt_input is None:
+            state.extra_needed = True
+        elif nbt_path is not None:
+            nbt = index_nbt(nbt_input, nbt_path)
+            if nbt is None:
+                raise Exception(
+                    "This code should not be run because it should be caught by other code before it gets here."
+                )
+            val = nbt.py_data
+
+            path = options.get("path", nbt_path[2][:-1])
+            key = options.get("key", nbt_path[2][-1][0])
+            nbt_type = options.get("type", nbt_path[2][-1][1])
+
+            state.new_data["nbt"].append(
+                (outer_name, outer_type, path, key, datatype_to_nbt(nbt_type)(val))
+            )
+
+    return carry_nbt
+
+
+@_compiler("map_nbt")
+def _compile_map_nbt(translate_function: dict) -> Step:
+    options = translate_function["options"]
+    # The input can be any NBT type (including unhashable ones) so this is looked up by SNBT
+    cases: Optional[Dict[str, Steps]] = (
+        {
+            snbt: _compile_functions(functions)
+            for snbt, functions in options["cases"].items()
+        }
+        if "cases" in options
+        else None
+    )
+    default: Optional[Steps] = (
+        _compile_functions(options["default"]) if "default" in options else None
+    )
+
+    def map_nbt(
+        state: _TranslationState,
+        block_input,
+        nbt_input,
+        get_block_callback,
+        absolute_location,
+        relative_location,
+        nbt_path,
+    ):
+        state.cacheable = False
+        if nbt_input is None:
+            state.extra_needed = True
+        elif nbt_path is not None:
+            run_default = True
+            if cases is not None:
+                steps = cases.get(index_nbt(nbt_input, nbt_path).to_snbt())
+                if steps is not None:
+                    _run(
+                        steps,
+                        state,
+                        block_input,
+                        nbt_input,
+                        get_block_callback,
+                        absolute_location,
+                        relative_location,
+                        nbt_path,
+                    )
+                    run_default = False
+
+            if run_default and default is not None:
+                _run(
+                    default,
+                    state,
+                    block_input,
+                    nbt_input,
+                    get_block_callback,
+                    absolute_location,
+                    relative_location,
+                    nbt_path,
+                )
+
+    return map_nbt
+
+
+@_compiler("code")
+def _compile_code(translate_function: dict) -> Step:
+    options = translate_function["options"]
+    inputs = tuple(options.get("input", []))
+    function_name = options["function"]
+    outputs = options["output"]
+
+    def code(
+        state: _TranslationState,
+        block_input,
+        nbt_input,
+        get_block_callback,
+        absolute_location,
+        relative_location,
+        nbt_path,
+    ):
+        state.cacheable = False
+
+        function_inputs: List[Any] = []
+        for inp in inputs:
+            # this matches the input names supported by the interpreter
+            if inp == "namspace":
+                function_inputs.append(block_input.namespace)
+            elif inp == "base_name":
+                function_inputs.append(block_input.base_name)
+            elif inp == "properties":
+                function_inputs.append(block_input.properties)
+            elif inp == "nbt":
+                if nbt_input is None:
+                    state.extra_needed = True
+                    function_inputs.append(TAG_Compound())
+                else:
+                    function_inputs.append(nbt_input.tag)
+            elif inp == "location":
+                function_inputs.append(absolute_location)
+
+        function_output = code_functions.run(function_name, function_inputs)
+        if not isinstance(function_output, tuple):
+            function_output = (function_output,)
+
+        for out, out_name in zip(function_output, outputs):
+            if out_name == "output_name":
+                assert isinstance(out, str)
+                state.output_name = out
+            elif out_name == "output_type":
+                assert isinstance(out, str)
+                state.output_type = out
+            elif out_name == "new_properties":
+                assert isinstance(out, dict)
+                for key, val in out.items():
+                    state.new_data["properties"][key] = amulet_nbt.from_snbt(val)
+            elif out_name == "new_nbt":
+                assert isinstance(out, list)
+                for val in out:
+                    assert len(val) == 5
+                    state.new_data["nbt"].append(val)
+
+    return code
@@ -1,4 +1,15 @@
-from typing import Union, Tuple, List, Dict, Callable, TYPE_CHECKING, Type, Optional
+from typing import (
+    Union,
+    Tuple,
+    List,
+    Dict,
+    Callable,
+    TYPE_CHECKING,
+    Type,
+    Optional,
+    Mapping,
+    Any,
+)
 import logging
 
 import amulet_nbt
@@ -21,10 +32,12 @@ from amulet_nbt import (
 
 from PyMCTranslate.py3.api import Block, BlockEntity, Entity, ChunkLoadError
 from PyMCTranslate.py3.api.version import code_functions
+from PyMCTranslate.py3.util.snbt import from_snbt
 
 if TYPE_CHECKING:
     from numpy import ndarray
     from PyMCTranslate.py3.api.version import Version
+    from PyMCTranslate.py3.api.version.compiled_mapping import CompiledMapping
 
 log = logging.getLogger(__name__)
 
@@ -176,7 +189,7 @@ def nbt_from_list(
     default_template: str = None,
 ) -> NamedTag:
     if default_template is not None:
-        nbt_object = amulet_nbt.from_snbt(default_template)
+        nbt_object = from_snbt(default_template)
     else:
         nbt_object = datatype_to_nbt(outer_type)()
 
@@ -267,8 +280,8 @@ def nbt_from_list(
 
 def translate(
     object_input: Union[Block, Entity],
-    input_spec: dict,
-    mappings: List[dict],
+    input_spec: Mapping[str, Any],
+    mappings: Union[List[dict], "CompiledMapping"],
     output_version: "Version",
     force_blockstate: bool,
     get_block_callback: Callable[
@@ -283,7 +296,7 @@ def translate(
 
     :param object_input: the Block or Entity object to be converted
     :param input_spec: the specification for the object_input from the input block_format
-    :param mappings: the mapping file for the input_object
+    :param mappings: the mapping file for the input_object or the CompiledMapping of it
     :param output_version: A way for the function to look at the specification being converted to. (used to load default properties)
     :param force_blockstate: True to get the blockstate format. False to get the native format (these are sometimes the same)
     :param get_block_callback: A callable with relative coordinates that returns a Block and optional BlockEntity
@@ -325,7 +338,7 @@ def translate(
                     0,
                     0,
                     0,
-                    NamedTag(amulet_nbt.from_snbt(input_spec["snbt"])),
+                    NamedTag(from_snbt(input_spec["snbt"])),
                 )
             nbt_input = extra_input.nbt
 
@@ -348,9 +361,15 @@ def translate(
         raise Exception
 
     # run the conversion
-    output_name, output_type, new_data, extra_needed, cacheable = _translate(
-        block_input, nbt_input, mappings, get_block_callback, block_location
-    )
+    if isinstance(mappings, list):
+        output_name, output_type, new_data, extra_needed, cacheable = _translate(
+            block_input, nbt_input, mappings, get_block_callback, block_location
+        )
+    else:
+        # a compiled mapping
+        output_name, output_type, new_data, extra_needed, cacheable = mappings.run(
+            block_input, nbt_input, get_block_callback, block_location
+        )
 
     # sort out the outputs from the _translate function
     extra_output = None
@@ -358,15 +377,13 @@ def translate(
         # we should have a block output
         # create the block object based on output_name and new['properties']
         namespace, base_name = output_name.split(":", 1)
-        spec = output_version.block._get_raw_specification(
+        spec = output_version.block._get_frozen_specification(
             namespace, base_name, force_blockstate
         )
         properties = spec.get("defaults", {})
 
         # cast to NBT
-        properties = {
-            prop: amulet_nbt.from_snbt(val) for prop, val in properties.items()
-        }
+        properties = {prop: from_snbt(val) for prop, val in properties.items()}
 
         for key, val in new_data["properties"].items():
             properties[key] = val
@@ -402,7 +419,7 @@ def translate(
         # we should have an entity output
         # create the entity object based on output_name and new['nbt']
         namespace, base_name = output_name.split(":", 1)
-        spec = output_version.entity._get_raw_specification(
+        spec = output_version.entity._get_frozen_specification(
             namespace, base_name, force_blockstate
         )
 
@@ -531,7 +548,7 @@ def _translate(
             # 	}
             # }
             for key, val in translate_function["options"].items():
-                new_data["properties"][key] = amulet_nbt.from_snbt(val)
+                new_data["properties"][key] = from_snbt(val)
 
         elif "carry_properties" == function_name:
             # {
@@ -815,7 +832,7 @@ def _translate(
                         outer_type,
                         path,
                         new_nbt["key"],
-                        amulet_nbt.from_snbt(new_nbt["value"]),
+                        from_snbt(new_nbt["value"]),
                     )
                 )
 
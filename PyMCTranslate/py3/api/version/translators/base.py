@@ -1,10 +1,18 @@
-from typing import List, Tuple, Union, Callable, TYPE_CHECKING
+from typing import List, Tuple, Union, Callable, Dict, Mapping, Any, TYPE_CHECKING
 import copy
 import logging
+import threading
+
+from amulet_nbt import NamedTag
 
-from PyMCTranslate.py3.meta import minified, json_atlas
 from PyMCTranslate.py3.api import Block, BlockEntity, Entity
+from PyMCTranslate.py3.util.frozen import freeze
+from PyMCTranslate.py3.util.snbt import copy_nbt
 from PyMCTranslate.py3.api.version.translate import translate
+from PyMCTranslate.py3.api.version.compiled_mapping import (
+    CompiledMapping,
+    compile_mapping,
+)
 
 if TYPE_CHECKING:
     from ..version import Version
@@ -19,6 +27,35 @@ class BaseSpecification(dict):
     pass
 
 
+def copy_object(obj: Union[Block, BlockEntity, Entity, None]):
+    """
+    Copy a translation output so that the caller can modify it without modifying the cached version.
+    Blocks are immutable so they are returned as they are and a cache hit that only outputs a block does not copy anything.
+    The NBT of block entities and entities is mutable and callers such as Amulet edit it in place,
+    so sharing the cached instance would change the cached translation for every later caller.
+    This is much cheaper than copy.deepcopy because only the NBT is rebuilt.
+    """
+    if isinstance(obj, BlockEntity):
+        return BlockEntity(
+            obj.namespace,
+            obj.base_name,
+            obj.x,
+            obj.y,
+            obj.z,
+            NamedTag(copy_nbt(obj.nbt.tag), obj.nbt.name),
+        )
+    elif isinstance(obj, Entity):
+        return Entity(
+            obj.namespace,
+            obj.base_name,
+            obj.x,
+            obj.y,
+            obj.z,
+            NamedTag(copy_nbt(obj.nbt.tag), obj.nbt.name),
+        )
+    return obj
+
+
 class BaseTranslator:
     def __init__(
         self,
@@ -34,6 +71,25 @@ class BaseTranslator:
         self._mode = mode
 
         self._error_cache = set()
+        # Locks the error cache and the lookup tables that are rebuilt in subclasses
+        self._lock = threading.RLock()
+        # Read only views of the specifications. The key is (format key, namespace, base name)
+        self._frozen_specifications: Dict[Tuple[str, str, str], Mapping[str, Any]] = {}
+        # The compiled mappings. The key is (direction, format key, namespace, base name)
+        self._compiled_mappings: Dict[Tuple[str, str, str, str], CompiledMapping] = {}
+
+    def __getstate__(self):
+        # The error cache is local to each process and the frozen views cannot be pickled.
+        # Both are rebuilt as they are needed.
+        state = self.__dict__.copy()
+        del state["_lock"]
+        state["_error_cache"] = set()
+        state["_frozen_specifications"] = {}
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
 
     def _format_key(self, force_blockstate):
         return (
@@ -42,21 +98,27 @@ class BaseTranslator:
             else "blockstate"
         )
 
+    def _first_error(self, unique) -> bool:
+        """Returns True the first time it is called with a value and False after that."""
+        with self._lock:
+            if unique in self._error_cache:
+                return False
+            self._error_cache.add(unique)
+            return True
+
     def _error_once(self, unique, msg_fmt, *args):
-        if unique not in self._error_cache:
+        if self._first_error(unique):
             log.error(msg_fmt.format(*args), exc_info=True)
-            self._error_cache.add(unique)
 
     def _warn_once(self, unique, msg_fmt, *args):
-        if unique not in self._error_cache:
+        if self._first_error(unique):
             log.warning(msg_fmt.format(*args))
-            self._error_cache.add(unique)
 
     def _translate(
         self,
         object_input: Union[Block, Entity],
         input_spec: dict,
-        mappings: List[dict],
+        mappings: Union[List[dict], CompiledMapping],
         output_version: "Version",
         force_blockstate: bool,
         translation_direction: str,
@@ -125,10 +187,7 @@ class BaseTranslator:
 
     @staticmethod
     def _get_data(data):
-        if minified:
-            return copy.deepcopy(json_atlas[data])
-        else:
-            return copy.deepcopy(data)
+        return copy.deepcopy(data)
 
     def _get_raw_specification(
         self, namespace: str, base_name: str, force_blockstate: bool = False
@@ -143,6 +202,27 @@ class BaseTranslator:
                 f"Specification for {self._mode} {self._format_key(force_blockstate)} {namespace}:{base_name} does not exist in {self._parent_version}"
             )
 
+    def _get_frozen_specification(
+        self, namespace: str, base_name: str, force_blockstate: bool = False
+    ) -> Mapping[str, Any]:
+        """
+        Get a read only view of the specification.
+        This is shared between calls so it is not copied on each lookup like _get_raw_specification.
+        """
+        key = (self._format_key(force_blockstate), namespace, base_name)
+        specification = self._frozen_specifications.get(key)
+        if specification is None:
+            try:
+                data = self._database.get(key[0], {}).get("specification", {})[
+                    namespace
+                ][base_name]
+            except KeyError:
+                raise KeyError(
+                    f"Specification for {self._mode} {key[0]} {namespace}:{base_name} does not exist in {self._parent_version}"
+                )
+            specification = self._frozen_specifications[key] = freeze(data)
+        return specification
+
     def get_specification(
         self, namespace: str, base_name: str, force_blockstate: bool = False
     ) -> BaseSpecification:
@@ -198,6 +278,39 @@ class BaseTranslator:
                 f"Mapping from universal for {self._mode} {self._format_key(force_blockstate)} {namespace}:{base_name} does not exist in {self._parent_version}"
             )
 
+    def _get_compiled_mapping(
+        self,
+        direction: str,
+        namespace: str,
+        base_name: str,
+        force_blockstate: bool = False,
+    ) -> CompiledMapping:
+        """
+        Get the compiled form of a mapping.
+        The mapping is only compiled once per translator.
+
+        :param direction: "to_universal" or "from_universal"
+        :param namespace: A namespace string as found using the ``namespaces`` method
+        :param base_name: A base name string as found using the ``base_name`` method
+        :param force_blockstate: True to get the blockstate format. False to get the native format (these are sometimes the same)
+        :return: The compiled mapping
+        """
+        key = (direction, self._format_key(force_blockstate), namespace, base_name)
+        compiled_mapping = self._compiled_mappings.get(key)
+        if compiled_mapping is None:
+            if direction == "to_universal":
+                mapping = self.get_mapping_to_universal(
+                    namespace, base_name, force_blockstate
+                )
+            elif direction == "from_universal":
+                mapping = self.get_mapping_from_universal(
+                    namespace, base_name, force_blockstate
+                )
+            else:
+                raise ValueError(f"Unknown direction {direction}")
+            compiled_mapping = self._compiled_mappings[key] = compile_mapping(mapping)
+        return compiled_mapping
+
     def to_universal(self, *args, **kwargs):
         raise NotImplementedError
 
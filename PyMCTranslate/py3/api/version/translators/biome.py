@@ -1,6 +1,7 @@
-from typing import Dict, TYPE_CHECKING, List, Optional
+from typing import Dict, TYPE_CHECKING, List, Optional, Callable, Any, Tuple
 import numpy
 import logging
+import threading
 
 if TYPE_CHECKING:
     from PyMCTranslate.py3.api.translation_manager import TranslationManager
@@ -19,6 +20,20 @@ Biome translation pipeline
 """
 
 
+# (sorted keys, values in the same order)
+_LookupTable = Tuple[numpy.ndarray, numpy.ndarray]
+
+
+def _create_table(mapping: Dict[Any, Any], key_dtype, value_dtype) -> _LookupTable:
+    """Create a lookup table from a dictionary."""
+    keys_ = sorted(mapping)
+    keys = numpy.empty(len(keys_), dtype=key_dtype)
+    keys[:] = keys_
+    values = numpy.empty(len(keys_), dtype=value_dtype)
+    values[:] = [mapping[key] for key in keys_]
+    return keys, values
+
+
 class BiomeTranslator:
     def __init__(self, biome_data: dict, translation_manager: "TranslationManager"):
         self._translation_manager = translation_manager
@@ -34,6 +49,27 @@ class BiomeTranslator:
 
         self._error_biomes = set()
 
+        # Sorted keys and the matching values used by the array methods.
+        # The unpack and pack tables include the biome registry so they are rebuilt when it changes.
+        self._registry_tables: Optional[Tuple[_LookupTable, _LookupTable]] = None
+        self._registry_tables_revision: Optional[int] = None
+        # The to_universal and from_universal tables never change so they are built when first used.
+        self._universal_tables: Optional[Tuple[_LookupTable, _LookupTable]] = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        # The registry tables depend on the biome registry which is not shared.
+        state["_error_biomes"] = set()
+        state["_registry_tables"] = None
+        state["_registry_tables_revision"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
     def unpack(self, biome: int) -> str:
         """Unpack the raw numerical biome value into the namespaced string format.
         This will first use any pre-registered mappings bound using TranslationManager.biome_registry.register
@@ -82,6 +118,124 @@ class BiomeTranslator:
             biome = self._biome_from_universal[biome]
         return biome
 
+    def _get_registry_tables(self) -> Tuple[_LookupTable, _LookupTable]:
+        """Get the unpack and pack tables. They are rebuilt if the biome registry has changed."""
+        registry = self._translation_manager.biome_registry
+        revision = registry.revision
+        if self._registry_tables_revision != revision:
+            with self._lock:
+                if self._registry_tables_revision == revision:
+                    return self._registry_tables
+                # the registered values take precedence
+                biome_int_to_str = dict(self._biome_int_to_str)
+                biome_int_to_str.update(registry)
+                biome_str_to_int = {
+                    biome_str: biome_int
+                    for biome_str, biome_int in self._biome_str_to_int.items()
+                    if biome_int is not None
+                }
+                for _, biome_str in registry:
+                    biome_str_to_int[biome_str] = registry.private_to_int(biome_str)
+                # The ids are stored sorted rather than as a dense table so that large ids do not need a large table.
+                self._registry_tables = (
+                    _create_table(biome_int_to_str, numpy.int64, object),
+                    _create_table(biome_str_to_int, object, numpy.int64),
+                )
+                # the tables must be set before the revision so other threads never see a stale table
+                self._registry_tables_revision = revision
+        return self._registry_tables
+
+    def _get_universal_tables(self) -> Tuple[_LookupTable, _LookupTable]:
+        """Get the to_universal and from_universal tables."""
+        if self._universal_tables is None:
+            with self._lock:
+                if self._universal_tables is None:
+                    self._universal_tables = (
+                        _create_table(self._biome_to_universal, object, object),
+                        _create_table(self._biome_from_universal, object, object),
+                    )
+        return self._universal_tables
+
+    @staticmethod
+    def _map_unique(
+        biomes: numpy.ndarray, func: Callable[[Any], Any], dtype
+    ) -> numpy.ndarray:
+        """Call func once for each unique value in the array and map the results back to the shape of the input."""
+        unique, inverse = numpy.unique(biomes, return_inverse=True)
+        palette = numpy.array([func(biome) for biome in unique.tolist()], dtype=dtype)
+        return palette[inverse].reshape(biomes.shape)
+
+    @staticmethod
+    def _lookup_unique(
+        biomes: numpy.ndarray,
+        table: _LookupTable,
+        default: Callable[[Any], Any],
+        dtype,
+    ) -> numpy.ndarray:
+        """
+        Look up each unique value in the array in a table and map the results back to the shape of the input.
+
+        :param biomes: The array of biome values.
+        :param table: The table to look the values up in.
+        :param default: Called with each unique value that is not in the table.
+        :param dtype: The dtype of the returned array.
+        :return: An array of the looked up values in the shape of the input.
+        """
+        unique, inverse = numpy.unique(biomes, return_inverse=True)
+        keys, values = table
+        palette = numpy.empty(unique.size, dtype=dtype)
+        if keys.size:
+            indexes = numpy.searchsorted(keys, unique).clip(max=keys.size - 1)
+            found = keys[indexes] == unique
+            palette[found] = values[indexes[found]]
+        else:
+            found = numpy.zeros(unique.size, dtype=bool)
+        missing = ~found
+        if missing.any():
+            palette[missing] = [default(biome) for biome in unique[missing].tolist()]
+        return palette[inverse].reshape(biomes.shape)
+
+    def unpack_array(self, biomes: numpy.ndarray) -> numpy.ndarray:
+        """Unpack an array of raw numerical biome values into an object array of namespaced strings.
+        This is the array equivalent of :meth:`unpack`."""
+        biomes = numpy.asarray(biomes)
+        (keys, values), _ = self._get_registry_tables()
+        if biomes.size and keys.size:
+            indexes = numpy.searchsorted(keys, biomes).clip(max=keys.size - 1)
+            if numpy.array_equal(keys[indexes], biomes):
+                return values[indexes]
+        return self._map_unique(biomes, self.unpack, object)
+
+    def pack_array(self, biomes: numpy.ndarray) -> numpy.ndarray:
+        """Pack an array of namespaced string biome values into an int array of raw numerical values.
+        This is the array equivalent of :meth:`pack`."""
+        _, pack_table = self._get_registry_tables()
+        return self._lookup_unique(
+            numpy.asarray(biomes, dtype=object), pack_table, self.pack, numpy.int64
+        )
+
+    def to_universal_array(self, biomes: numpy.ndarray) -> numpy.ndarray:
+        """Convert an array of version namespaced strings to universal namespaced strings.
+        This is the array equivalent of :meth:`to_universal`."""
+        to_universal_table, _ = self._get_universal_tables()
+        return self._lookup_unique(
+            numpy.asarray(biomes, dtype=object),
+            to_universal_table,
+            self.to_universal,
+            object,
+        )
+
+    def from_universal_array(self, biomes: numpy.ndarray) -> numpy.ndarray:
+        """Convert an array of universal namespaced strings to version namespaced strings.
+        This is the array equivalent of :meth:`from_universal`."""
+        _, from_universal_table = self._get_universal_tables()
+        return self._lookup_unique(
+            numpy.asarray(biomes, dtype=object),
+            from_universal_table,
+            self.from_universal,
+            object,
+        )
+
     @property
     def biome_ids(self) -> List[str]:
         biomes = set(self._biome_str_to_int.keys())
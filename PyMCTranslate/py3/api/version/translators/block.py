@@ -1,11 +1,23 @@
-from typing import Tuple, Union, Callable, TYPE_CHECKING, Optional, Dict, Any
-import copy
+from typing import (
+    Tuple,
+    Union,
+    Callable,
+    TYPE_CHECKING,
+    Optional,
+    Dict,
+    Any,
+    Sequence,
+)
 import logging
 
+import numpy
 import amulet_nbt
 
 from PyMCTranslate.py3.api import Block, BlockEntity, Entity
-from .base import BaseTranslator, BaseSpecification
+from PyMCTranslate.py3.util.snbt import from_snbt
+from PyMCTranslate.py3.util.cache import BaseCache, CacheInfo
+from .base import BaseTranslator, BaseSpecification, copy_object
+from .block_state_table import BlockStateTable
 
 if TYPE_CHECKING:
     from PyMCTranslate.py3.api.version import Version
@@ -29,8 +41,7 @@ class BlockSpecification(BaseSpecification):
     def default_properties(self) -> Dict[str, amulet_nbt.AnyNBT]:
         if self._default_properties is NotInit:
             self._default_properties = {
-                key: amulet_nbt.from_snbt(val)
-                for key, val in self.get("defaults", {}).items()
+                key: from_snbt(val) for key, val in self.get("defaults", {}).items()
             }
         return self._default_properties
 
@@ -38,7 +49,7 @@ class BlockSpecification(BaseSpecification):
     def valid_properties(self) -> Dict[str, Tuple[amulet_nbt.AnyNBT]]:
         if self._valid_properties is NotInit:
             self._valid_properties = {
-                key: tuple(amulet_nbt.from_snbt(val) for val in vals)
+                key: tuple(from_snbt(val) for val in vals)
                 for key, vals in self.get("properties", {}).items()
             }
         return self._valid_properties
@@ -54,7 +65,7 @@ class BlockSpecification(BaseSpecification):
         if self._default_nbt is NotInit:
             snbt = self.get("snbt", None)
             if isinstance(snbt, str):
-                nbt = amulet_nbt.from_snbt(snbt)
+                nbt = from_snbt(snbt)
             else:
                 nbt = None
             self._default_nbt = nbt
@@ -74,12 +85,18 @@ class BlockTranslator(BaseTranslator):
         *_,
     ):
         super().__init__(translation_manager, parent_version, database, "block")
-        self._cache = {  # only blocks without a block entity can be cached
-            ("to_universal", False): {},
-            ("to_universal", True): {},
-            ("from_universal", False): {},
-            ("from_universal", True): {},
+        # only blocks without a block entity can be cached
+        # the cache policy is defined by the TranslationManager
+        self._cache: Dict[Tuple[str, bool], BaseCache] = {
+            ("to_universal", False): translation_manager.cache_factory(),
+            ("to_universal", True): translation_manager.cache_factory(),
+            ("from_universal", False): translation_manager.cache_factory(),
+            ("from_universal", True): translation_manager.cache_factory(),
         }
+        if translation_manager.persistent_cache is not None:
+            translation_manager.persistent_cache.warm(
+                parent_version, self._cache, translation_manager.block_pool
+            )
         self._block_format = block_format
 
         if parent_version.has_abstract_format:
@@ -97,6 +114,16 @@ class BlockTranslator(BaseTranslator):
             self._numerical_block_map: Dict[int, Tuple[str, str]] = {}
             self._numerical_block_map_inverse: Dict[Tuple[str, str], int] = {}
 
+        # Lazily populated lookup tables used by ints_to_blocks and blocks_to_ints.
+        # They are rebuilt when the block registry changes.
+        self._ints_to_block_table: Optional[numpy.ndarray] = None
+        # map from Block to (block id, block data). This uses the same cache policy as the translation caches.
+        self._block_to_ints_cache: BaseCache = translation_manager.cache_factory()
+        self._numerical_registry_revision: Optional[int] = None
+
+        # The integer id for each block state. Created when it is first used.
+        self._state_table: Optional[BlockStateTable] = None
+
         self._waterloggable = None
         self._always_waterlogged = None
 
@@ -105,6 +132,14 @@ class BlockTranslator(BaseTranslator):
         if always_waterlogged:
             self._always_waterlogged = set(always_waterlogged)
 
+    def __getstate__(self):
+        state = super().__getstate__()
+        # The numerical lookup tables depend on the block registry which is not shared.
+        state["_ints_to_block_table"] = None
+        state["_block_to_ints_cache"] = self._translation_manager.cache_factory()
+        state["_numerical_registry_revision"] = None
+        return state
+
     @property
     def block_format(self) -> str:
         """
@@ -123,6 +158,16 @@ class BlockTranslator(BaseTranslator):
         """
         return self._block_format
 
+    def cache_info(self) -> Dict[Tuple[str, bool], CacheInfo]:
+        """
+        Get the statistics for the translation caches.
+
+        :return: A dictionary mapping (direction, force_blockstate) to the statistics for that cache. The blocks_to_ints cache is stored under ("block_to_ints", False).
+        """
+        info = {key: cache.info() for key, cache in self._cache.items()}
+        info[("block_to_ints", False)] = self._block_to_ints_cache.info()
+        return info
+
     # TODO: consider moving these to the block translator
     def is_waterloggable(self, namespace_str: str, always=False):
         """
@@ -193,6 +238,149 @@ class BlockTranslator(BaseTranslator):
         if block_id is not None and block_data is not None:
             return block_id, block_data
 
+    def _check_numerical_registry(self):
+        revision = self._translation_manager.block_registry.revision
+        if revision != self._numerical_registry_revision:
+            with self._lock:
+                if revision == self._numerical_registry_revision:
+                    return
+                max_block_id = max(
+                    (
+                        block_id
+                        for block_id, _ in self._translation_manager.block_registry
+                        if block_id >= 0
+                    ),
+                    default=-1,
+                )
+                max_block_id = max(
+                    max(self._numerical_block_map, default=-1), max_block_id
+                )
+                self._ints_to_block_table = numpy.full(
+                    (max_block_id + 1, 16), None, dtype=object
+                )
+                self._block_to_ints_cache.clear()
+                self._numerical_registry_revision = revision
+
+    def ints_to_blocks(
+        self, block_ids: numpy.ndarray, block_data: numpy.ndarray
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Convert arrays of numerical block ids and data values to a palette of Block objects.
+
+        This is the array equivalent of :meth:`ints_to_block`.
+
+        :param block_ids: An int array of block ids.
+        :param block_data: An int array of block data values with the same shape as block_ids.
+        :return: A numpy object array of unique Blocks and an int array with the same shape as the inputs indexing into it.
+        """
+        block_ids = numpy.asarray(block_ids, dtype=numpy.int64)
+        block_data = numpy.asarray(block_data, dtype=numpy.int64)
+        if block_ids.shape != block_data.shape:
+            raise ValueError("block_ids and block_data must have the same shape")
+        self._check_numerical_registry()
+        table = self._ints_to_block_table
+
+        keys, inverse = numpy.unique(
+            (block_ids << 32) | (block_data & 0xFFFFFFFF), return_inverse=True
+        )
+        unique_ids = keys >> 32
+        unique_data = (keys & 0xFFFFFFFF).astype(numpy.int32).astype(numpy.int64)
+
+        palette = numpy.empty(len(keys), dtype=object)
+        for index, (block_id, data) in enumerate(
+            zip(unique_ids.tolist(), unique_data.tolist())
+        ):
+            if 0 <= block_id < table.shape[0] and 0 <= data < 16:
+                block = table[block_id, data]
+                if block is None:
+                    block = table[block_id, data] = self.ints_to_block(block_id, data)
+            else:
+                block = self.ints_to_block(block_id, data)
+            palette[index] = block
+        return palette, inverse.reshape(block_ids.shape)
+
+    def blocks_to_ints(
+        self, palette: Union[Sequence[Block], numpy.ndarray]
+    ) -> Tuple[numpy.ndarray, numpy.ndarray]:
+        """
+        Convert a palette of Block objects to arrays of numerical block ids and data values.
+
+        This is the array equivalent of :meth:`block_to_ints`.
+
+        :param palette: A sequence or numpy object array of Blocks.
+        :return: Two int arrays with the same shape as the palette containing the block ids and data values. Both are -1 where the block could not be converted.
+        """
+        self._check_numerical_registry()
+        cache = self._block_to_ints_cache
+        if isinstance(palette, numpy.ndarray):
+            shape = palette.shape
+            palette = palette.ravel()
+        else:
+            shape = (len(palette),)
+        block_ids = numpy.empty(len(palette), dtype=numpy.int64)
+        block_data = numpy.empty(len(palette), dtype=numpy.int64)
+        for index, block in enumerate(palette):
+            ints = cache.get(block)
+            if ints is None:
+                ints = self.block_to_ints(block) or (-1, -1)
+                cache[block] = ints
+            block_ids[index], block_data[index] = ints
+        return block_ids.reshape(shape), block_data.reshape(shape)
+
+    @property
+    def state_table(self) -> BlockStateTable:
+        """
+        The table of integer ids for every block state in the blockstate format specifications.
+
+        This is created when it is first used. The layout is derived from the sorted specifications so it does not need to be stored.
+        """
+        if self._state_table is None:
+            with self._lock:
+                if self._state_table is None:
+                    self._state_table = self._create_state_table()
+        return self._state_table
+
+    def _create_state_table(self) -> BlockStateTable:
+        return BlockStateTable.from_specifications(
+            (
+                namespace,
+                base_name,
+                self._get_frozen_specification(namespace, base_name, True).get(
+                    "properties", {}
+                ),
+            )
+            for namespace in self.namespaces(True)
+            for base_name in self.base_names(namespace, True)
+        )
+
+    @property
+    def state_count(self) -> int:
+        """The number of block states in the blockstate format. The state ids are in the range 0 to state_count - 1."""
+        return self.state_table.state_count
+
+    def get_state_id(self, block: "Block") -> int:
+        """
+        Get the integer id of a block state in the blockstate format.
+
+        The ids are dense and stable for a build of PyMCTranslate so they can be used as palette indexes.
+        This is mostly useful for the universal format.
+
+        :param block: The block. It must have exactly the properties in its specification and no extra blocks.
+        :return: The state id.
+        :raises KeyError: If the block is not a valid block state.
+        """
+        return self.state_table.get_state_id(block)
+
+    def get_state(self, state_id: int) -> "Block":
+        """
+        Get the block state with the given integer id.
+
+        :param state_id: The state id as returned by get_state_id.
+        :return: The block in the blockstate format.
+        :raises IndexError: If the state id is out of range.
+        """
+        return self.state_table.get_state(state_id)
+
     def get_specification(
         self, namespace: str, base_name: str, force_blockstate: bool = False
     ) -> BlockSpecification:
@@ -220,25 +408,43 @@ class BlockTranslator(BaseTranslator):
         :param get_block_callback: A callable with relative coordinates that returns a Block and optional BlockEntity
         :return: A Block, optional BlockEntity and a bool. The bool specifies if block_location and get_block_callback are required to fully define the output data.
         """
+        return self._to_universal(
+            block, block_entity, force_blockstate, block_location, get_block_callback
+        )[:3]
+
+    def _to_universal(
+        self,
+        block: "Block",
+        block_entity: "BlockEntity" = None,
+        force_blockstate: bool = False,
+        block_location: BlockCoordinates = (0, 0, 0),
+        get_block_callback: Callable[
+            [Tuple[int, int, int]], Tuple[Block, Optional[BlockEntity]]
+        ] = None,
+    ) -> Tuple[Block, Optional[BlockEntity], bool, bool]:
+        """
+        The implementation of :meth:`to_universal`.
+        The returned tuple has an extra bool which is True if the result was cacheable.
+        """
         assert isinstance(block, Block), "block must be a Block instance"
         cache_key = ("to_universal", force_blockstate)
         if block_entity is None:
-            if block in self._cache[cache_key]:
-                output, extra_output, extra_needed = self._cache[cache_key][block]
-                extra_output = copy.deepcopy(extra_output)
-                return output, extra_output, extra_needed
+            cached = self._cache[cache_key].get(block)
+            if cached is not None:
+                output, extra_output, extra_needed = cached
+                return output, copy_object(extra_output), extra_needed, True
         else:
             assert isinstance(
                 block_entity, BlockEntity
             ), "extra_input must be None or a BlockEntity"
-            block_entity = copy.deepcopy(block_entity)
+            block_entity = copy_object(block_entity)
 
         try:
-            input_spec = self._get_raw_specification(
+            input_spec = self._get_frozen_specification(
                 block.namespace, block.base_name, force_blockstate
             )
-            mapping = self.get_mapping_to_universal(
-                block.namespace, block.base_name, force_blockstate
+            mapping = self._get_compiled_mapping(
+                "to_universal", block.namespace, block.base_name, force_blockstate
             )
         except KeyError:
             if self._parent_version.platform != "universal":
@@ -249,7 +455,7 @@ class BlockTranslator(BaseTranslator):
                     block,
                     self._parent_version,
                 )
-            return block, block_entity, False
+            return block, block_entity, False, False
 
         output, extra_output, extra_needed, cacheable = self._translate(
             block,
@@ -262,11 +468,16 @@ class BlockTranslator(BaseTranslator):
             block_entity,
             block_location,
         )
+        block_pool = self._translation_manager.block_pool
+        if block_pool is not None and isinstance(output, Block):
+            output = block_pool.intern(output)
 
         if cacheable:
             self._cache[cache_key][block] = output, extra_output, extra_needed
+            # the caller gets a copy so that the cached version is not modified
+            extra_output = copy_object(extra_output)
 
-        return output, copy.deepcopy(extra_output), extra_needed
+        return output, extra_output, extra_needed, cacheable
 
     def from_universal(
         self,
@@ -291,27 +502,51 @@ class BlockTranslator(BaseTranslator):
         :param get_block_callback: A callable with relative coordinates that returns a Block and optional BlockEntity
         :return: There are two formats that can be returned. The first is a Block, optional BlockEntity and a bool. The second is an Entity, None and a bool. The bool specifies if block_location and get_block_callback are required to fully define the output data.
         """
+        return self._from_universal(
+            block, block_entity, force_blockstate, block_location, get_block_callback
+        )[:3]
+
+    def _from_universal(
+        self,
+        block: "Block",
+        block_entity: "BlockEntity" = None,
+        force_blockstate: bool = False,
+        block_location: BlockCoordinates = (0, 0, 0),
+        get_block_callback: Callable[
+            [Tuple[int, int, int]], Tuple[Block, Union[None, BlockEntity]]
+        ] = None,
+    ) -> Union[
+        Tuple[Block, Optional[BlockEntity], bool, bool],
+        Tuple[Entity, None, bool, bool],
+    ]:
+        """
+        The implementation of :meth:`from_universal`.
+        The returned tuple has an extra bool which is True if the result was cacheable.
+        """
         assert isinstance(block, Block), "block must be a Block instance"
         cache_key = ("from_universal", force_blockstate)
         if block_entity is None:
-            if block in self._cache[cache_key]:
-                output, extra_output, extra_needed = self._cache[cache_key][block]
-                if isinstance(output, Entity):
-                    output = copy.deepcopy(output)
-                extra_output = copy.deepcopy(extra_output)
-                return output, extra_output, extra_needed
+            cached = self._cache[cache_key].get(block)
+            if cached is not None:
+                output, extra_output, extra_needed = cached
+                return (
+                    copy_object(output),
+                    copy_object(extra_output),
+                    extra_needed,
+                    True,
+                )
         else:
             assert isinstance(
                 block_entity, BlockEntity
             ), "extra_input must be None or a BlockEntity"
-            block_entity = copy.deepcopy(block_entity)
+            block_entity = copy_object(block_entity)
 
         try:
-            input_spec = self._universal_format.block._get_raw_specification(
+            input_spec = self._universal_format.block._get_frozen_specification(
                 block.namespace, block.base_name
             )
-            mapping = self.get_mapping_from_universal(
-                block.namespace, block.base_name, force_blockstate
+            mapping = self._get_compiled_mapping(
+                "from_universal", block.namespace, block.base_name, force_blockstate
             )
         except KeyError:
             if block.namespace == "minecraft" and list(block.properties.keys()) == [
@@ -328,7 +563,7 @@ class BlockTranslator(BaseTranslator):
                     block,
                     self._parent_version,
                 )
-            return block, block_entity, False
+            return block, block_entity, False, False
 
         output, extra_output, extra_needed, cacheable = self._translate(
             block,
@@ -341,11 +576,91 @@ class BlockTranslator(BaseTranslator):
             block_entity,
             block_location,
         )
+        block_pool = self._translation_manager.block_pool
+        if block_pool is not None and isinstance(output, Block):
+            output = block_pool.intern(output)
 
         if cacheable:
             self._cache[cache_key][block] = output, extra_output, extra_needed
+            # the caller gets a copy so that the cached version is not modified
+            output = copy_object(output)
+            extra_output = copy_object(extra_output)
+
+        return output, extra_output, extra_needed, cacheable
+
+    def _translate_many(
+        self,
+        translate: Callable[..., Tuple[Any, Optional[BlockEntity], bool, bool]],
+        blocks: Union[Sequence[Block], numpy.ndarray],
+        force_blockstate: bool,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        if isinstance(blocks, numpy.ndarray):
+            shape = blocks.shape
+            blocks = blocks.ravel()
+        else:
+            shape = (len(blocks),)
+
+        # find the unique blocks and the index into them for each input
+        unique: Dict[Block, int] = {}
+        inverse = numpy.empty(len(blocks), dtype=numpy.uint32)
+        for index, block in enumerate(blocks):
+            inverse[index] = unique.setdefault(block, len(unique))
+
+        # the translate method looks up and populates the cache
+        results = [
+            translate(block, force_blockstate=force_blockstate)[:3] for block in unique
+        ]
+
+        outputs = numpy.empty(len(results), dtype=object)
+        extra_outputs = numpy.empty(len(results), dtype=object)
+        extra_needed = numpy.empty(len(results), dtype=bool)
+        mutable = numpy.empty(len(results), dtype=bool)
+        for index, (output, extra_output, needed) in enumerate(results):
+            outputs[index] = output
+            extra_outputs[index] = extra_output
+            extra_needed[index] = needed
+            mutable[index] = isinstance(output, Entity) or extra_output is not None
+
+        outputs = outputs[inverse]
+        extra_outputs = extra_outputs[inverse]
+        # each output position must have its own copy of the mutable objects
+        for index in numpy.flatnonzero(mutable[inverse]):
+            outputs[index] = copy_object(outputs[index])
+            extra_outputs[index] = copy_object(extra_outputs[index])
+        return (
+            outputs.reshape(shape),
+            extra_outputs.reshape(shape),
+            extra_needed[inverse].reshape(shape),
+        )
+
+    def to_universal_many(
+        self,
+        blocks: Union[Sequence[Block], numpy.ndarray],
+        force_blockstate: bool = False,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """
+        Translate a palette of Block objects from the parent Version's format to the Universal format.
 
-        if isinstance(output, Entity):
-            output = copy.deepcopy(output)
-        extra_output = copy.deepcopy(extra_output)
-        return output, extra_output, extra_needed
+        This is equivalent to calling :meth:`to_universal` on each block without a block entity but each unique block is only looked up once.
+
+        :param blocks: A sequence or numpy object array of blocks to translate
+        :param force_blockstate: True to get the blockstate format. False to get the native format (these are sometimes the same)
+        :return: Three numpy arrays with the same shape as the input. The output Blocks, the optional BlockEntities and a bool array. The bool specifies if block_location and get_block_callback are required to fully define the output data.
+        """
+        return self._translate_many(self._to_universal, blocks, force_blockstate)
+
+    def from_universal_many(
+        self,
+        blocks: Union[Sequence[Block], numpy.ndarray],
+        force_blockstate: bool = False,
+    ) -> Tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]:
+        """
+        Translate a palette of Block objects from the Universal format to the parent Version's format.
+
+        This is equivalent to calling :meth:`from_universal` on each block without a block entity but each unique block is only looked up once.
+
+        :param blocks: A sequence or numpy object array of blocks to translate
+        :param force_blockstate: True to get the blockstate format. False to get the native format (these are sometimes the same)
+        :return: Three numpy arrays with the same shape as the input. The output Blocks or Entities, the optional BlockEntities and a bool array. The bool specifies if block_location and get_block_callback are required to fully define the output data.
+        """
+        return self._translate_many(self._from_universal, blocks, force_blockstate)
@@ -0,0 +1,162 @@
+from typing import Dict, List, Tuple, Optional, Iterable
+import itertools
+
+import amulet_nbt
+
+from PyMCTranslate.py3.api import Block
+from PyMCTranslate.py3.util.snbt import from_snbt
+
+"""
+A dense integer id for every block state in a set of block specifications.
+
+The blocks are ordered by namespace and base name and each block is given a contiguous range of ids.
+The id of a state within that range is a mixed radix number with one digit for each property.
+The properties are ordered by name and the values of a property are in the order they are listed in the specification.
+
+raw layout
+[
+    [<namespace>, <base name>, [[<property name>, [<snbt value>, ...]], ...]],
+    ...
+]
+"""
+
+RawStateLayout = List[Tuple[str, str, List[Tuple[str, List[str]]]]]
+
+
+class BlockStateTable:
+    """
+    A two way mapping between the block states of a set of specifications and dense integer ids.
+
+    The ids only depend on the specifications so they are the same in every process that uses the same build of PyMCTranslate.
+    """
+
+    def __init__(self, layout: RawStateLayout):
+        """
+        Create the table from a raw layout.
+
+        :param layout: The blocks and their valid properties. See the module docstring for the format.
+        """
+        self._layout = layout
+        # The first id of each block
+        self._offsets: List[int] = []
+        # The index into _offsets for each (namespace, base name)
+        self._block_index: Dict[Tuple[str, str], int] = {}
+        # For each block, the property names, the value to digit lookup and the stride of each property
+        self._properties: List[
+            Tuple[
+                Tuple[str, ...],
+                Tuple[Dict[amulet_nbt.AnyNBT, int], ...],
+                Tuple[int, ...],
+            ]
+        ] = []
+        # The property values for each block. Used to create the Block objects.
+        self._values: List[Tuple[Tuple[amulet_nbt.AnyNBT, ...], ...]] = []
+        # The Block for each id. Created when a Block is first requested.
+        self._blocks: Optional[List[Block]] = None
+
+        state_count = 0
+        for namespace, base_name, properties in layout:
+            names = tuple(name for name, _ in properties)
+            values = tuple(
+                tuple(from_snbt(value) for value in property_values)
+                for _, property_values in properties
+            )
+            strides = []
+            stride = 1
+            for property_values in reversed(values):
+                strides.append(stride)
+                stride *= len(property_values)
+            self._block_index[(namespace, base_name)] = len(self._offsets)
+            self._offsets.append(state_count)
+            self._properties.append(
+                (
+                    names,
+                    tuple(
+                        {value: digit for digit, value in enumerate(property_values)}
+                        for property_values in values
+                    ),
+                    tuple(reversed(strides)),
+                )
+            )
+            self._values.append(values)
+            state_count += stride
+        self._state_count = state_count
+
+    @classmethod
+    def from_specifications(
+        cls, specifications: Iterable[Tuple[str, str, Dict[str, List[str]]]]
+    ) -> "BlockStateTable":
+        """
+        Create the table from the raw block specifications.
+
+        :param specifications: The namespace, base name and the "properties" entry of the specification for each block.
+        :return: The table. The blocks and properties are sorted so the order of the input does not matter.
+        """
+        return cls(
+            [
+                [
+                    namespace,
+                    base_name,
+                    [[name, list(properties[name])] for name in sorted(properties)],
+                ]
+                for namespace, base_name, properties in sorted(
+                    specifications, key=lambda spec: spec[:2]
+                )
+            ]
+        )
+
+    @property
+    def layout(self) -> RawStateLayout:
+        """The raw layout the table was created from."""
+        return self._layout
+
+    @property
+    def state_count(self) -> int:
+        """The number of block states. The ids are in the range 0 to state_count - 1."""
+        return self._state_count
+
+    def __len__(self) -> int:
+        return self._state_count
+
+    def get_state_id(self, block: Block) -> int:
+        """
+        Get the id of a block state.
+
+        :param block: The block. It must have exactly the properties in its specification and no extra blocks.
+        :return: The id of the block state.
+        :raises KeyError: If the block is not a state in the table.
+        """
+        index = self._block_index.get((block.namespace, block.base_name))
+        if index is None or block.extra_blocks:
+            raise KeyError(f"{block} is not a block state in the table")
+        names, digits, strides = self._properties[index]
+        properties = block.properties
+        if len(properties) != len(names):
+            raise KeyError(f"{block} is not a block state in the table")
+        state_id = self._offsets[index]
+        try:
+            for name, value_digits, stride in zip(names, digits, strides):
+                state_id += value_digits[properties[name]] * stride
+        except KeyError:
+            raise KeyError(f"{block} is not a block state in the table") from None
+        return state_id
+
+    def get_state(self, state_id: int) -> Block:
+        """
+        Get the block state with the given id.
+
+        :param state_id: The id of the block state.
+        :return: The block.
+        :raises IndexError: If the id is not in the table.
+        """
+        if not 0 <= state_id < self._state_count:
+            raise IndexError(f"Block state id {state_id} is not in the table")
+        if self._blocks is None:
+            self._blocks = [
+                Block(namespace, base_name, dict(zip(names, values)))
+                for (namespace, base_name, _), (names, _, _), property_values in zip(
+                    self._layout, self._properties, self._values
+                )
+                for values in itertools.product(*property_values)
+            ]
+        return self._blocks[state_id]
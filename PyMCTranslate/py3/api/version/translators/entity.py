@@ -1,10 +1,10 @@
 from typing import Tuple, TYPE_CHECKING, Optional, Union, Dict, Any
-import copy
 import logging
 
 import amulet_nbt
 from PyMCTranslate.py3.api import Entity, Block, BlockEntity
-from .base import BaseTranslator, BaseSpecification
+from PyMCTranslate.py3.util.snbt import from_snbt
+from .base import BaseTranslator, BaseSpecification, copy_object
 
 if TYPE_CHECKING:
     from PyMCTranslate.py3.api.version import Version
@@ -35,7 +35,7 @@ class EntitySpecification(BaseSpecification):
         if self._default_nbt is NotInit:
             snbt = self.get("snbt", None)
             if isinstance(snbt, str):
-                nbt = amulet_nbt.from_snbt(snbt)
+                nbt = from_snbt(snbt)
             else:
                 nbt = None
             self._default_nbt = nbt
@@ -68,20 +68,20 @@ class EntityTranslator(BaseTranslator):
         assert isinstance(entity, Entity), "entity must be an Entity instance"
 
         try:
-            input_spec = self._get_raw_specification(
+            input_spec = self._get_frozen_specification(
                 entity.namespace, entity.base_name, force_blockstate
             )
-            mapping = self.get_mapping_to_universal(
-                entity.namespace, entity.base_name, force_blockstate
+            mapping = self._get_compiled_mapping(
+                "to_universal", entity.namespace, entity.base_name, force_blockstate
             )
         except KeyError:
             log.warning(
                 f"Could not find translation information for {self._mode} {entity} to universal in {self._parent_version}. If this is not a vanilla entity ignore this message"
             )
-            return copy.deepcopy(entity)
+            return copy_object(entity)
 
         output, _, _, _ = self._translate(
-            copy.deepcopy(entity),
+            copy_object(entity),
             input_spec,
             mapping,
             self._universal_format,
@@ -104,20 +104,20 @@ class EntityTranslator(BaseTranslator):
         assert isinstance(entity, Entity), "entity must be an Entity instance"
 
         try:
-            input_spec = self._universal_format.entity._get_raw_specification(
+            input_spec = self._universal_format.entity._get_frozen_specification(
                 entity.namespace, entity.base_name
             )
-            mapping = self.get_mapping_from_universal(
-                entity.namespace, entity.base_name, force_blockstate
+            mapping = self._get_compiled_mapping(
+                "from_universal", entity.namespace, entity.base_name, force_blockstate
             )
         except KeyError:
             log.warning(
                 f"Could not find translation information for {self._mode} {entity} from universal in {self._parent_version}. If this is not a vanilla entity ignore this message"
             )
-            return copy.deepcopy(entity), None
+            return copy_object(entity), None
 
         output, extra_output, _, _ = self._translate(
-            copy.deepcopy(entity),
+            copy_object(entity),
             input_spec,
             mapping,
             self._parent_version,
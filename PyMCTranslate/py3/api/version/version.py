@@ -1,13 +1,16 @@
 import json
 import os
 from typing import Union, Tuple, TYPE_CHECKING
-import glob
 import warnings
 import logging
+import threading
 
 from PyMCTranslate.py3.api import Block
-from PyMCTranslate.py3.util.json_gz import load_json_gz
-from PyMCTranslate.py3.meta import minified, json_atlas
+from PyMCTranslate.py3.util.json_tree import load_json_tree
+from PyMCTranslate.py3.meta import (
+    json_cache_dir,
+    mapped_database,
+)
 from .translators import (
     BlockTranslator,
     EntityTranslator,
@@ -21,6 +24,7 @@ if TYPE_CHECKING:
 log = logging.getLogger(__name__)
 
 _version_data = {}
+_version_data_lock = threading.Lock()
 
 _translator_classes = {
     "block": BlockTranslator,
@@ -46,28 +50,33 @@ class Version:
         self._item = None
         self._biome = None
 
-        if version_path not in _version_data:
-            _version_data[version_path] = {}
-            if minified:
-                # load meta.json.gz and store in _version_data[version_path]["meta"]
-                _version_data[version_path]["meta"] = {
-                    key: json_atlas[value]
-                    for key, value in load_json_gz(
-                        os.path.join(version_path, "meta.json.gz")
-                    ).items()
-                }
-            else:
-                _version_data[version_path]["meta"] = meta = {}
-                for file_name in [
-                    "__init__",
-                    "__waterloggable__",
-                    "__always_waterlogged__",
-                    "__biome_data__",
-                    "__numerical_block_map__",
-                ]:
-                    if os.path.isfile(os.path.join(version_path, f"{file_name}.json")):
-                        with open(os.path.join(version_path, f"{file_name}.json")) as f:
-                            meta[file_name] = json.load(f)
+        # Locks the lazy loading of the translators
+        self._lock = threading.RLock()
+
+        with _version_data_lock:
+            if version_path not in _version_data:
+                _version_data[version_path] = {}
+                if mapped_database is not None:
+                    # the entries are decoded from the mapped file when they are first accessed
+                    _version_data[version_path]["meta"] = mapped_database[
+                        os.path.basename(version_path)
+                    ]["meta"]
+                else:
+                    _version_data[version_path]["meta"] = meta = {}
+                    for file_name in [
+                        "__init__",
+                        "__waterloggable__",
+                        "__always_waterlogged__",
+                        "__biome_data__",
+                        "__numerical_block_map__",
+                    ]:
+                        if os.path.isfile(
+                            os.path.join(version_path, f"{file_name}.json")
+                        ):
+                            with open(
+                                os.path.join(version_path, f"{file_name}.json")
+                            ) as f:
+                                meta[file_name] = json.load(f)
 
         meta = _version_data[version_path]["meta"]
         # unpack the __init__.json file
@@ -88,17 +97,21 @@ class Version:
             "pseudo-numerical",
         ]
 
-        self._block_extra_input = [{}, None, None, self._block_format]
-        if self.has_abstract_format:
-            self._block_extra_input[0] = meta["__numerical_block_map__"]
+        self._meta = meta
 
-        if self.platform == "java" and "__waterloggable__" in meta:
-            self._block_extra_input[1] = meta["__waterloggable__"]
-            self._block_extra_input[2] = meta["__always_waterlogged__"]
+    def _get_block_extra_input(self) -> list:
+        """
+        The extra inputs required by the BlockTranslator.
+        These are looked up when the BlockTranslator is created so that the data is only loaded if needed.
+        """
+        block_extra_input = [{}, None, None, self._block_format]
+        if self.has_abstract_format:
+            block_extra_input[0] = self._meta["__numerical_block_map__"]
 
-        self._biome_callable = lambda: BiomeTranslator(
-            meta["__biome_data__"], translation_manager
-        )
+        if self.platform == "java" and "__waterloggable__" in self._meta:
+            block_extra_input[1] = self._meta["__waterloggable__"]
+            block_extra_input[2] = self._meta["__always_waterlogged__"]
+        return block_extra_input
 
     def _load_translator(self, attr, *args):
         """
@@ -107,29 +120,30 @@ class Version:
         """
         if attr not in _translator_classes:
             raise Exception(f"Unknown translator {attr}")
-        if getattr(self, f"_{attr}") is None:
-            if minified:
-                fpath = os.path.join(self._version_path, f"{attr}.json.gz")
-                if os.path.isfile(fpath):
-                    database = load_json_gz(fpath)
-                else:
+        if getattr(self, f"_{attr}") is not None:
+            return
+        with self._lock:
+            if getattr(self, f"_{attr}") is not None:
+                # another thread loaded it while this one was waiting for the lock
+                return
+            if mapped_database is not None:
+                database = mapped_database[os.path.basename(self._version_path)].get(
+                    attr
+                )
+                if database is None:
                     log.critical(f"Could not find {attr} database")
                     database = {}
             else:
-                database = {}
-                for fpath in glob.iglob(
-                    os.path.join(glob.escape(self._version_path), attr, "**", "*.json"),
-                    recursive=True,
-                ):
-                    database_ = database
-                    rel_path = os.path.relpath(
-                        fpath, os.path.join(self._version_path, attr)
-                    ).split(os.sep)
-                    assert len(rel_path) == 5
-                    for directory in rel_path[:-2]:
-                        database_ = database_.setdefault(directory, {})
-                    with open(fpath) as f:
-                        database_[rel_path[-1][:-5]] = json.load(f)
+                if json_cache_dir is None:
+                    cache_path = None
+                else:
+                    cache_path = os.path.join(
+                        json_cache_dir,
+                        f"{os.path.basename(self._version_path)}_{attr}.json",
+                    )
+                database = load_json_tree(
+                    os.path.join(self._version_path, attr), cache_path
+                )
             setattr(
                 self,
                 f"_{attr}",
@@ -138,6 +152,15 @@ class Version:
                 ),
             )
 
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
     def __repr__(self):
         return f"PyMCTranslate.Version({self.platform}, {self.version_number})"
 
@@ -193,7 +216,8 @@ class Version:
     @property
     def block(self) -> BlockTranslator:
         """The BlockTranslator for this version"""
-        self._load_translator("block", *self._block_extra_input)
+        if self._block is None:
+            self._load_translator("block", *self._get_block_extra_input())
         return self._block
 
     @property
@@ -212,7 +236,11 @@ class Version:
     def biome(self) -> BiomeTranslator:
         """The BiomeTranslator for this version"""
         if self._biome is None:
-            self._biome = self._biome_callable()
+            with self._lock:
+                if self._biome is None:
+                    self._biome = BiomeTranslator(
+                        self._meta["__biome_data__"], self._translation_manager
+                    )
         return self._biome
 
     def is_waterloggable(self, namespace_str: str, always=False):
@@ -1,7 +1,7 @@
 from typing import Optional
 import os
 
-from .util.json_gz import load_json_gz
+from .util.mapped_database import MappedDatabase, open_database
 
 pymct_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 
@@ -11,25 +11,19 @@ try:
 except:
     build_number = -1
 
-# have the json files been minified
-minified = os.path.isdir(os.path.join(pymct_dir, "min_json"))
+# have the json files been minified into the memory mapped database
+minified = os.path.isfile(os.path.join(pymct_dir, "min_json", "database.bin"))
+mapped_database: Optional[MappedDatabase] = None
 if minified:
     """
-    minified format
+    memory mapped format
     min_json
-        atlas.json.gz
-        versions
-            <version>
-                meta.json.gz
-                block.json.gz
-                item.json.gz
-                entity.json.gz
+        database.bin
     """
-    # load the mega_json file and unpack
-    json_atlas: Optional[list] = load_json_gz(
-        os.path.join(pymct_dir, "min_json", "atlas.json.gz")
-    )
+    # the database is memory mapped and only the parts that are used are decoded
+    mapped_database = open_database(os.path.join(pymct_dir, "min_json", "database.bin"))
     json_dir = os.path.join(pymct_dir, "min_json")
+    json_cache_dir: Optional[str] = None
 else:
     """
     maximised format
@@ -45,5 +39,7 @@ else:
                                 <group_name>
                                     <base_name>.json
     """
-    json_atlas = None
     json_dir = os.path.join(pymct_dir, "json")
+    # Optional directory to store a consolidated copy of each unpacked database.
+    # The copy is rebuilt when any of the json files change.
+    json_cache_dir: Optional[str] = os.environ.get("PYMCT_JSON_CACHE") or None
@@ -0,0 +1,114 @@
+from typing import Any, Callable, TypeVar
+import os
+import json
+import logging
+import tempfile
+
+from PyMCTranslate.py3.meta import build_number
+
+log = logging.getLogger(__name__)
+
+"""
+Data that is derived from the database or the code and shipped with the library so that it does not need to be found at runtime.
+These are built by the build_data command in build_tools/build_data.py which is run as part of the build.
+
+file format
+{
+    "build_number": <int>,
+    "<key>": <data>
+}
+
+The data is only used by the build that wrote it.
+If it is missing or out of date it is found again in memory. The file is never written at runtime.
+"""
+
+T = TypeVar("T")
+
+
+def load_build_data(path: str, key: str) -> Any:
+    """
+    Load the data from a build data file.
+
+    :param path: The path to the file.
+    :param key: The key the data is stored under.
+    :return: The raw data. None if the file does not exist, could not be read or was built for a different build.
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        log.warning(f"Could not read {path}", exc_info=True)
+        return None
+    if not isinstance(data, dict) or data.get("build_number") != build_number:
+        return None
+    return data.get(key)
+
+
+def save_build_data(path: str, key: str, data: Any):
+    """
+    Write a build data file for the current build.
+
+    :param path: The path to the file.
+    :param key: The key to store the data under.
+    :param data: The raw data. It must be a json serialisable dict or list.
+    """
+    # one entry per line so that changes are easy to review
+    if isinstance(data, dict):
+        entries = [
+            f"        {json.dumps(entry_key)}: {json.dumps(value)}"
+            for entry_key, value in data.items()
+        ]
+        brackets = "{}"
+    elif isinstance(data, list):
+        entries = [f"        {json.dumps(value)}" for value in data]
+        brackets = "[]"
+    else:
+        raise TypeError("The data must be a dict or a list")
+    if entries:
+        entries_str = ",\n".join(entries)
+        data_str = f"{brackets[0]}\n{entries_str}\n    {brackets[1]}"
+    else:
+        data_str = brackets
+    # write to a unique file in the same directory and move it into place so that a reader never sees a partial file
+    fd, temp_path = tempfile.mkstemp(
+        prefix=f"{os.path.basename(path)}.", dir=os.path.dirname(path) or None
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            f.write(
+                f'{{\n    "build_number": {json.dumps(build_number)},\n    {json.dumps(key)}: {data_str}\n}}\n'
+            )
+        # mkstemp creates the file readable by the owner only
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def get_build_data(
+    path: str,
+    key: str,
+    build: Callable[[], Any],
+    decode: Callable[[Any], T] = lambda data: data,
+    is_valid: Callable[[Any], bool] = lambda data: True,
+) -> T:
+    """
+    Get the data from a build data file or build it in memory if the file is missing or out of date.
+
+    :param path: The path to the file.
+    :param key: The key the data is stored under.
+    :param build: A function that finds the raw data. This is called if the stored data is missing or not valid.
+    :param decode: A function that converts the raw data to the returned value.
+    :param is_valid: A function that checks if the stored raw data is still valid. The built data is always used.
+    :return: The decoded data.
+    """
+    data = load_build_data(path, key)
+    if data is None or not is_valid(data):
+        log.info(
+            f"{path} is missing or out of date. Run the build_data command to rebuild it."
+        )
+        data = build()
+    return decode(data)
@@ -0,0 +1,206 @@
+from typing import Any, Callable, Dict, Hashable, NamedTuple, Optional, Iterator, Tuple
+from collections import OrderedDict
+from sys import getsizeof
+import threading
+
+"""
+Cache policies used for the translation caches.
+
+A TranslationManager is given a cache factory (a callable that takes no arguments and returns a new cache).
+It is called for each translation cache so the policy applies to each cache separately.
+eg. functools.partial(LRUCache, 10_000)
+"""
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+    max_size: Optional[int]
+
+    def __add__(self, other: "CacheInfo") -> "CacheInfo":
+        if not isinstance(other, CacheInfo):
+            return NotImplemented
+        return CacheInfo(
+            self.hits + other.hits,
+            self.misses + other.misses,
+            self.evictions + other.evictions,
+            self.entries + other.entries,
+            self.size + other.size,
+            (
+                None
+                if self.max_size is None or other.max_size is None
+                else self.max_size + other.max_size
+            ),
+        )
+
+
+EmptyCacheInfo = CacheInfo(0, 0, 0, 0, 0, 0)
+
+
+class BaseCache:
+    """
+    The base class for the translation caches.
+
+    Lookups are done with get which records a hit or a miss.
+    None cannot be stored as a value.
+    The public methods are thread safe. Subclasses implement _get and _set which are called with the lock held.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data: Dict[Hashable, Any] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get the value stored for key or default if it is not stored."""
+        with self._lock:
+            return self._get(key, default)
+
+    def _get(self, key: Hashable, default: Any) -> Any:
+        value = self._data.get(key)
+        if value is None:
+            self._misses += 1
+            return default
+        self._hits += 1
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        with self._lock:
+            self._set(key, value)
+
+    def _set(self, key: Hashable, value: Any):
+        self._data[key] = value
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def items(self) -> Iterator[Tuple[Hashable, Any]]:
+        """Iterate over the stored entries without changing the statistics or the order."""
+        with self._lock:
+            return iter(list(self._data.items()))
+
+    def clear(self):
+        """Remove all entries. The statistics are not reset."""
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self._data.clear()
+
+    @property
+    def size(self) -> int:
+        """The size of the stored entries in the unit the cache is limited by."""
+        return len(self._data)
+
+    @property
+    def max_size(self) -> Optional[int]:
+        """The maximum size of the cache or None if it is not limited."""
+        return None
+
+    def info(self) -> CacheInfo:
+        """Get the statistics for this cache."""
+        with self._lock:
+            return CacheInfo(
+                self._hits,
+                self._misses,
+                self._evictions,
+                len(self._data),
+                self.size,
+                self.max_size,
+            )
+
+
+class UnboundedCache(BaseCache):
+    """A cache that is never evicted. This is the default."""
+
+
+class LRUCache(BaseCache):
+    """A cache that evicts the least recently used entry once it holds more than max_entries entries."""
+
+    def __init__(self, max_entries: int):
+        super().__init__()
+        if max_entries < 0:
+            raise ValueError("max_entries must be 0 or more")
+        self._data: OrderedDict = OrderedDict()
+        self._max_entries = max_entries
+
+    def _get(self, key: Hashable, default: Any) -> Any:
+        value = super()._get(key, default)
+        if value is not default:
+            self._data.move_to_end(key)
+        return value
+
+    def _set(self, key: Hashable, value: Any):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self._max_entries:
+            self._data.popitem(last=False)
+            self._evictions += 1
+
+    @property
+    def max_size(self) -> Optional[int]:
+        return self._max_entries
+
+
+def _sizeof_key(key: Hashable, value: Any) -> int:
+    return getsizeof(key)
+
+
+class SizedLRUCache(LRUCache):
+    """
+    A cache that evicts the least recently used entries once the size of the stored keys exceeds max_size bytes.
+    The size of each entry is found with the sizeof function which defaults to sys.getsizeof on the key (Block.__sizeof__).
+    """
+
+    def __init__(self, max_size: int, sizeof: Callable[[Hashable, Any], int] = None):
+        super().__init__(0)
+        if max_size < 0:
+            raise ValueError("max_size must be 0 or more")
+        self._max_size = max_size
+        self._sizeof = sizeof or _sizeof_key
+        self._sizes: Dict[Hashable, int] = {}
+        self._size = 0
+
+    def _set(self, key: Hashable, value: Any):
+        self._size -= self._sizes.pop(key, 0)
+        size = self._sizes[key] = self._sizeof(key, value)
+        self._size += size
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while self._size > self._max_size:
+            old_key, _ = self._data.popitem(last=False)
+            self._size -= self._sizes.pop(old_key)
+            self._evictions += 1
+
+    def _clear(self):
+        super()._clear()
+        self._sizes.clear()
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def max_size(self) -> Optional[int]:
+        return self._max_size
+
+
+CacheFactory = Callable[[], BaseCache]
@@ -0,0 +1,15 @@
+from typing import Any
+from types import MappingProxyType
+
+
+def freeze(data: Any) -> Any:
+    """
+    Get a read only view of decoded json data.
+    Dictionaries become read only mappings and lists become tuples.
+    This allows the specification data to be shared without the risk of it being modified.
+    """
+    if isinstance(data, dict):
+        return MappingProxyType({key: freeze(value) for key, value in data.items()})
+    elif isinstance(data, list):
+        return tuple(freeze(value) for value in data)
+    return data
@@ -0,0 +1,165 @@
+from typing import Any, Dict, List, Optional, Tuple
+import os
+import json
+import hashlib
+import struct
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from PyMCTranslate.py3.meta import build_number
+
+log = logging.getLogger(__name__)
+
+"""
+Loader for the unpacked json layout.
+
+<root>
+    <block format>
+        <operation>
+            <namespace>
+                <group_name>
+                    <base_name>.json
+
+This is loaded into {block format: {operation: {namespace: {base_name: data}}}}
+"""
+
+# (relative path parts, full path, modification time, size)
+_FileEntry = Tuple[Tuple[str, ...], str, int, int]
+
+"""
+cache file format
+    magic           8 bytes b"PYMCTJC\x02"
+    build number    i64 the build number that wrote the file
+    signature       40 bytes the hex signature of the json files
+    digest          32 bytes sha256 of the payload
+    payload         the database as compact utf-8 json
+
+The payload is plain json so reading the cache can never run code.
+The digest only detects a truncated or corrupted file. It does not authenticate the file.
+"""
+_CacheMagic = b"PYMCTJC\x02"
+_CacheHeaderFormat = struct.Struct("<8sq40s32s")
+
+
+def _scan(root: str) -> List[_FileEntry]:
+    """Find all the json files under root using os.scandir."""
+    files = []
+    stack = [(root, ())]
+    while stack:
+        path, rel_path = stack.pop()
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_dir():
+                    stack.append((entry.path, rel_path + (entry.name,)))
+                elif entry.name.endswith(".json") and entry.is_file():
+                    stat = entry.stat()
+                    files.append(
+                        (
+                            rel_path + (entry.name,),
+                            entry.path,
+                            stat.st_mtime_ns,
+                            stat.st_size,
+                        )
+                    )
+    files.sort()
+    return files
+
+
+def _signature(files: List[_FileEntry]) -> str:
+    """A hash of the file paths, modification times and sizes. This changes if any file is added, removed or modified."""
+    sha = hashlib.sha1()
+    for rel_path, _, mtime, size in files:
+        sha.update(f"{'/'.join(rel_path)}:{mtime}:{size}\n".encode("utf-8"))
+    return sha.hexdigest()
+
+
+def _load_json(path: str) -> Any:
+    with open(path, "rb") as f:
+        return json.loads(f.read())
+
+
+def _load_cache(cache_path: str, signature: str) -> Optional[Dict[str, Any]]:
+    if not os.path.isfile(cache_path):
+        return None
+    try:
+        with open(cache_path, "rb") as f:
+            header = f.read(_CacheHeaderFormat.size)
+            if len(header) != _CacheHeaderFormat.size:
+                return None
+            (
+                magic,
+                cached_build_number,
+                cached_signature,
+                digest,
+            ) = _CacheHeaderFormat.unpack(header)
+            if (
+                magic != _CacheMagic
+                or cached_build_number != build_number
+                or cached_signature != signature.encode("ascii")
+            ):
+                return None
+            payload = f.read()
+        if digest != hashlib.sha256(payload).digest():
+            log.debug(f"The json cache {cache_path} is corrupted")
+            return None
+        return json.loads(payload)
+    except Exception:
+        log.debug(f"Could not read json cache {cache_path}", exc_info=True)
+        return None
+
+
+def _save_cache(cache_path: str, signature: str, database: Dict[str, Any]):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        payload = json.dumps(database, separators=(",", ":")).encode("utf-8")
+        temp_path = f"{cache_path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(
+                _CacheHeaderFormat.pack(
+                    _CacheMagic,
+                    build_number,
+                    signature.encode("ascii"),
+                    hashlib.sha256(payload).digest(),
+                )
+            )
+            f.write(payload)
+        os.replace(temp_path, cache_path)
+    except Exception:
+        log.debug(f"Could not write json cache {cache_path}", exc_info=True)
+
+
+def load_json_tree(root: str, cache_path: str = None) -> Dict[str, Any]:
+    """
+    Load a directory of json files in the unpacked layout.
+
+    The files are read in a thread pool.
+    If cache_path is given the loaded data is stored there and reused until any of the files or the build number change.
+
+    :param root: The directory to load. eg json/versions/java_1_20_4/block
+    :param cache_path: Optional path to a consolidated cache file.
+    :return: The nested database dictionary.
+    """
+    if not os.path.isdir(root):
+        return {}
+    files = _scan(root)
+
+    if cache_path is not None:
+        signature = _signature(files)
+        database = _load_cache(cache_path, signature)
+        if database is not None:
+            return database
+
+    with ThreadPoolExecutor() as executor:
+        data = executor.map(_load_json, [path for _, path, _, _ in files])
+
+        database = {}
+        for (rel_path, *_), file_data in zip(files, data):
+            assert len(rel_path) == 5
+            database_ = database
+            for directory in rel_path[:-2]:
+                database_ = database_.setdefault(directory, {})
+            database_[rel_path[-1][:-5]] = file_data
+
+    if cache_path is not None:
+        _save_cache(cache_path, signature, database)
+    return database
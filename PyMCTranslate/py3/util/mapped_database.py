@@ -0,0 +1,170 @@
+from typing import Any, Dict, Iterator, List, Optional, Union
+from collections.abc import Mapping
+import mmap
+import json
+import struct
+
+"""
+A compact binary database that is memory mapped and read lazily.
+
+This is the format that the build creates from the unpacked json files (build_tools/minify_json.py).
+Each process maps the same file so the raw data is shared between processes through the page cache.
+Only the parts that are accessed are decoded.
+
+file format (little endian)
+    header
+        magic           8 bytes b"PYMCTDB\x01"
+        string table    u64 offset of the string table
+        root            u64 offset of the root node
+    nodes
+        leaf            u8 0, u32 length, utf-8 json
+        branch          u8 1, u32 count, count * (u32 key string index, u64 child node offset) in the original order
+    string table
+        u32 count, count * (u32 length, utf-8 string)
+
+The root node is a branch with a child for each version directory.
+Each version is a branch containing "meta" and the translator databases ("block", "entity", "item")
+which match the structure of the json layout.
+Identical leaves are stored once and shared between all the branches that use them.
+"""
+
+Magic = b"PYMCTDB\x01"
+HeaderFormat = struct.Struct("<8sQQ")
+NodeHeaderFormat = struct.Struct("<BI")
+BranchEntryFormat = struct.Struct("<IQ")
+StringLengthFormat = struct.Struct("<I")
+LeafNode = 0
+BranchNode = 1
+
+# The databases opened in this process. The key is the file path.
+_databases: Dict[str, "MappedDatabase"] = {}
+
+
+def open_database(path: str) -> "MappedDatabase":
+    """
+    Get the MappedDatabase for a file.
+    The same instance is returned for each call with the same path so the file is only mapped once per process.
+    """
+    database = _databases.get(path)
+    if database is None:
+        database = _databases[path] = MappedDatabase(path)
+    return database
+
+
+def _open_branch(path: str, offset: int, count: int) -> "MappedBranch":
+    return MappedBranch(open_database(path), offset, count)
+
+
+class MappedDatabase:
+    """
+    Read only access to a memory mapped database file.
+
+    Branches are exposed as read only mappings and leaves are decoded from json the first time they are accessed.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, string_table_offset, root_offset = HeaderFormat.unpack_from(
+            self._mmap, 0
+        )
+        if magic != Magic:
+            raise ValueError(f"{path} is not a PyMCTranslate database")
+        self._strings = self._read_strings(string_table_offset)
+        # decoded leaves and branches. The key is the node offset.
+        self._nodes: Dict[int, Any] = {}
+        self._root = self._node(root_offset)
+
+    def __reduce__(self):
+        # Only the path is pickled. The receiving process maps the file itself.
+        return open_database, (self._path,)
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def root(self) -> "MappedBranch":
+        """The root branch of the database."""
+        return self._root
+
+    def close(self):
+        """Close the memory map. The database cannot be used after this."""
+        if _databases.get(self._path) is self:
+            del _databases[self._path]
+        self._nodes.clear()
+        self._mmap.close()
+
+    def _read_strings(self, offset: int) -> List[str]:
+        (count,) = StringLengthFormat.unpack_from(self._mmap, offset)
+        offset += StringLengthFormat.size
+        strings = []
+        for _ in range(count):
+            (length,) = StringLengthFormat.unpack_from(self._mmap, offset)
+            offset += StringLengthFormat.size
+            strings.append(self._mmap[offset : offset + length].decode("utf-8"))
+            offset += length
+        return strings
+
+    def _node(self, offset: int) -> Union["MappedBranch", Any]:
+        try:
+            return self._nodes[offset]
+        except KeyError:
+            pass
+        node_type, size = NodeHeaderFormat.unpack_from(self._mmap, offset)
+        offset_ = offset + NodeHeaderFormat.size
+        if node_type == LeafNode:
+            node = json.loads(self._mmap[offset_ : offset_ + size])
+        elif node_type == BranchNode:
+            node = MappedBranch(self, offset_, size)
+        else:
+            raise ValueError(f"Unknown node type {node_type} at {offset}")
+        self._nodes[offset] = node
+        return node
+
+    def __getitem__(self, key: str):
+        return self._root[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._root
+
+    def keys(self):
+        return self._root.keys()
+
+
+class MappedBranch(Mapping):
+    """A read only mapping for a branch in a MappedDatabase. The entries are only read on first access."""
+
+    def __init__(self, database: MappedDatabase, offset: int, count: int):
+        self._database = database
+        self._offset = offset
+        self._count = count
+        self._children: Optional[Dict[str, int]] = None
+
+    def __reduce__(self):
+        return _open_branch, (self._database.path, self._offset, self._count)
+
+    def _get_children(self) -> Dict[str, int]:
+        if self._children is None:
+            strings = self._database._strings
+            end = self._offset + self._count * BranchEntryFormat.size
+            self._children = {
+                strings[key_index]: child_offset
+                for key_index, child_offset in BranchEntryFormat.iter_unpack(
+                    self._database._mmap[self._offset : end]
+                )
+            }
+        return self._children
+
+    def __getitem__(self, key: str) -> Any:
+        return self._database._node(self._get_children()[key])
+
+    def __contains__(self, key) -> bool:
+        return key in self._get_children()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._get_children())
@@ -0,0 +1,49 @@
+from typing import Dict
+import copy
+
+import amulet_nbt
+from amulet_nbt import (
+    AbstractBaseTag,
+    AbstractBaseImmutableTag,
+    CompoundTag,
+    ListTag,
+)
+
+# The SNBT strings in the specification and mapping files are constant so each one only needs parsing once.
+_snbt_cache: Dict[str, AbstractBaseTag] = {}
+
+
+def copy_nbt(tag: AbstractBaseTag) -> AbstractBaseTag:
+    """
+    Copy an NBT tag so that it can be modified without modifying the original.
+    Immutable tags are returned as they are.
+    This is cheaper than copy.deepcopy for the small trees found in the mapping files.
+    """
+    if isinstance(tag, AbstractBaseImmutableTag):
+        return tag
+    elif isinstance(tag, CompoundTag):
+        return CompoundTag({key: copy_nbt(value) for key, value in tag.items()})
+    elif isinstance(tag, ListTag):
+        return ListTag([copy_nbt(value) for value in tag], tag.list_data_type)
+    else:
+        return copy.deepcopy(tag)
+
+
+def from_snbt(snbt: str) -> AbstractBaseTag:
+    """
+    Parse a constant SNBT string.
+    Each unique string is only parsed once per process.
+    Immutable tags are shared. Mutable tags are copied so the caller may modify the returned tag.
+
+    This should only be used for constant strings from the specification and mapping files.
+    Strings generated at runtime should use amulet_nbt.from_snbt so that the cache does not grow forever.
+
+    :param snbt: The SNBT string to parse.
+    :return: The parsed NBT tag.
+    """
+    tag = _snbt_cache.get(snbt)
+    if tag is None:
+        tag = _snbt_cache[snbt] = amulet_nbt.from_snbt(snbt)
+    if isinstance(tag, AbstractBaseImmutableTag):
+        return tag
+    return copy_nbt(tag)
@@ -0,0 +1,93 @@
+import os
+import sys
+import subprocess
+from typing import Dict, Type
+
+from setuptools import Command
+from setuptools.command.build import build as build_
+
+from minify_json import ProjectName
+
+"""
+Build the data files that are derived from the database or the code and shipped with the library.
+See PyMCTranslate/py3/util/build_data.py for the file format.
+This is run as part of the build after minify_json so that the shipped files always match the shipped database.
+It can also be run directly to update the files in the source tree.
+"""
+
+
+def register(cmdclass: Dict[str, Type[Command]]):
+    cmdclass["build_data"] = BuildData
+    build = cmdclass.get("build", build_)
+    # this must run after minify_json because it reads the built database
+    build.sub_commands.append(("build_data", None))
+
+
+class BuildData(Command):
+    def initialize_options(self):
+        self.build_lib = None
+
+    def finalize_options(self):
+        self.set_undefined_options("build_py", ("build_lib", "build_lib"))
+
+    def run(self):
+        # Run in a new process so that the built package is imported rather than the source tree.
+        try:
+            subprocess.run(
+                [
+                    sys.executable,
+                    os.path.abspath(__file__),
+                    os.path.abspath(os.path.join(self.build_lib, ProjectName)),
+                ],
+                check=True,
+            )
+        except subprocess.CalledProcessError:
+            # The runtime finds the data itself if the shipped files are out of date.
+            self.warn(
+                "Could not build the data files. The files from the source tree will be used."
+            )
+
+
+def build_data(pymct_path: str):
+    sys.path.insert(0, os.path.dirname(pymct_path))
+    import PyMCTranslate
+    from PyMCTranslate.py3.meta import json_dir
+    from PyMCTranslate.py3.api.version import Version
+    from PyMCTranslate.py3.api.rotate.rotate import (
+        find_block_shapes,
+        save_block_shapes,
+    )
+    from PyMCTranslate.py3.api.translation_manager.version_manifest import (
+        VersionInfo,
+        find_version_names,
+        find_version_fingerprints,
+        save_version_manifest,
+    )
+
+    translation_manager = PyMCTranslate.new_translation_manager()
+
+    versions_path = os.path.join(json_dir, "versions")
+    version_names = sorted(find_version_names(versions_path))
+    version_infos = [
+        VersionInfo.from_version(
+            Version(os.path.join(versions_path, version_name), translation_manager)
+        )
+        for version_name in version_names
+    ]
+    save_version_manifest(
+        version_infos,
+        find_version_fingerprints(versions_path, version_names),
+        os.path.join(pymct_path, "version_manifest.json"),
+    )
+    print(f"Found {len(version_infos)} versions")
+
+    block_shapes = find_block_shapes(translation_manager.universal_format)
+    save_block_shapes(block_shapes, os.path.join(pymct_path, "block_shapes.json"))
+    print(f"Found the block shape of {len(block_shapes)} universal blocks")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        build_data(sys.argv[1])
+    else:
+        build_data(os.path.abspath(os.path.join(__file__, "..", "..", ProjectName)))
@@ -1,9 +1,11 @@
 import os
 import json
 import glob
-import gzip
 import shutil
-from typing import Dict, Type
+import time
+import importlib.util
+import multiprocessing
+from typing import Dict, Type, Tuple, Optional, BinaryIO
 
 from setuptools import Command
 from setuptools.command.build import build as build_
@@ -34,62 +36,199 @@ class MinifyJson(Command):
         minify_json(os.path.join(self.build_lib, ProjectName), True)
 
 
-def minify_json(pymct_path, remove_origin=False):
-    atlas = []
-    versions = {}
-
-    def get_add_atlas(obj) -> int:
-        try:
-            return atlas.index(obj)
-        except ValueError:
-            atlas.append(obj)
-            return len(atlas) - 1
-
+def _canonical(obj) -> str:
+    """A serialisation that is the same for all equal json objects."""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"))
+
+
+def _load_version(version_path: str) -> Tuple[dict, Dict[str, str]]:
+    """
+    Load the json files for one version.
+
+    The leaf objects are replaced with their canonical serialisation and the original serialisation is stored in the returned dictionary.
+    This is run in a worker process so that the expensive parts are done in parallel.
+
+    :return: The version structure with canonical strings in place of the leaf entries and a map from canonical to original serialisation.
+    """
+    version = {}
+    originals: Dict[str, str] = {}
+
+    def add(obj) -> str:
+        canonical = _canonical(obj)
+        if canonical not in originals:
+            originals[canonical] = json.dumps(obj, separators=(",", ":"))
+        return canonical
+
+    meta = version["meta"] = {}
+    for path in sorted(os.listdir(version_path)):
+        full_path = os.path.join(version_path, path)
+        if os.path.isfile(full_path):
+            if path == "__init__.json":
+                # This is needed to initialise the version so it is stored inline
+                with open(full_path) as f:
+                    meta[path[:-5]] = json.load(f)
+            elif path.endswith(".json"):
+                with open(full_path) as f:
+                    meta[path[:-5]] = add(json.load(f))
+
+        elif os.path.isdir(full_path):
+            database = version[path] = {}
+            for fpath in sorted(
+                glob.iglob(
+                    os.path.join(glob.escape(full_path), "**", "*.json"),
+                    recursive=True,
+                )
+            ):
+                database_ = database
+                rel_path = os.path.relpath(fpath, full_path).split(os.sep)
+                assert len(rel_path) == 5
+                for directory in rel_path[:-2]:
+                    database_ = database_.setdefault(directory, {})
+                with open(fpath) as f:
+                    database_[rel_path[-1][:-5]] = add(json.load(f))
+    return version, originals
+
+
+def _load_format():
+    # Load the reader module directly so that the file format is only defined in one place.
+    # This does not import the PyMCTranslate package so it works before the dependencies are installed.
+    path = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ProjectName,
+        "py3",
+        "util",
+        "mapped_database.py",
+    )
+    spec = importlib.util.spec_from_file_location("_pymct_mapped_database", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_format = _load_format()
+Magic = _format.Magic
+HeaderFormat = _format.HeaderFormat
+NodeHeaderFormat = _format.NodeHeaderFormat
+BranchEntryFormat = _format.BranchEntryFormat
+StringLengthFormat = _format.StringLengthFormat
+LeafNode = _format.LeafNode
+BranchNode = _format.BranchNode
+
+
+class _DatabaseWriter:
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        # map from the canonical serialisation to the offset of the leaf
+        self._leaves: Dict[str, int] = {}
+        self._strings: Dict[str, int] = {}
+        self._f.write(HeaderFormat.pack(Magic, 0, 0))
+
+    def _string_index(self, string: str) -> int:
+        index = self._strings.get(string)
+        if index is None:
+            index = self._strings[string] = len(self._strings)
+        return index
+
+    def write_leaf(self, canonical: str, original: str) -> int:
+        offset = self._leaves.get(canonical)
+        if offset is None:
+            data = original.encode("utf-8")
+            offset = self._leaves[canonical] = self._f.tell()
+            self._f.write(NodeHeaderFormat.pack(LeafNode, len(data)))
+            self._f.write(data)
+        return offset
+
+    def write_branch(self, children: Dict[str, int]) -> int:
+        """Write a branch node. The children must already be written. The order of the children is preserved."""
+        offset = self._f.tell()
+        self._f.write(NodeHeaderFormat.pack(BranchNode, len(children)))
+        for key, child_offset in children.items():
+            self._f.write(BranchEntryFormat.pack(self._string_index(key), child_offset))
+        return offset
+
+    def close(self, root_offset: int):
+        string_table_offset = self._f.tell()
+        self._f.write(StringLengthFormat.pack(len(self._strings)))
+        for string in self._strings:
+            data = string.encode("utf-8")
+            self._f.write(StringLengthFormat.pack(len(data)))
+            self._f.write(data)
+        self._f.seek(0)
+        self._f.write(HeaderFormat.pack(Magic, string_table_offset, root_offset))
+
+    @property
+    def leaf_count(self) -> int:
+        return len(self._leaves)
+
+
+def _write_tree(writer: _DatabaseWriter, tree: dict, originals: Dict[str, str]) -> int:
+    children = {}
+    for key, value in tree.items():
+        if isinstance(value, dict):
+            children[key] = _write_tree(writer, value, originals)
+        else:
+            children[key] = writer.write_leaf(value, originals[value])
+    return writer.write_branch(children)
+
+
+def minify_json(pymct_path, remove_origin=False, processes: Optional[int] = None):
+    """
+    Convert the unpacked json files into the memory mapped database min_json/database.bin.
+    See PyMCTranslate/py3/util/mapped_database.py for the file format.
+
+    The versions are loaded in parallel worker processes when the fork start method is available.
+    The database is written in the order of the sorted version names so the output is deterministic.
+
+    :param pymct_path: The path to the PyMCTranslate package directory.
+    :param remove_origin: Remove the unpacked json directory once done.
+    :param processes: The number of worker processes. Defaults to the number of cores. 1 disables the workers.
+    """
+    start_time = time.perf_counter()
     json_dir = os.path.join(pymct_path, "json")
     versions_dir = os.path.join(json_dir, "versions")
     min_json_dir = os.path.join(pymct_path, "min_json")
 
     shutil.rmtree(min_json_dir, ignore_errors=True)
-
-    for version in os.listdir(versions_dir):
-        meta = versions.setdefault(version, {})["meta"] = {}
-        for path in os.listdir(os.path.join(versions_dir, version)):
-            if os.path.isfile(os.path.join(versions_dir, version, path)):
-                if path.endswith(".json"):
-                    with open(os.path.join(versions_dir, version, path)) as f:
-                        meta[path[:-5]] = get_add_atlas(json.load(f))
-
-            elif os.path.isdir(os.path.join(versions_dir, version, path)):
-                database = versions.setdefault(version, {})[path] = {}
-                for fpath in glob.iglob(
-                    os.path.join(
-                        glob.escape(versions_dir), version, path, "**", "*.json"
-                    ),
-                    recursive=True,
-                ):
-                    database_ = database
-                    rel_path = os.path.relpath(
-                        fpath, os.path.join(versions_dir, version, path)
-                    ).split(os.sep)
-                    assert len(rel_path) == 5
-                    for directory in rel_path[:-2]:
-                        database_ = database_.setdefault(directory, {})
-                    with open(fpath) as f:
-                        database_[rel_path[-1][:-5]] = get_add_atlas(json.load(f))
-
-        for path in versions[version]:
-            os.makedirs(os.path.join(min_json_dir, "versions", version), exist_ok=True)
-            with gzip.open(
-                os.path.join(min_json_dir, "versions", version, f"{path}.json.gz"), "wb"
-            ) as f:
-                f.write(json.dumps(versions[version][path]).encode("utf-8"))
-
-        print(f"Built version {version}")
-
-    print("Writing atlas")
-    with gzip.open(os.path.join(min_json_dir, "atlas.json.gz"), "wb") as f:
-        f.write(json.dumps(atlas).encode("utf-8"))
-    print("Written atlas")
+    os.makedirs(min_json_dir)
+    database_path = os.path.join(min_json_dir, "database.bin")
+
+    version_names = sorted(os.listdir(versions_dir))
+    version_paths = [os.path.join(versions_dir, version) for version in version_names]
+    total_entries = 0
+
+    # spawned workers would re-run setup.py so only use workers when fork is available
+    if processes != 1 and "fork" in multiprocessing.get_all_start_methods():
+        pool = multiprocessing.get_context("fork").Pool(processes)
+        loaded = pool.imap(_load_version, version_paths)
+    else:
+        pool = None
+        loaded = map(_load_version, version_paths)
+
+    try:
+        with open(database_path, "wb") as f:
+            writer = _DatabaseWriter(f)
+            versions: Dict[str, int] = {}
+            for version, (data, originals) in zip(version_names, loaded):
+                total_entries += len(originals)
+                # __init__ is stored inline by _load_version. Store it as a leaf like everything else.
+                meta = data["meta"]
+                init = meta["__init__"]
+                meta["__init__"] = _canonical(init)
+                originals.setdefault(
+                    meta["__init__"], json.dumps(init, separators=(",", ":"))
+                )
+                versions[version] = _write_tree(writer, data, originals)
+                print(f"Built version {version}")
+            writer.close(writer.write_branch(versions))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    print(
+        f"Minified {len(version_names)} versions in {time.perf_counter() - start_time:.1f}s\n"
+        f"Database: {writer.leaf_count} unique entries of {total_entries} per version entries ({os.path.getsize(database_path) / 1_000_000:.1f}MB)"
+    )
 
     if remove_origin:
         shutil.rmtree(json_dir, ignore_errors=True)
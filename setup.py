@@ -6,10 +6,12 @@ import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), "build_tools"))
 
 import minify_json
+import build_data
 
 cmdclass = versioneer.get_cmdclass()
 
 minify_json.register(cmdclass)
+build_data.register(cmdclass)
 
 
 # from Cython.Build import cythonize
@@ -0,0 +1,112 @@
+import unittest
+import logging
+
+import amulet_nbt
+
+import PyMCTranslate
+from PyMCTranslate.py3.api import BlockEntity, BatchTranslator, BatchJob
+
+log = logging.getLogger("PyMCTranslate")
+
+
+class BatchTranslatorTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._translation_manager = PyMCTranslate.new_translation_manager()
+
+    def test_translate(self):
+        source = self._translation_manager.get_version("java", (1, 12, 2))
+        destination = self._translation_manager.get_version("bedrock", (1, 21, 0))
+        translator = self._translation_manager.get_translator(source, destination)
+        palette = [
+            source.block.ints_to_block(block_id, block_data)
+            for block_id in range(64)
+            for block_data in range(4)
+        ]
+        # repeated blocks and a block with a block entity
+        palette += palette[:10]
+        block_entities = [None] * len(palette)
+        palette.append(source.block.ints_to_block(54, 2))
+        block_entities.append(
+            BlockEntity(
+                "minecraft",
+                "chest",
+                0,
+                0,
+                0,
+                amulet_nbt.NamedTag(
+                    amulet_nbt.CompoundTag({"id": amulet_nbt.StringTag("Chest")})
+                ),
+            )
+        )
+
+        log.setLevel(logging.CRITICAL)
+        try:
+            expected = [
+                translator.translate_block(block, block_entity)
+                for block, block_entity in zip(palette, block_entities)
+            ]
+            jobs = [
+                BatchJob(palette, block_entities, source, destination),
+                BatchJob(palette[:20], None, ("java", (1, 12, 2)), destination),
+                BatchJob([], None, source, destination),
+            ]
+            with BatchTranslator(
+                self._translation_manager, processes=1
+            ) as batch_translator:
+                results = list(batch_translator.translate(jobs))
+                results += list(batch_translator.translate(jobs[1:2]))
+                # the repeated palette is served from the parent process cache
+                self.assertLess(0, batch_translator.cache_info().hits)
+        finally:
+            log.setLevel(logging.INFO)
+
+        self.assertEqual(4, len(results))
+        for result, palette_size in zip(results, (len(palette), 20, 0, 20)):
+            self.assertEqual(palette_size, len(result.blocks))
+            self.assertEqual(palette_size, len(result.block_entities))
+            self.assertEqual(palette_size, len(result.extra_needed))
+            for (
+                block,
+                block_entity,
+                extra_needed,
+                (
+                    expected_block,
+                    expected_block_entity,
+                    expected_extra_needed,
+                ),
+            ) in zip(
+                result.blocks, result.block_entities, result.extra_needed, expected
+            ):
+                self.assertEqual(expected_block, block)
+                self.assertEqual(repr(expected_block_entity), repr(block_entity))
+                self.assertEqual(expected_extra_needed, extra_needed)
+
+    def test_in_flight(self):
+        source = self._translation_manager.get_version("java", (1, 12, 2))
+        destination = self._translation_manager.get_version("bedrock", (1, 21, 0))
+        palette = [source.block.ints_to_block(block_id, 0) for block_id in range(20)]
+        job = BatchJob(palette, None, source, destination)
+        log.setLevel(logging.CRITICAL)
+        try:
+            with BatchTranslator(
+                self._translation_manager, processes=1
+            ) as batch_translator:
+                in_flight = {}
+                first = batch_translator._submit(job, in_flight)
+                # the blocks the first job is translating are not sent again
+                second = batch_translator._submit(job, in_flight)
+                self.assertEqual(20, len(first.requests))
+                self.assertEqual([], second.requests)
+                self.assertEqual(20, len(second.dependencies))
+                first_result = batch_translator._collect(first, in_flight)
+                self.assertEqual({}, in_flight)
+                second_result = batch_translator._collect(second, in_flight)
+        finally:
+            log.setLevel(logging.INFO)
+        self.assertEqual(first_result.blocks, second_result.blocks)
+        self.assertEqual(first_result.extra_needed, second_result.extra_needed)
+
+
+if __name__ == "__main__":
+    unittest.main()
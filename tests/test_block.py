@@ -0,0 +1,47 @@
+import unittest
+import pickle
+
+from amulet_nbt import StringTag, IntTag
+
+from PyMCTranslate.py3.api import Block
+
+
+class BlockTestCase(unittest.TestCase):
+    def test_hash(self):
+        block = Block(
+            "minecraft",
+            "oak_stairs",
+            {"facing": StringTag("north"), "half": StringTag("top")},
+        )
+        # property order does not matter
+        same = Block(
+            "minecraft",
+            "oak_stairs",
+            {"half": StringTag("top"), "facing": StringTag("north")},
+        )
+        self.assertEqual(block, same)
+        self.assertEqual(hash(block), hash(same))
+        self.assertEqual(hash(block), hash(block))
+
+        self.assertNotEqual(
+            hash(Block("minecraft", "a", {"x": StringTag("1")})),
+            hash(Block("minecraft", "a", {"x": IntTag(1)})),
+        )
+        water = Block("minecraft", "water", {"level": StringTag("0")})
+        self.assertEqual(hash(block + water), hash(same + water))
+        self.assertNotEqual(hash(block), hash(block + water))
+        self.assertNotEqual(block, block + water)
+
+        blocks = {block: 1}
+        self.assertEqual(1, blocks[same])
+
+    def test_pickle(self):
+        block = Block("minecraft", "stone", {"x": StringTag("1")})
+        hash(block)
+        loaded = pickle.loads(pickle.dumps(block))
+        self.assertEqual(block, loaded)
+        self.assertEqual(hash(block), hash(loaded))
+
+
+if __name__ == "__main__":
+    unittest.main()
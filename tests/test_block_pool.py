@@ -0,0 +1,90 @@
+import unittest
+import os
+import tempfile
+
+import numpy
+from amulet_nbt import StringTag
+
+import PyMCTranslate
+from PyMCTranslate.py3.api import Block, BlockPool
+
+
+class BlockPoolTestCase(unittest.TestCase):
+    def test_intern(self):
+        pool = BlockPool()
+        stone = Block("minecraft", "stone")
+        self.assertIs(stone, pool.intern(stone))
+        self.assertIs(stone, pool.intern(Block("minecraft", "stone")))
+        self.assertIn(Block("minecraft", "stone"), pool)
+        self.assertEqual(1, len(pool))
+
+        water = Block("minecraft", "water", {"level": StringTag("0")})
+        palette = numpy.array(
+            [Block("minecraft", "stone"), water, Block("minecraft", "stone")],
+            dtype=object,
+        )
+        interned = pool.intern_many(palette)
+        self.assertEqual(palette.shape, interned.shape)
+        self.assertIs(stone, interned[0])
+        self.assertIs(water, interned[1])
+        self.assertIs(stone, interned[2])
+        pool.clear()
+        self.assertEqual(0, len(pool))
+
+    @unittest.skipUnless(
+        hasattr(Block, "intern"), "The Block class from amulet is being used"
+    )
+    def test_block_intern(self):
+        pool = BlockPool()
+        stone = Block("minecraft", "stone").intern(pool)
+        self.assertIs(stone, Block("minecraft", "stone").intern(pool))
+        self.assertEqual(stone, stone)
+        self.assertIn(stone, pool)
+        self.assertEqual(1, len(pool))
+
+        # each pool has its own instances
+        other_pool = BlockPool()
+        self.assertIsNot(stone, Block("minecraft", "stone").intern(other_pool))
+
+    def test_translation_manager(self):
+        translation_manager = PyMCTranslate.new_translation_manager(intern_blocks=True)
+        self.assertIsNone(PyMCTranslate.new_translation_manager().block_pool)
+        version = translation_manager.get_version("java", (1, 12, 2))
+        outputs = [
+            version.block.to_universal(
+                version.block.ints_to_block(block_id, block_data)
+            )[0]
+            for block_id, block_data in ((1, 0), (5, 0), (1, 0))
+        ]
+        for output in outputs:
+            self.assertIs(output, translation_manager.block_pool.intern(output))
+        # the same universal block from another version is the same instance
+        java_1_13 = translation_manager.get_version("java", (1, 13, 2))
+        self.assertIs(
+            outputs[0],
+            java_1_13.block.to_universal(Block("minecraft", "stone"))[0],
+        )
+
+    def test_persistent_cache(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "cache.json.gz")
+            translation_manager = PyMCTranslate.new_translation_manager(
+                cache_path=path
+            )
+            translation_manager.get_version("java", (1, 12, 2)).block.to_universal(
+                Block("minecraft", "stone")
+            )
+            translation_manager.save_cache()
+
+            translation_manager = PyMCTranslate.new_translation_manager(
+                cache_path=path, intern_blocks=True
+            )
+            version = translation_manager.get_version("java", (1, 12, 2))
+            # the stored outputs are interned when the translator is created
+            self.assertTrue(len(translation_manager.block_pool))
+            output = version.block.to_universal(Block("minecraft", "stone"))[0]
+            self.assertIn(output, translation_manager.block_pool)
+
+
+if __name__ == "__main__":
+    unittest.main()
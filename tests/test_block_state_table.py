@@ -0,0 +1,85 @@
+import unittest
+
+from amulet_nbt import StringTag
+
+import PyMCTranslate
+from PyMCTranslate.py3.api import Block
+from PyMCTranslate.py3.api.version.translators.block_state_table import (
+    BlockStateTable,
+)
+
+
+class BlockStateTableTestCase(unittest.TestCase):
+    def test_table(self):
+        table = BlockStateTable.from_specifications(
+            [
+                (
+                    "b",
+                    "stairs",
+                    {"half": ['"top"', '"bottom"'], "facing": ['"n"', '"s"', '"e"']},
+                ),
+                ("a", "stone", {}),
+            ]
+        )
+        self.assertEqual(7, table.state_count)
+        self.assertEqual(Block("a", "stone"), table.get_state(0))
+        # properties are ordered by name and the last property changes fastest
+        self.assertEqual(
+            Block(
+                "b", "stairs", {"facing": StringTag("n"), "half": StringTag("bottom")}
+            ),
+            table.get_state(2),
+        )
+        for state_id in range(table.state_count):
+            self.assertEqual(state_id, table.get_state_id(table.get_state(state_id)))
+
+        with self.assertRaises(IndexError):
+            table.get_state(7)
+        for block in (
+            Block("a", "dirt"),
+            Block("b", "stairs", {"facing": StringTag("n")}),
+            Block("b", "stairs", {"facing": StringTag("w"), "half": StringTag("top")}),
+            Block("a", "stone", extra_blocks=[Block("a", "stone")]),
+        ):
+            with self.assertRaises(KeyError):
+                table.get_state_id(block)
+
+    def test_universal(self):
+        translation_manager = PyMCTranslate.new_translation_manager()
+        universal = translation_manager.universal_format.block
+        self.assertLess(0, universal.state_count)
+        for state_id in range(0, universal.state_count, 7):
+            self.assertEqual(
+                state_id, universal.get_state_id(universal.get_state(state_id))
+            )
+
+        block, _, _ = translation_manager.get_version(
+            "java", (1, 20, 4)
+        ).block.to_universal(Block("minecraft", "oak_log", {"axis": StringTag("x")}))
+        self.assertEqual(block, universal.get_state(universal.get_state_id(block)))
+
+    def test_deterministic(self):
+        # the layout only depends on the specifications so it is the same in every process
+        tables = [
+            PyMCTranslate.new_translation_manager().universal_format.block.state_table
+            for _ in range(2)
+        ]
+        self.assertEqual(tables[0].layout, tables[1].layout)
+
+        specifications = [
+            ("b", "stairs", {"half": ['"top"', '"bottom"'], "facing": ['"n"', '"s"']}),
+            ("a", "stone", {}),
+        ]
+        self.assertEqual(
+            BlockStateTable.from_specifications(specifications).layout,
+            BlockStateTable.from_specifications(
+                [
+                    (namespace, base_name, dict(reversed(properties.items())))
+                    for namespace, base_name, properties in reversed(specifications)
+                ]
+            ).layout,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import os
+import json
+import tempfile
+
+from PyMCTranslate.py3.meta import build_number
+from PyMCTranslate.py3.util.build_data import (
+    load_build_data,
+    save_build_data,
+    get_build_data,
+)
+
+
+class BuildDataTestCase(unittest.TestCase):
+    def test_build_data(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "data.json")
+            builds = []
+
+            def build():
+                builds.append(None)
+                return [1, 2]
+
+            self.assertIsNone(load_build_data(path, "data"))
+            # the data is built in memory when the file does not exist
+            self.assertEqual(
+                frozenset((1, 2)), get_build_data(path, "data", build, frozenset)
+            )
+            self.assertEqual(1, len(builds))
+            self.assertFalse(os.path.exists(path))
+
+            save_build_data(path, "data", [1, 2])
+            self.assertEqual([1, 2], load_build_data(path, "data"))
+            self.assertEqual([1, 2], get_build_data(path, "data", build))
+            self.assertEqual(1, len(builds))
+
+            # the data is built again when it is not valid
+            self.assertEqual(
+                [1, 2],
+                get_build_data(path, "data", build, is_valid=lambda data: False),
+            )
+            self.assertEqual(2, len(builds))
+
+            # the data is built again when it was written by a different build
+            with open(path, "w") as f:
+                json.dump({"build_number": None, "data": [3]}, f)
+            self.assertIsNone(load_build_data(path, "data"))
+            self.assertEqual([1, 2], get_build_data(path, "data", build))
+            self.assertEqual(3, len(builds))
+
+            save_build_data(path, "data", [4])
+            with open(path) as f:
+                self.assertEqual({"build_number": build_number, "data": [4]}, json.load(f))
+            # the temporary file is moved into place
+            self.assertEqual(["data.json"], os.listdir(temp_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+
+import numpy
+
+import PyMCTranslate
+from PyMCTranslate.py3.api import Block
+
+
+def _comparable(output, extra_output, extra_needed):
+    # BlockEntity does not implement __eq__ so compare the string form.
+    return output, repr(extra_output), extra_needed
+
+
+class BulkTranslationTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._translation_manager = PyMCTranslate.new_translation_manager()
+
+    def test_block_many(self):
+        version = self._translation_manager.get_version("java", (1, 20, 4))
+        palette = []
+        for namespace in version.block.namespaces(True):
+            for base_name in version.block.base_names(namespace, True):
+                spec = version.block.get_specification(namespace, base_name, True)
+                palette.append(
+                    Block(namespace, base_name, dict(spec.default_properties))
+                )
+        # duplicate entries must be translated the same as the first
+        palette = palette + palette[::-1]
+
+        outputs, extra_outputs, extra_needed = version.block.to_universal_many(
+            palette, force_blockstate=True
+        )
+        self.assertEqual(outputs.shape, (len(palette),))
+        for block, output, extra_output, needed in zip(
+            palette, outputs, extra_outputs, extra_needed
+        ):
+            self.assertEqual(
+                _comparable(*version.block.to_universal(block, force_blockstate=True)),
+                _comparable(output, extra_output, needed),
+            )
+
+        universal = outputs[:12].reshape(3, 4)
+        outputs, extra_outputs, extra_needed = version.block.from_universal_many(
+            universal, force_blockstate=True
+        )
+        self.assertEqual(outputs.shape, (3, 4))
+        self.assertEqual(extra_needed.dtype, bool)
+        for block, output, extra_output, needed in zip(
+            universal.ravel(),
+            outputs.ravel(),
+            extra_outputs.ravel(),
+            extra_needed.ravel(),
+        ):
+            self.assertEqual(
+                _comparable(
+                    *version.block.from_universal(block, force_blockstate=True)
+                ),
+                _comparable(output, extra_output, needed),
+            )
+
+    def test_ints_to_blocks(self):
+        version = self._translation_manager.get_version("java", (1, 12, 2))
+        generator = numpy.random.default_rng(0)
+        block_ids = generator.integers(-2, 300, (16, 16, 16))
+        block_data = generator.integers(0, 20, (16, 16, 16))
+        palette, inverse = version.block.ints_to_blocks(block_ids, block_data)
+        self.assertEqual(inverse.shape, block_ids.shape)
+        self.assertEqual(len(palette), len(set(palette)))
+        for block_id, data, block in zip(
+            block_ids.ravel().tolist(),
+            block_data.ravel().tolist(),
+            palette[inverse].ravel(),
+        ):
+            self.assertEqual(version.block.ints_to_block(block_id, data), block)
+
+        palette_ids, palette_data = version.block.blocks_to_ints(palette)
+        numpy.testing.assert_array_equal(palette_ids[inverse], block_ids)
+        numpy.testing.assert_array_equal(palette_data[inverse], block_data)
+
+        palette_ids, palette_data = version.block.blocks_to_ints(
+            [Block("custom", "block")]
+        )
+        numpy.testing.assert_array_equal(palette_ids, [-1])
+        numpy.testing.assert_array_equal(palette_data, [-1])
+
+    def test_biome_arrays(self):
+        version = self._translation_manager.get_version("java", (1, 12, 2))
+        biome_ints = numpy.array(
+            sorted(
+                version.biome.pack(biome)
+                for biome in version.biome.biome_ids
+                if version.biome._biome_str_to_int.get(biome) is not None
+            )
+        )
+        # include a value that is not defined
+        biome_ints = numpy.append(biome_ints, 1000).reshape(-1, 1).repeat(4, 1)
+
+        biomes = version.biome.unpack_array(biome_ints)
+        self.assertEqual(biomes.shape, biome_ints.shape)
+        self.assertEqual(
+            biomes.ravel().tolist(),
+            [version.biome.unpack(biome) for biome in biome_ints.ravel().tolist()],
+        )
+        universal = version.biome.to_universal_array(biomes)
+        self.assertEqual(
+            universal.ravel().tolist(),
+            [version.biome.to_universal(biome) for biome in biomes.ravel()],
+        )
+        biomes = version.biome.from_universal_array(universal)
+        self.assertEqual(
+            biomes.ravel().tolist(),
+            [version.biome.from_universal(biome) for biome in universal.ravel()],
+        )
+        numpy.testing.assert_array_equal(
+            version.biome.pack_array(biomes),
+            [[version.biome.pack(biome) for biome in row] for row in biomes],
+        )
+
+        self._translation_manager.biome_registry.register("custom:biome", 1000)
+        self.assertEqual(version.biome.unpack_array(biome_ints)[-1, 0], "custom:biome")
+        # the pack table is rebuilt when the registry changes
+        self.assertEqual(
+            version.biome.pack_array(numpy.array(["custom:biome"], dtype=object)).tolist(),
+            [1000],
+        )
+
+        # large ids must not need a table that large
+        self._translation_manager.biome_registry.register("custom:large_biome", 2**40)
+        self.assertEqual(
+            version.biome.unpack_array(numpy.array([2**40, 1000])).tolist(),
+            ["custom:large_biome", "custom:biome"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import functools
+import os
+import tempfile
+
+import PyMCTranslate
+from PyMCTranslate.py3.util.cache import (
+    UnboundedCache,
+    LRUCache,
+    SizedLRUCache,
+    CacheInfo,
+)
+
+
+class CacheTestCase(unittest.TestCase):
+    def test_unbounded(self):
+        cache = UnboundedCache()
+        self.assertIsNone(cache.get("a"))
+        cache["a"] = 1
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.info(), CacheInfo(1, 1, 0, 1, 1, None))
+
+    def test_lru(self):
+        cache = LRUCache(2)
+        cache["a"] = 1
+        cache["b"] = 2
+        # a is now the most recently used
+        self.assertEqual(cache.get("a"), 1)
+        cache["c"] = 3
+        self.assertNotIn("b", cache)
+        self.assertIn("a", cache)
+        self.assertIn("c", cache)
+        self.assertEqual(cache.info(), CacheInfo(1, 0, 1, 2, 2, 2))
+
+    def test_sized_lru(self):
+        cache = SizedLRUCache(10, lambda key, value: value)
+        cache["a"] = 4
+        cache["b"] = 4
+        cache["a"] = 5
+        self.assertEqual(cache.size, 9)
+        cache["c"] = 3
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.info(), CacheInfo(0, 0, 1, 2, 8, 10))
+
+    def test_translation_manager(self):
+        translation_manager = PyMCTranslate.new_translation_manager(
+            functools.partial(LRUCache, 10)
+        )
+        version = translation_manager.get_version("java", (1, 12, 2))
+        for block_id in range(1, 30):
+            version.block.to_universal(version.block.ints_to_block(block_id, 0))
+        version.block.to_universal(version.block.ints_to_block(29, 0))
+        info = version.block.cache_info()[("to_universal", False)]
+        self.assertEqual(info.entries, 10)
+        self.assertEqual(info.hits, 1)
+        self.assertGreater(info.evictions, 0)
+        self.assertEqual(translation_manager.cache_info().hits, 1)
+
+    def test_block_to_ints(self):
+        translation_manager = PyMCTranslate.new_translation_manager(
+            functools.partial(LRUCache, 2)
+        )
+        version = translation_manager.get_version("java", (1, 12, 2))
+        palette = [version.block.ints_to_block(block_id, 0) for block_id in range(1, 5)]
+        version.block.blocks_to_ints(palette)
+        info = version.block.cache_info()[("block_to_ints", False)]
+        self.assertEqual(info.entries, 2)
+        self.assertEqual(info.misses, 4)
+        self.assertEqual(info.evictions, 2)
+
+    def test_translate_many(self):
+        translation_manager = PyMCTranslate.new_translation_manager()
+        version = translation_manager.get_version("java", (1, 12, 2))
+        palette = [version.block.ints_to_block(block_id, 0) for block_id in range(1, 5)]
+        version.block.to_universal_many(palette + palette)
+        info = version.block.cache_info()[("to_universal", False)]
+        self.assertEqual(info.misses, 4)
+        self.assertEqual(info.hits, 0)
+        version.block.to_universal_many(palette)
+        info = version.block.cache_info()[("to_universal", False)]
+        self.assertEqual(info.misses, 4)
+        self.assertEqual(info.hits, 4)
+
+    def test_persistent_cache(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "cache.json.gz")
+            translation_manager = PyMCTranslate.new_translation_manager(cache_path=path)
+            version = translation_manager.get_version("java", (1, 12, 2))
+            blocks = [version.block.ints_to_block(block_id, 0) for block_id in (1, 35)]
+            expected = [repr(version.block.to_universal(block)) for block in blocks]
+            translation_manager.save_cache()
+            self.assertTrue(os.path.isfile(path))
+
+            translation_manager = PyMCTranslate.new_translation_manager(cache_path=path)
+            version = translation_manager.get_version("java", (1, 12, 2))
+            self.assertEqual(
+                expected, [repr(version.block.to_universal(block)) for block in blocks]
+            )
+            info = version.block.cache_info()[("to_universal", False)]
+            self.assertEqual(info.hits, 2)
+            self.assertEqual(info.misses, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
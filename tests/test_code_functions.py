@@ -0,0 +1,30 @@
+import unittest
+
+from amulet_nbt import CompoundTag
+
+from PyMCTranslate.py3.api.version import code_functions
+
+
+class CodeFunctionsTestCase(unittest.TestCase):
+    def test_run(self):
+        # the module is imported when the function is first run
+        code_functions.code_functions.pop("bedrock_moving_block_pos_2u", None)
+        self.assertEqual(
+            [],
+            code_functions.run(
+                "bedrock_moving_block_pos_2u", [CompoundTag(), (0, 0, 0)]
+            ),
+        )
+        self.assertIn("bedrock_moving_block_pos_2u", code_functions.code_functions)
+        with self.assertRaises(KeyError):
+            code_functions.run("missing_function", [])
+
+    def test_register(self):
+        code_functions.register("test_register_function", lambda a, b: a + b)
+        self.assertEqual(3, code_functions.run("test_register_function", [1, 2]))
+        with self.assertRaises(TypeError):
+            code_functions.register("test_register_function", None)
+
+
+if __name__ == "__main__":
+    unittest.main()
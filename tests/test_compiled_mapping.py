@@ -0,0 +1,152 @@
+import unittest
+import itertools
+from typing import Generator, Tuple, Any, Optional
+import logging
+
+import amulet_nbt
+import PyMCTranslate
+from PyMCTranslate.py3.api import Block, BlockEntity, Entity
+from PyMCTranslate.py3.api.version.translate import translate
+
+log = logging.getLogger("PyMCTranslate")
+
+
+def _result(
+    block: Block,
+    spec: dict,
+    mapping: Any,
+    version: PyMCTranslate.Version,
+    force_blockstate: bool,
+    **kwargs,
+) -> Tuple[Any, ...]:
+    """Run the translation and convert the result into something that can be compared."""
+    try:
+        output, extra_output, extra_needed, cacheable = translate(
+            block,
+            spec,
+            mapping,
+            version,
+            force_blockstate,
+            block_location=(0, 0, 0),
+            **kwargs,
+        )
+    except Exception as e:
+        return "error", str(e)
+    if isinstance(output, Entity):
+        output = (output.namespaced_name, output.nbt.to_snbt())
+    else:
+        output = str(output)
+    if extra_output is not None:
+        extra_output = (extra_output.namespaced_name, extra_output.nbt.to_snbt())
+    return output, extra_output, extra_needed, cacheable
+
+
+class CompiledMappingTestCase(unittest.TestCase):
+    """Check that the compiled mappings give the same result as the interpreter."""
+
+    @staticmethod
+    def _blockstates(
+        specification: dict, namespace: str, base_name: str
+    ) -> Generator[Block, None, None]:
+        properties = specification.get("properties", {})
+        keys = list(properties)
+        values = [
+            [amulet_nbt.from_snbt(val) for val in properties[key]] for key in keys
+        ]
+        for index, property_values in enumerate(itertools.product(*values)):
+            if index >= 64:
+                break
+            yield Block(namespace, base_name, dict(zip(keys, property_values)))
+
+    @staticmethod
+    def _block_entity(specification: dict) -> Optional[BlockEntity]:
+        if "snbt" in specification:
+            namespace, base_name = specification["nbt_identifier"]
+            return BlockEntity(
+                namespace,
+                base_name,
+                0,
+                0,
+                0,
+                amulet_nbt.NamedTag(amulet_nbt.from_snbt(specification["snbt"])),
+            )
+        return None
+
+    def _test_version(self, version: PyMCTranslate.Version):
+        log.setLevel(logging.CRITICAL)
+        blocks = version.block
+        universal_blocks = version._translation_manager.universal_format.block
+        for force_blockstate in (
+            [False, True] if version.has_abstract_format else [True]
+        ):
+            for direction, input_blocks, output_version in (
+                ("to_universal", blocks, version._translation_manager.universal_format),
+                ("from_universal", universal_blocks, version),
+            ):
+                if direction == "to_universal":
+                    input_force_blockstate = force_blockstate
+                    output_force_blockstate = True
+                else:
+                    input_force_blockstate = False
+                    output_force_blockstate = force_blockstate
+                for namespace in input_blocks.namespaces(input_force_blockstate):
+                    for base_name in input_blocks.base_names(
+                        namespace, input_force_blockstate
+                    ):
+                        try:
+                            compiled = blocks._get_compiled_mapping(
+                                direction, namespace, base_name, force_blockstate
+                            )
+                        except KeyError:
+                            continue
+                        spec = input_blocks._get_raw_specification(
+                            namespace, base_name, input_force_blockstate
+                        )
+                        block_entity = self._block_entity(spec)
+                        for block in self._blockstates(spec, namespace, base_name):
+                            for kwargs in (
+                                {},
+                                {
+                                    "get_block_callback": lambda _, b=block: (
+                                        b,
+                                        block_entity,
+                                    )
+                                },
+                            ):
+                                self.assertEqual(
+                                    _result(
+                                        block,
+                                        spec,
+                                        compiled.mappings,
+                                        output_version,
+                                        output_force_blockstate,
+                                        **kwargs,
+                                    ),
+                                    _result(
+                                        block,
+                                        spec,
+                                        compiled,
+                                        output_version,
+                                        output_force_blockstate,
+                                        **kwargs,
+                                    ),
+                                    (version, direction, force_blockstate, block),
+                                )
+        log.setLevel(logging.INFO)
+
+    def test_compiled_mapping(self):
+        translation_manager = PyMCTranslate.new_translation_manager()
+        for platform, version_number in (
+            ("java", (1, 12, 2)),
+            ("java", (1, 20, 4)),
+            ("bedrock", (1, 7, 0)),
+            ("bedrock", (1, 21, 0)),
+        ):
+            with self.subTest(platform=platform, version_number=version_number):
+                self._test_version(
+                    translation_manager.get_version(platform, version_number)
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
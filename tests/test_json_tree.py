@@ -0,0 +1,54 @@
+import unittest
+import os
+import json
+import tempfile
+
+from PyMCTranslate.py3.util.json_tree import load_json_tree
+
+
+class JsonTreeTestCase(unittest.TestCase):
+    def test_load_json_tree(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = os.path.join(temp_dir, "block")
+            cache_path = os.path.join(temp_dir, "cache", "block.json")
+            for base_name, data in (("stone", 1), ("dirt", [2])):
+                path = os.path.join(
+                    root, "blockstate", "specification", "minecraft", "vanilla"
+                )
+                os.makedirs(path, exist_ok=True)
+                with open(os.path.join(path, f"{base_name}.json"), "w") as f:
+                    json.dump(data, f)
+
+            expected = {
+                "blockstate": {
+                    "specification": {"minecraft": {"dirt": [2], "stone": 1}}
+                }
+            }
+            self.assertEqual(expected, load_json_tree(root))
+            self.assertEqual(expected, load_json_tree(root, cache_path))
+            self.assertTrue(os.path.isfile(cache_path))
+            self.assertEqual(expected, load_json_tree(root, cache_path))
+
+            # the cache must be rebuilt when a file changes
+            path = os.path.join(
+                root, "blockstate", "specification", "minecraft", "vanilla", "dirt.json"
+            )
+            with open(path, "w") as f:
+                json.dump([2, 3], f)
+            os.utime(path, ns=(0, 0))
+            expected["blockstate"]["specification"]["minecraft"]["dirt"] = [2, 3]
+            self.assertEqual(expected, load_json_tree(root, cache_path))
+
+            # a corrupted cache file must be ignored
+            with open(cache_path, "r+b") as f:
+                f.seek(-1, os.SEEK_END)
+                last = f.read(1)
+                f.seek(-1, os.SEEK_END)
+                f.write(bytes([last[0] ^ 1]))
+            self.assertEqual(expected, load_json_tree(root, cache_path))
+
+            self.assertEqual({}, load_json_tree(os.path.join(temp_dir, "missing")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import os
+import sys
+import json
+import tempfile
+import contextlib
+import io
+
+from PyMCTranslate.py3.util.mapped_database import MappedDatabase
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__)), "build_tools"))
+
+from minify_json import minify_json
+
+
+class MappedDatabaseTestCase(unittest.TestCase):
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            version_path = os.path.join(temp_dir, "json", "versions", "java_1_0_0")
+            os.makedirs(version_path)
+            init = {"platform": "java", "version": [1, 0, 0]}
+            with open(os.path.join(version_path, "__init__.json"), "w") as f:
+                json.dump(init, f)
+            for base_name, data in (
+                ("stone", {"properties": {"a": ["1"]}}),
+                ("dirt", [2]),
+                ("grass", {"properties": {"a": ["1"]}}),
+            ):
+                path = os.path.join(
+                    version_path,
+                    "block",
+                    "blockstate",
+                    "specification",
+                    "minecraft",
+                    "vanilla",
+                )
+                os.makedirs(path, exist_ok=True)
+                with open(os.path.join(path, f"{base_name}.json"), "w") as f:
+                    json.dump(data, f)
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                minify_json(temp_dir, processes=1)
+            database = MappedDatabase(
+                os.path.join(temp_dir, "min_json", "database.bin")
+            )
+            try:
+                self.assertEqual(["java_1_0_0"], list(database.keys()))
+                version = database["java_1_0_0"]
+                self.assertEqual(init, version["meta"]["__init__"])
+                specification = version["block"]["blockstate"]["specification"][
+                    "minecraft"
+                ]
+                self.assertEqual(["dirt", "grass", "stone"], list(specification))
+                self.assertEqual([2], specification["dirt"])
+                self.assertEqual({"properties": {"a": ["1"]}}, specification["stone"])
+                # identical entries are stored once
+                self.assertIs(specification["stone"], specification["grass"])
+                self.assertNotIn("entity", version)
+            finally:
+                database.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import unittest
+from unittest import mock
+import itertools
+import os
+import json
+import tempfile
+from math import cos, sin, radians
+
+import numpy
+from amulet_nbt import StringTag
+
+import PyMCTranslate
+from PyMCTranslate.py3.api import Block
+from PyMCTranslate.py3.api.rotate import RotateMode
+from PyMCTranslate.py3.api.rotate import rotate, axis_state
+from PyMCTranslate.py3.api.rotate.rotate import (
+    axis_aligned_key,
+    find_block_shapes,
+    load_block_shapes,
+)
+
+
+def _axis_aligned_transforms():
+    for permutation in itertools.permutations(range(3)):
+        for signs in itertools.product((1, -1), repeat=3):
+            transform = numpy.eye(4)
+            transform[:3, :3] = 0
+            for row, (column, sign) in enumerate(zip(permutation, signs)):
+                transform[row, column] = sign
+            yield transform
+
+
+def _y_rotation(angle: float) -> numpy.ndarray:
+    angle = radians(angle)
+    transform = numpy.eye(4)
+    transform[0, 0] = transform[2, 2] = cos(angle)
+    transform[0, 2] = sin(angle)
+    transform[2, 0] = -sin(angle)
+    return transform
+
+
+class RotateTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._translation_manager = PyMCTranslate.new_translation_manager()
+
+    def test_axis_aligned_key(self):
+        transforms = list(_axis_aligned_transforms())
+        keys = {axis_aligned_key(transform) for transform in transforms}
+        self.assertEqual(48, len(keys))
+        self.assertNotIn(None, keys)
+        # floating point error from the trigonometry is allowed
+        self.assertEqual(
+            (0, 0, 1, 0, 1, 0, -1, 0, 0), axis_aligned_key(_y_rotation(90))
+        )
+        self.assertIsNone(axis_aligned_key(_y_rotation(30)))
+        self.assertIsNone(axis_aligned_key(numpy.eye(4) * 2))
+
+    def test_transform(self):
+        universal = self._translation_manager.universal_format.block
+        rotation_manager = self._translation_manager.rotation_manager
+        blocks = [
+            universal.get_state(state_id)
+            for state_id in range(universal.state_count)
+            if universal.get_state(state_id).namespaced_name
+            in rotation_manager._block_shapes
+        ][::50]
+        for transform in _axis_aligned_transforms():
+            transform_key = axis_aligned_key(transform)
+            for mode in (RotateMode.Exact, RotateMode.Nearest):
+                # the tables must match the vector search
+                with mock.patch.object(
+                    rotate, "axis_aligned_key", return_value=None
+                ), mock.patch.object(axis_state, "axis_aligned_key", return_value=None):
+                    expected = [
+                        rotation_manager._block_shapes[block.namespaced_name].transform(
+                            block, transform, mode
+                        )
+                        for block in blocks
+                    ]
+                for block, expected_block in zip(blocks, expected):
+                    self.assertEqual(
+                        expected_block,
+                        rotation_manager._block_shapes[
+                            block.namespaced_name
+                        ].transform_axis_aligned(block, transform, transform_key, mode),
+                    )
+
+    def test_transform_palette(self):
+        universal = self._translation_manager.universal_format.block
+        water = Block("universal_minecraft", "water", {"falling": StringTag("false")})
+        palette = [universal.get_state(state_id) for state_id in range(0, 2000, 7)]
+        palette += [block + water for block in palette[:20]]
+        palette = numpy.array(palette + palette, dtype=object).reshape(2, -1)
+        for transform in (_y_rotation(90), _y_rotation(30), _y_rotation(180)):
+            for mode in RotateMode:
+                for _ in range(2):
+                    (
+                        transformed,
+                        mapping,
+                    ) = self._translation_manager.transform_universal_palette(
+                        palette, transform, mode
+                    )
+                    self.assertEqual(palette.shape, transformed.shape)
+                    self.assertEqual(len(set(palette.ravel())), len(mapping))
+                    for block, transformed_block in zip(
+                        palette.ravel(), transformed.ravel()
+                    ):
+                        self.assertIs(mapping[block], transformed_block)
+                        self.assertEqual(
+                            self._translation_manager.transform_universal_block(
+                                block, transform, mode
+                            ),
+                            transformed_block,
+                        )
+
+    def test_block_shapes(self):
+        translation_manager = PyMCTranslate.new_translation_manager()
+        # the rotation manager is only created when it is needed
+        self.assertIsNone(translation_manager._rotation_manger)
+        translation_manager.rotation_manager
+        self.assertIsNotNone(translation_manager._rotation_manger)
+
+        # the shipped table must match the specifications
+        self.assertEqual(
+            find_block_shapes(translation_manager.universal_format),
+            load_block_shapes(),
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "block_shapes.json")
+            self.assertIsNone(load_block_shapes(path))
+            with open(path, "w") as f:
+                json.dump({"build_number": None, "block_shapes": {}}, f)
+            self.assertIsNone(load_block_shapes(path))
+
+    def test_exact_rail(self):
+        rail = Block("universal_minecraft", "rail", {"shape": StringTag("north_south")})
+        for transform, shape in (
+            (_y_rotation(90), "east_west"),
+            (_y_rotation(30), "north_south"),
+        ):
+            block = self._translation_manager.transform_universal_block(
+                rail, transform, RotateMode.Exact
+            )
+            self.assertEqual(StringTag(shape), block.properties["shape"])
+
+
+if __name__ == "__main__":
+    unittest.main()
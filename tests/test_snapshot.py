@@ -0,0 +1,53 @@
+import unittest
+import pickle
+import multiprocessing
+
+import PyMCTranslate
+from PyMCTranslate.py3.api import Block, TranslationManagerSnapshot
+
+
+def _translate(snapshot: TranslationManagerSnapshot) -> str:
+    translation_manager = snapshot.load()
+    version = translation_manager.get_version("java", (1, 20, 4))
+    return repr(version.block.to_universal(Block("minecraft", "oak_stairs", {})))
+
+
+class SnapshotTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._translation_manager = PyMCTranslate.new_translation_manager()
+        version = cls._translation_manager.get_version("java", (1, 20, 4))
+        cls._expected = repr(
+            version.block.to_universal(Block("minecraft", "oak_stairs", {}))
+        )
+        cls._translation_manager.block_registry.register("minecraft:stone", 1)
+
+    def test_pickle(self):
+        translation_manager = pickle.loads(pickle.dumps(self._translation_manager))
+        version = translation_manager.get_version("java", (1, 20, 4))
+        # the warmed cache is included
+        self.assertEqual(1, version.block.cache_info()[("to_universal", False)].entries)
+        self.assertEqual(
+            self._expected,
+            repr(version.block.to_universal(Block("minecraft", "oak_stairs", {}))),
+        )
+        # the registries are local to each copy
+        self.assertEqual([], list(translation_manager.block_registry))
+        self.assertEqual(
+            [(1, "minecraft:stone")], list(self._translation_manager.block_registry)
+        )
+
+    def test_snapshot(self):
+        with self._translation_manager.snapshot() as snapshot:
+            snapshot_ = pickle.loads(pickle.dumps(snapshot))
+            self.assertEqual(snapshot.name, snapshot_.name)
+            translation_manager = snapshot_.load()
+            self.assertIsNot(translation_manager, self._translation_manager)
+            self.assertIs(translation_manager, snapshot_.load())
+
+            with multiprocessing.get_context("spawn").Pool(1) as pool:
+                self.assertEqual([self._expected], pool.map(_translate, [snapshot]))
+
+
+if __name__ == "__main__":
+    unittest.main()
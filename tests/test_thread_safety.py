@@ -0,0 +1,61 @@
+import unittest
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+import PyMCTranslate
+from PyMCTranslate.py3.util.cache import LRUCache
+
+log = logging.getLogger("PyMCTranslate")
+
+Versions = [("java", (1, 12, 2)), ("java", (1, 20, 4)), ("bedrock", (1, 21, 0))]
+
+
+def _translate_all(translation_manager, thread_index: int):
+    source = translation_manager.get_version("java", 1343)
+    results = []
+    for index in range(len(Versions)):
+        platform, version_number = Versions[(index + thread_index) % len(Versions)]
+        destination = translation_manager.get_version(platform, version_number)
+        translator = translation_manager.get_translator(source, destination)
+        for block_id in range(0, 256, 3):
+            for block_data in range(4):
+                block = source.block.ints_to_block(block_id, block_data)
+                results.append(
+                    (
+                        platform,
+                        version_number,
+                        block,
+                        translator.translate_block(block),
+                        destination.biome.unpack(block_id),
+                    )
+                )
+    results.sort(key=repr)
+    return [repr(result) for result in results]
+
+
+class ThreadSafetyTestCase(unittest.TestCase):
+    def test_threaded_translation(self):
+        log.setLevel(logging.CRITICAL)
+        try:
+            expected = _translate_all(PyMCTranslate.new_translation_manager(), 0)
+            # A small cache so that entries are evicted while other threads are using it
+            translation_manager = PyMCTranslate.new_translation_manager(
+                functools.partial(LRUCache, 50)
+            )
+            with ThreadPoolExecutor(8) as executor:
+                results = list(
+                    executor.map(
+                        functools.partial(_translate_all, translation_manager),
+                        range(8),
+                    )
+                )
+        finally:
+            log.setLevel(logging.INFO)
+        for result in results:
+            self.assertEqual(expected, result)
+        self.assertLess(0, translation_manager.cache_info().evictions)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from unittest import mock
+import os
+import json
+import tempfile
+
+import PyMCTranslate
+from PyMCTranslate.py3.meta import json_dir
+from PyMCTranslate.py3.api.translation_manager import (
+    TranslationManager,
+    translation_manager as translation_manager_module,
+)
+from PyMCTranslate.py3.api.translation_manager.version_manifest import (
+    VersionInfo,
+    find_version_names,
+    find_version_fingerprints,
+    load_version_manifest,
+)
+
+
+class VersionManifestTestCase(unittest.TestCase):
+    def test_manifest(self):
+        # the shipped manifest must match the versions
+        versions_path = os.path.join(json_dir, "versions")
+        fingerprints = find_version_fingerprints(
+            versions_path, find_version_names(versions_path)
+        )
+        version_infos = load_version_manifest(fingerprints)
+        self.assertIsNotNone(version_infos)
+        # force every version to be loaded
+        with mock.patch.object(
+            translation_manager_module,
+            "get_version_manifest",
+            side_effect=lambda fingerprints, build: build(),
+        ):
+            translation_manager = TranslationManager(json_dir)
+        self.assertEqual(
+            sorted(version_infos),
+            sorted(
+                VersionInfo.from_version(version)
+                for versions in translation_manager._versions.values()
+                for version in versions.values()
+            ),
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "version_manifest.json")
+            self.assertIsNone(load_version_manifest(fingerprints, path))
+            with open(path, "w") as f:
+                json.dump({"build_number": None, "versions": []}, f)
+            self.assertIsNone(load_version_manifest(fingerprints, path))
+        # the manifest is not valid if a version is added, removed or changed
+        version_name = next(iter(fingerprints))
+        self.assertIsNone(
+            load_version_manifest({**fingerprints, "test_version": "0" * 40})
+        )
+        self.assertIsNone(
+            load_version_manifest(
+                {name: fp for name, fp in fingerprints.items() if name != version_name}
+            )
+        )
+        self.assertIsNone(
+            load_version_manifest({**fingerprints, version_name: "0" * 40})
+        )
+
+    def test_lazy(self):
+        translation_manager = PyMCTranslate.new_translation_manager()
+        # only the universal format is created up front
+        self.assertEqual(["universal"], list(translation_manager._versions))
+        self.assertIn("java", translation_manager.platforms())
+        self.assertIn((1, 12, 2), translation_manager.version_numbers("java"))
+
+        version = translation_manager.get_version("java", (1, 12, 2))
+        self.assertEqual((1, 12, 2), version.version_number)
+        self.assertIs(version, translation_manager.get_version("java", 1343))
+        self.assertEqual([(1, 12, 2)], list(translation_manager._versions["java"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
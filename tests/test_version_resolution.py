@@ -0,0 +1,63 @@
+import unittest
+
+import PyMCTranslate
+
+
+class VersionResolutionTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._translation_manager = PyMCTranslate.new_translation_manager()
+
+    def _version_number(self, platform, version_number):
+        return self._translation_manager.get_version(
+            platform, version_number
+        ).version_number
+
+    def test_version_number(self):
+        version_numbers = self._translation_manager.version_numbers("java")
+        self.assertEqual(sorted(version_numbers), version_numbers)
+        for version_number in version_numbers:
+            self.assertEqual(
+                version_number, self._version_number("java", version_number)
+            )
+        # the previous version is used
+        self.assertEqual((1, 20, 5), self._version_number("java", (1, 20, 6)))
+        # (1, 20) is smaller than (1, 20, 0)
+        self.assertEqual((1, 19, 4), self._version_number("java", (1, 20)))
+        self.assertEqual(version_numbers[-1], self._version_number("java", (99, 0, 0)))
+        # the first version is used for old versions
+        self.assertEqual(version_numbers[0], self._version_number("java", (1, 8, 0)))
+        # only versions older than 1.12 use the first version
+        with self.assertRaises(KeyError):
+            self._translation_manager.get_version("java", (1, 12, 1))
+
+    def test_26(self):
+        version_numbers = self._translation_manager.version_numbers("java")
+        if (26, 1, 0) not in version_numbers:
+            self.skipTest("Java 26.1 is not present")
+        self.assertEqual((26, 1, 0), self._version_number("java", (1, 26, 1)))
+        self.assertEqual((26, 1, 0), self._version_number("java", (1, 26, 1)))
+        self.assertEqual((26, 1, 0), self._version_number("java", (26, 1, 5)))
+
+    def test_data_version(self):
+        for version in self._translation_manager._version_infos["java"].values():
+            self.assertEqual(
+                version.data_version,
+                self._translation_manager.get_version(
+                    "java", version.data_version
+                ).data_version,
+            )
+        # the next version is used
+        self.assertEqual((1, 13, 0), self._version_number("java", 1344))
+        self.assertEqual((1, 12, 2), self._version_number("java", 0))
+        # the previous version is used if there is no next version
+        self.assertEqual(
+            self._translation_manager.version_numbers("java")[-1],
+            self._version_number("java", 10**9),
+        )
+        # the next DataVersion shared by several versions resolves to the lowest of them
+        self.assertEqual((1, 10, 0), self._version_number("bedrock", 17432625))
+
+
+if __name__ == "__main__":
+    unittest.main()
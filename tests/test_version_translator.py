@@ -0,0 +1,83 @@
+import unittest
+import logging
+
+import PyMCTranslate
+from PyMCTranslate.py3.api import BlockEntity
+
+log = logging.getLogger("PyMCTranslate")
+
+
+class VersionTranslatorTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._translation_manager = PyMCTranslate.new_translation_manager()
+
+    def test_translate_block(self):
+        source = self._translation_manager.get_version("java", (1, 12, 2))
+        destination = self._translation_manager.get_version("bedrock", (1, 21, 0))
+        translator = self._translation_manager.get_translator(source, destination)
+        self.assertIs(
+            translator, self._translation_manager.get_translator(source, destination)
+        )
+        self.assertIs(translator.source, source)
+        self.assertIs(translator.destination, destination)
+
+        log.setLevel(logging.CRITICAL)
+        try:
+            for block_id in range(256):
+                for block_data in range(16):
+                    block = source.block.ints_to_block(block_id, block_data)
+                    universal_block, universal_block_entity, extra_needed = (
+                        source.block.to_universal(block)
+                    )
+                    output, extra_output, extra_needed_ = (
+                        destination.block.from_universal(
+                            universal_block, universal_block_entity
+                        )
+                    )
+                    expected = (
+                        output,
+                        repr(extra_output),
+                        extra_needed or extra_needed_,
+                    )
+                    # the second call is served from the composed cache
+                    for _ in range(2):
+                        output, extra_output, extra_needed = translator.translate_block(
+                            block
+                        )
+                        self.assertEqual(
+                            expected, (output, repr(extra_output), extra_needed)
+                        )
+                        self.assertTrue(
+                            extra_output is None
+                            or isinstance(extra_output, BlockEntity)
+                        )
+        finally:
+            log.setLevel(logging.INFO)
+
+    def test_callback(self):
+        source = self._translation_manager.get_version("java", (1, 12, 2))
+        destination = self._translation_manager.get_version("java", (1, 20, 4))
+        translator = self._translation_manager.get_translator(source, destination)
+
+        # the top half of a door gets its properties from the bottom half
+        bottom = source.block.ints_to_block(64, 1)
+        top = source.block.ints_to_block(64, 8)
+
+        def get_block(location):
+            if location == (0, -1, 0):
+                return bottom, None
+            return source.block.ints_to_block(0, 0), None
+
+        output, _, extra_needed = translator.translate_block(top)
+        self.assertTrue(extra_needed)
+        output, _, extra_needed = translator.translate_block(
+            top, get_block_callback=get_block
+        )
+        self.assertEqual(output.base_name, "oak_door")
+        self.assertEqual(output.properties["half"].py_str, "upper")
+        self.assertEqual(output.properties["facing"].py_str, "south")
+
+
+if __name__ == "__main__":
+    unittest.main()